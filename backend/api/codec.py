@@ -0,0 +1,205 @@
+"""How JSON-like messages are turned into WebSocket frames.
+
+``'json'`` is plain JSON text. ``'binary'`` is a compact tagged format,
+each message being::
+
+    version:u8  n_keys:uint  (len:uint utf8)*n_keys  value
+
+where ``uint`` is an unsigned LEB128 varint and each value starts with a
+tag byte:
+
+- ``0x80 | n``: int ``n`` (0 <= n < 128), e.g. enums and small counts
+- ``0x00`` null, ``0x01`` false, ``0x02`` true
+- ``0x03`` int (zigzag varint), ``0x04`` float (f64, big-endian)
+- ``0x05`` string (len:uint utf8)
+- ``0x06`` array (n:uint values)
+- ``0x07`` object (n:uint (key index:uint value)*n) - keys are interned in
+  the key table at the start of the message
+"""
+
+from __future__ import annotations
+
+import abc
+import json
+import struct
+
+from ..util import JsonT
+
+__all__ = ['Codec', 'JsonCodec', 'BinaryCodec', 'CODECS', 'decode_message',
+           'CodecError']
+
+
+BINARY_VERSION = 1
+
+_NULL, _FALSE, _TRUE, _INT, _FLOAT, _STR, _ARRAY, _OBJECT = range(8)
+_SMALL_INT = 0x80
+
+_pack_float = struct.Struct('>d').pack
+_unpack_float = struct.Struct('>d').unpack_from
+# The encoding of all the 1-byte uints (and small ints)
+_BYTES = [bytes([i]) for i in range(256)]
+
+
+class CodecError(ValueError):
+    pass
+
+
+class Codec(abc.ABC):
+    name: str
+
+    @abc.abstractmethod
+    def encode(self, obj: JsonT) -> str | bytes:
+        ...
+
+    @abc.abstractmethod
+    def decode(self, data: str | bytes) -> JsonT:
+        ...
+
+
+class JsonCodec(Codec):
+    name = 'json'
+
+    def encode(self, obj: JsonT) -> str:
+        # Separators: no whitespace. Sort keys: so we don't give client any
+        #  information about ordering in our sets (and therefore the hashing
+        #  seed which could be used for DoS - although this is unlikely)
+        return json.dumps(obj, separators=(',', ':'), sort_keys=True)
+
+    def decode(self, data: str | bytes) -> JsonT:
+        return json.loads(data)
+
+
+def _write_uint(out: bytearray, n: int):
+    while n >= 0x80:
+        out.append((n & 0x7f) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+class BinaryCodec(Codec):
+    name = 'binary'
+
+    def encode(self, obj: JsonT) -> bytes:
+        keys: dict[str, int] = {}
+        body = bytearray()
+        # Locals for speed, this is called for every value
+        append, extend, write_uint = body.append, body.extend, _write_uint
+        small = _BYTES[_SMALL_INT:]
+
+        def enc(o):
+            tp = type(o)
+            if tp is int:
+                if 0 <= o < 0x80:
+                    extend(small[o])
+                else:
+                    append(_INT)
+                    write_uint(body, (o << 1) if o >= 0 else ((-o << 1) - 1))
+            elif tp is str:
+                b = o.encode()
+                append(_STR)
+                write_uint(body, len(b))
+                extend(b)
+            elif tp is dict:
+                append(_OBJECT)
+                write_uint(body, len(o))
+                for k, v in o.items():
+                    if (idx := keys.get(k)) is None:
+                        if type(k) is not str:
+                            raise CodecError(f'Object keys must be strings, not {k!r}')
+                        idx = keys[k] = len(keys)
+                    write_uint(body, idx)
+                    enc(v)
+            elif tp is list or tp is tuple:
+                append(_ARRAY)
+                write_uint(body, len(o))
+                for v in o:
+                    enc(v)
+            elif o is None:
+                append(_NULL)
+            elif tp is bool:
+                append(_TRUE if o else _FALSE)
+            elif tp is float:
+                append(_FLOAT)
+                extend(_pack_float(o))
+            else:
+                raise CodecError(f'Cannot encode {o!r}')
+        enc(obj)
+
+        out = bytearray(_BYTES[BINARY_VERSION])
+        _write_uint(out, len(keys))
+        for k in keys:
+            b = k.encode()
+            _write_uint(out, len(b))
+            out += b
+        out += body
+        return bytes(out)
+
+    def decode(self, data: str | bytes) -> JsonT:
+        if isinstance(data, str):
+            raise CodecError('Binary messages must be bytes')
+        if not data or data[0] != BINARY_VERSION:
+            raise CodecError('Unknown binary message version')
+        pos = 1
+
+        def read_uint():
+            nonlocal pos
+            result = shift = 0
+            while True:
+                b = data[pos]
+                pos += 1
+                result |= (b & 0x7f) << shift
+                if b < 0x80:
+                    return result
+                shift += 7
+
+        def read_str():
+            nonlocal pos
+            n = read_uint()
+            pos += n
+            return data[pos - n:pos].decode()
+
+        def dec():
+            nonlocal pos
+            tag = data[pos]
+            pos += 1
+            if tag >= _SMALL_INT:
+                return tag - _SMALL_INT
+            if tag == _OBJECT:
+                return {keys[read_uint()]: dec() for _ in range(read_uint())}
+            if tag == _ARRAY:
+                return [dec() for _ in range(read_uint())]
+            if tag == _STR:
+                return read_str()
+            if tag == _INT:
+                n = read_uint()
+                return -((n + 1) >> 1) if n & 1 else n >> 1
+            if tag == _NULL:
+                return None
+            if tag == _FALSE:
+                return False
+            if tag == _TRUE:
+                return True
+            if tag == _FLOAT:
+                pos += 8
+                return _unpack_float(data, pos - 8)[0]
+            raise CodecError(f'Bad tag {tag:#x} at {pos - 1}')
+
+        try:
+            keys = [read_str() for _ in range(read_uint())]
+            result = dec()
+        except IndexError:
+            raise CodecError('Truncated binary message') from None
+        if pos != len(data):
+            raise CodecError('Extra data after binary message')
+        return result
+
+
+CODECS: dict[str, Codec] = {c.name: c for c in (JsonCodec(), BinaryCodec())}
+
+
+def decode_message(data: str | bytes) -> JsonT:
+    """Decode a message in any codec (text frames are JSON, binary ones
+    are binary), so the client can switch at any point"""
+    if isinstance(data, str):
+        return CODECS['json'].decode(data)
+    return CODECS['binary'].decode(data)
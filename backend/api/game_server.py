@@ -0,0 +1,359 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import secrets
+from http import HTTPStatus
+from typing import Literal, Mapping, Sequence
+
+from websockets import ConnectionClosed
+from websockets.asyncio.server import (serve, broadcast, Server,
+                                       ServerConnection)
+from websockets.http11 import Request, Response
+
+from .codec import Codec, CODECS, decode_message
+from .json_adapter import JsonAdapter, NO_ANSWER
+from .json_connection import JsonSender
+from ..core import (IRuleset, DefaultRuleset, ResumableGame, ParkedGame,
+                    Decision, GameRecord, ReplayLog, AnswerT, AnswerRejected,
+                    freeze_answer)
+from ..util import JsonT
+
+__all__ = ['GameServer', 'GameRoom', 'RoomStatusT']
+
+
+RoomStatusT = Literal['waiting', 'running', 'finished', 'failed']
+
+GAME_PATH_PREFIX = '/games/'
+MAX_PLAYERS = 5  # The decks run out with more
+
+
+def _dumps(obj: JsonT):
+    return CODECS['json'].encode(obj)  # The lobby only uses JSON
+
+
+class _RoomSender(JsonSender):
+    """What the room's JsonAdapter sends goes to all of the room's clients,
+    each in its own codec (so ``codec`` isn't used). The room gives the
+    clients' messages to the adapter itself (see
+    ``JsonAdapter.answer_from()``)."""
+
+    def __init__(self, room: GameRoom):
+        self.room = room
+
+    def send(self, obj: JsonT):
+        self.room.broadcast(obj)
+
+    def close(self):
+        self.room.on_game_end('finished')
+
+
+class GameRoom:
+    """A pass-and-play game and the clients connected to it. Every client
+    gets every message and any of them can answer.
+
+    The game starts when the first client joins. A client that joins later
+    (or reconnects) is sent the ``init`` message and the latest message so
+    it can carry on from there. Each client chooses its own codec (the
+    ``"codec"`` key, see JsonAdapter), starting with JSON.
+
+    The game is a ResumableGame run on the server's event loop: it only
+    runs when a client answers, so rooms don't need threads. But each answer
+    replays the turn so far, so once a turn has had ``inline_answers``
+    answers, the rest are given in the loop's default executor instead (so a
+    very long turn can't hold up the other rooms). A running game with no
+    clients is parked (see ``ResumableGame.park()``) until one joins again."""
+
+    # Bot games' turns have at most ~15 answers. The 64th answer of a turn
+    #  takes ~0.7ms, growing linearly (so a whole turn is quadratic).
+    inline_answers = 64
+
+    def __init__(self, server: GameServer, game_id: str, n_players: int,
+                 seed: int | str = None):
+        self.server = server
+        self.loop = server.loop
+        self.id = game_id
+        self.n_players = n_players
+        self.status: RoomStatusT = 'waiting'
+        self.clients: dict[ServerConnection, Codec] = {}  # -> its codec
+        self._first_msg: JsonT | None = None  # i.e. 'init'
+        self._last_msg: JsonT | None = None
+        self.adapter = JsonAdapter(_RoomSender(self), codecs=server.codecs)
+        # Only one of these is set (neither once the room is stopped)
+        self.game: ResumableGame | None = ResumableGame.new(
+            n_players, server.ruleset, seed)
+        self.parked: ParkedGame | None = None
+        # Every answer so far, if the game is going to the replay log
+        self.answers: list[AnswerT] | None = (
+            None if server.replay_log is None else [])
+        self.adapter.register_game(self.game.game)
+        # Held while a message is handled, as answering may await the executor
+        self._lock = asyncio.Lock()
+
+    def info(self) -> dict[str, JsonT]:
+        return {'game': self.id, 'n_players': self.n_players,
+                'status': self.status, 'n_clients': len(self.clients)}
+
+    def broadcast(self, obj: JsonT):
+        if self._first_msg is None:
+            self._first_msg = obj
+        self._last_msg = obj
+        self._send(self.clients, obj)
+
+    @staticmethod
+    def _send(clients: Mapping[ServerConnection, Codec], obj: JsonT):
+        """Send ``obj`` to the ``clients``, encoding it once per codec"""
+        by_codec: dict[Codec, list[ServerConnection]] = {}
+        for ws, codec in clients.items():
+            by_codec.setdefault(codec, []).append(ws)
+        for codec, conns in by_codec.items():
+            broadcast(conns, codec.encode(obj))
+
+    async def serve_client(self, ws: ServerConnection):
+        self.clients[ws] = CODECS['json']
+        try:
+            if self.parked is not None:
+                self._unpark()
+            if self._first_msg is not None:
+                self._send({ws: self.clients[ws]}, self._first_msg)
+            if self._last_msg is not self._first_msg:
+                self._send({ws: self.clients[ws]}, self._last_msg)
+            if self.status == 'waiting':
+                self._start()
+            async for message in ws:
+                try:
+                    msg = decode_message(message)
+                except ValueError:
+                    continue  # Can't be decoded, so can't be an answer
+                await self.on_message(ws, msg)
+        except ConnectionClosed:
+            pass
+        finally:
+            self.clients.pop(ws, None)
+            if not self._lock.locked():  # Otherwise on_message() does it
+                self._on_clients_left()
+
+    def _on_clients_left(self):
+        if self.clients:
+            return
+        if self.status in ('finished', 'failed'):
+            self.server.remove_room(self.id)
+        elif self.status == 'running' and self.game is not None:
+            self._park()
+
+    async def on_message(self, ws: ServerConnection, msg: JsonT):
+        """Handle a message from any of the clients. A bad answer only gets
+        its client ``{"error": "bad_answer"}`` and the request again."""
+        if isinstance(msg, dict) and (codec := msg.pop('codec', None)) is not None:
+            if codec in self.server.codecs:  # Only for this client
+                self.clients[ws] = CODECS[codec]
+        async with self._lock:
+            await self._handle_message(ws, msg)
+        self._on_clients_left()
+
+    async def _handle_message(self, ws: ServerConnection, msg: JsonT):
+        if self.status != 'running' or self.game is None:
+            return
+        decision = self.game.decision
+        try:
+            answer = self.adapter.answer_from(msg, decision)
+        except Exception:  # Can't be parsed, or isn't a legal option
+            self._reject(ws)
+            return
+        if answer is NO_ANSWER:
+            return
+        frozen = freeze_answer(answer)  # Before the card moves
+        game = self.game
+        try:
+            if len(game.answers) < self.inline_answers:
+                next_decision = game.answer(answer)
+            else:
+                next_decision = await self.loop.run_in_executor(
+                    None, game.answer, answer)
+        except AnswerRejected:
+            if self.game is game:
+                self._reject(ws)
+            return
+        except Exception:
+            self.on_game_end('failed')
+            raise
+        if self.game is not game:  # Stopped meanwhile
+            return
+        if self.answers is not None:
+            self.answers.append((decision.name, frozen))
+        self._ask(next_decision)
+
+    def _reject(self, ws: ServerConnection):
+        self._send({ws: self.clients[ws]}, {'error': 'bad_answer'})
+        self.adapter.send_decision(self.game.decision)
+
+    def _start(self):
+        self.status = 'running'
+        try:
+            decision = self.game.start()
+        except Exception:
+            self.on_game_end('failed')
+            raise
+        self._ask(decision)
+
+    def _ask(self, decision: Decision | None):
+        if decision is not None:
+            self.adapter.send_decision(decision)
+            return
+        game = self.game.game
+        if self.answers is not None:
+            self.server.replay_log.append(GameRecord.of_game(game, self.answers))
+        self.adapter.register_result(self.game.winners)  # Ends the room
+
+    def _park(self):
+        self.parked = self.game.park()
+        # Nothing refers to the Game now, so only the parked state is kept
+        self.game = self.adapter.game = None
+
+    def _unpark(self):
+        self.game = ResumableGame.unpark(self.parked, self.server.ruleset)
+        self.parked = None
+        self.adapter.game = self.game.game
+
+    def on_game_end(self, status: RoomStatusT):
+        self.status = status
+        for ws in self.clients:
+            self.loop.create_task(ws.close())
+        if not self.clients:
+            self.server.remove_room(self.id)
+
+    def stop(self):
+        """Drop the game (the server is closing)"""
+        self.game = self.parked = None
+
+
+class GameServer:
+    """Hosts many games in one process, on one port.
+
+    Clients connect to ``/games/<id>`` to join a game. Any other path is the
+    lobby, where a client can send (each getting a reply):
+
+    - ``{"request": "list_games"}``: ``{"games": [{"game", "n_players",
+      "status", "n_clients"}, ...]}``
+    - ``{"request": "create_game", "n_players": n, "seed"?: s}``:
+      ``{"game": id}``
+    - ``{"request": "join_game", "game": id}``: the connection becomes one
+      to that game (as if it connected to its path).
+
+    Bad requests get ``{"error": reason}``. All the connections and all
+    the games are handled on one event loop (see GameRoom). Games offer
+    all the ``codecs`` to their clients (see JsonAdapter). Finished games
+    are added to ``replay_log``, if given."""
+
+    def __init__(self, host: str = 'localhost', port: int = 3141,
+                 ruleset: IRuleset = None, codecs: Sequence[str] = tuple(CODECS),
+                 replay_log: ReplayLog = None):
+        self.host = host
+        self.port = port
+        self.ruleset = ruleset or DefaultRuleset()
+        self.codecs = tuple(codecs)  # That the games' clients can choose
+        self.replay_log = replay_log
+        self.rooms: dict[str, GameRoom] = {}
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self._server: Server | None = None
+
+    async def start(self):
+        self.loop = asyncio.get_running_loop()
+        self._server = await serve(self._handler, self.host, self.port,
+                                   process_request=self._process_request)
+        if self.port == 0:  # Let the OS choose
+            self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        await self._server.serve_forever()
+
+    async def close(self):
+        # Stopped first, so they aren't parked as their clients go
+        for room in self.rooms.values():
+            room.stop()
+        self.rooms.clear()
+        self._server.close()
+        await self._server.wait_closed()
+
+    # region rooms
+    def create_room(self, n_players: int, seed: int | str = None) -> GameRoom:
+        """Must be called after start()"""
+        while (game_id := secrets.token_hex(6)) in self.rooms:
+            pass
+        self.rooms[game_id] = room = GameRoom(self, game_id, n_players, seed)
+        return room
+
+    def list_rooms(self) -> list[dict[str, JsonT]]:
+        return [room.info() for room in self.rooms.values()]
+
+    def remove_room(self, game_id: str):
+        self.rooms.pop(game_id, None)
+    # endregion
+
+    # region connections
+    def _process_request(self, ws: ServerConnection, request: Request
+                         ) -> Response | None:
+        path = request.path
+        if (path.startswith(GAME_PATH_PREFIX)
+                and path.removeprefix(GAME_PATH_PREFIX) not in self.rooms):
+            return ws.respond(HTTPStatus.NOT_FOUND, 'No such game\n')
+        return None
+
+    async def _handler(self, ws: ServerConnection):
+        path = ws.request.path
+        if path.startswith(GAME_PATH_PREFIX):
+            room = self.rooms.get(path.removeprefix(GAME_PATH_PREFIX))
+        else:
+            room = await self._lobby(ws)
+        if room is None:  # Removed since, or client left the lobby
+            return
+        await room.serve_client(ws)
+
+    async def _lobby(self, ws: ServerConnection) -> GameRoom | None:
+        try:
+            async for message in ws:
+                try:
+                    msg = json.loads(message)
+                    req = msg['request']
+                except (ValueError, TypeError, KeyError):
+                    await ws.send(_dumps({'error': 'bad_message'}))
+                    continue
+                if req == 'join_game':
+                    if (room := self.rooms.get(msg.get('game'))) is not None:
+                        return room
+                    await ws.send(_dumps({'error': 'no_such_game'}))
+                elif req == 'list_games':
+                    await ws.send(_dumps({'games': self.list_rooms()}))
+                elif req == 'create_game':
+                    n_players = msg.get('n_players')
+                    if (type(n_players) is not int
+                            or not 1 <= n_players <= MAX_PLAYERS):
+                        await ws.send(_dumps({'error': 'bad_n_players'}))
+                        continue
+                    room = self.create_room(n_players, msg.get('seed'))
+                    await ws.send(_dumps({'game': room.id}))
+                else:
+                    await ws.send(_dumps({'error': 'unknown_request'}))
+        except ConnectionClosed:
+            pass
+        return None
+    # endregion
+
+
+def main(argv: list[str] = None):
+    parser = argparse.ArgumentParser(prog='python -m backend.api.game_server')
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', type=int, default=3141)
+    parser.add_argument('--record', metavar='PATH', default=None,
+                        help='Append finished games to this replay log')
+    args = parser.parse_args(argv)
+    replay_log = ReplayLog(args.record) if args.record else None
+    asyncio.run(GameServer(args.host, args.port, replay_log=replay_log)
+                .serve_forever())
+
+
+if __name__ == '__main__':
+    main()
@@ -1,41 +1,105 @@
 from __future__ import annotations
 
 from collections import Counter
-from typing import Literal, Collection, TypeVar
+from time import perf_counter_ns
+from typing import Literal, Collection, TypeVar, Sequence
 
-from .json_connection import JsonConnection
+from .codec import CODECS
+from .json_connection import JsonSender
 from .json_deserialise import JsonDeserialiser
+from .json_patch import make_patch
 from .json_serialise import JsonSerialiser
 from ..core import (Game, Player, IFrontend, Card, Location, Area,
                     CardCost, AnyResource, EffectExecInfo, Color,
                     CardTypeFilter, ResourceFilter, PlaceableCardType,
-                    AdjacenciesMappingT)
+                    AdjacenciesMappingT, CardCatalogue, Decision)
 from ..util import JsonT
 
-__all__ = ['JsonAdapter']
+__all__ = ['JsonAdapter', 'NO_ANSWER']
 
 
 T = TypeVar('T')
 
+# Returned by JsonAdapter.answer_from() if the message doesn't answer the
+#  decision
+NO_ANSWER = object()
+
+
+StateSyncT = Literal['full', 'delta']
+CardFormatT = Literal['full', 'template']
+
 
 # TODO: need to make JsonAdapter more robust so it informs server on error.
 class JsonAdapter(IFrontend):
+    """An IFrontend that sends each decision as a JSON request to the
+    client. Most messages also carry the game state, either (``state_sync``):
+
+    - ``'full'``: the whole state in ``state``, every time.
+    - ``'delta'``: the whole state (``state``) once, then only JSON patches
+      (``state_patch``, RFC 6902 operations) from the previous version
+      (``state_base``) to the new one (``state_version``). The connection
+      is ordered so the last version sent is the one the client
+      acknowledges (``ack_version``) in its next reply. If the client
+      can't apply a patch, it replies ``{"resync": true}`` instead of
+      answering and gets the request again with the full state.
+
+    If ``codecs`` has more than just ``'json'``, they are listed (in
+    ``codecs``) in the ``init`` message. The client can then include
+    ``"codec": name`` in any message to have everything after that sent
+    using that codec (see ``codec.py``).
+
+    With ``card_format='template'``, the ``init`` message also has the
+    ruleset's card templates (``templates``) and each card in the state is
+    only ``{template_id, location, markers}``, ``template_id`` being its
+    index in ``templates``.
+
+    Decisions can also be asked for without blocking (e.g. for a
+    ResumableGame): ``send_decision()`` sends the request, then each message
+    from the client is given to ``answer_from()`` until it has the answer.
+    Used only like that, ``conn`` needn't be a JsonConnection (i.e. be
+    able to receive).
+    """
+
     game: Game
 
-    def __init__(self, conn: JsonConnection):
+    def __init__(self, conn: JsonSender, state_sync: StateSyncT = 'full',
+                 codecs: Sequence[str] = ('json',),
+                 card_format: CardFormatT = 'full'):
         self.conn = conn
+        assert all(c in CODECS for c in codecs)
+        self.codecs = tuple(codecs)
         self.serialiser = JsonSerialiser()
         self.deserialiser = JsonDeserialiser()
         self._next_thread_id = 1
+        self._decision_th: int | None = None  # See send_decision()
+        assert state_sync in ('full', 'delta')
+        self.state_sync = state_sync
+        self._state_version = 0
+        # Last state sent (for 'delta'), None means send the full state next
+        self._last_state: JsonT | None = None
+        assert card_format in ('full', 'template')
+        self.card_format = card_format
+        self.catalogue: CardCatalogue | None = None
+        if card_format == 'template':
+            self.serialiser.serialiser_func(Card)(self.ser_card_compact)
 
     def register_game(self, game: Game):
         self.game = game
         self.conn.init()
-        self.send({
+        init_msg = {
             'request': 'init',
             'server_version': '0.1.3',
             'api_version': 1,
-        }, thread=False, state=False)
+        }
+        if self.state_sync != 'full':
+            init_msg |= {'state_sync': self.state_sync}
+        if self.codecs != ('json',):
+            init_msg |= {'codecs': list(self.codecs)}
+        if self.card_format != 'full':
+            self.catalogue = game.ruleset.get_catalogue()
+            init_msg |= {'card_format': self.card_format,
+                         'templates': [self.ser(t) for t in self.catalogue.templates]}
+        self.send(init_msg, thread=False, state=False)
         self.send({
             'request': 'state',
         }, thread=False, state=True)
@@ -51,97 +115,213 @@ class JsonAdapter(IFrontend):
 
     # region main (non-init/non-end) API
     def get_action_type(self, player: Player) -> Literal['buy', 'execute']:
+        return self.decide('get_action_type', player)
+
+    def get_discard(self, player: Player) -> Card:
+        return self.decide('get_discard', player)
+
+    def get_card_buy(self, player: Player) -> Card:
+        return self.decide('get_card_buy', player)
+
+    def get_card_payment(self, player: Player, cost: CardCost) -> Counter[AnyResource]:
+        return self.decide('get_card_payment', player, cost)
+
+    def choose_color_exec(self, info: EffectExecInfo, n_times: int) -> Color:
+        return self.decide('choose_color_exec', info, n_times)
+
+    def choose_excl_color(self, info: EffectExecInfo,
+                          top_colors: Collection[Color]) -> Color:
+        return self.decide('choose_excl_color', info, top_colors)
+
+    def get_foreach_color(self, info: EffectExecInfo) -> Color:
+        return self.decide('get_foreach_color', info)
+
+    def choose_from_discard(self, info: EffectExecInfo, target: Player,
+                            filters: CardTypeFilter) -> Card | None:
+        return self.decide('choose_from_discard', info, target, filters)
+
+    def choose_card_exec(self, info: EffectExecInfo, n_times: int,
+                         discard: bool = False) -> Card:
+        return self.decide('choose_card_exec', info, n_times, discard)
+
+    def get_spend(self, info: EffectExecInfo, filters: ResourceFilter,
+                  amount: int) -> None | Counter[AnyResource]:
+        return self.decide('get_spend', info, filters, amount)
+
+    def choose_card_move(self, info: EffectExecInfo,
+                         adjacencies: AdjacenciesMappingT) -> Card | None:
+        return self.decide('choose_card_move', info, adjacencies)
+
+    def choose_move_where(self, info: EffectExecInfo, card_to_move: Card,
+                          possibilities: Collection[PlaceableCardType]
+                          ) -> PlaceableCardType | None:
+        return self.decide('choose_move_where', info, card_to_move, possibilities)
+    # endregion
+
+    # region decisions
+    # Each decision (IFrontend method) has ``_<name>_req``, the request to
+    #  send (given the same arguments), and ``_<name>_resp``, which gets the
+    #  answer from the client's response (given it and the arguments)
+    def decide(self, name: str, *args):
+        """Ask the client for the decision ``name`` (an IFrontend method)
+        and wait for its answer"""
+        req, info = self._decision_request(name, args)
+        resp = self.request(req, info=info)
+        return getattr(self, f'_{name}_resp')(resp, *args)
+
+    def send_decision(self, decision: Decision):
+        """Send the request for ``decision`` without waiting for the answer:
+        give each message from the client to ``answer_from()`` instead"""
+        req, info = self._decision_request(decision.name, decision.args)
+        self._decision_th = self.send(req, info=info)
+
+    def answer_from(self, msg: JsonT, decision: Decision):
+        """The answer to ``decision`` (sent by ``send_decision()``) in the
+        client's message ``msg``, or NO_ANSWER if there isn't one (it is
+        for an older request, or the client asked for the state again and
+        so has been sent the request again)"""
+        resp = self._reply_to(self._on_receive(msg), self._decision_th)
+        if resp is None:
+            return NO_ANSWER
+        if resp.pop('resync', False):
+            self.send_decision(decision)  # See request()
+            return NO_ANSWER
+        return getattr(self, f'_{decision.name}_resp')(resp, *decision.args)
+
+    def _decision_request(self, name: str, args: tuple
+                          ) -> tuple[dict[str, JsonT], EffectExecInfo | None]:
+        info = args[0] if isinstance(args[0], EffectExecInfo) else None
+        return getattr(self, f'_{name}_req')(*args), info
+
+    # noinspection PyMethodMayBeStatic
+    def _get_action_type_req(self, player: Player):
         # TODO: somehow handle multiple people/clients! - LATER,
         #  for now, pass-n-play only
-        resp = self.request({'request': 'action_type', 'player': player.idx})
+        return {'request': 'action_type', 'player': player.idx}
+
+    # noinspection PyMethodMayBeStatic
+    def _get_action_type_resp(self, resp, player: Player) -> Literal['buy', 'execute']:
         # TODO: perhaps repeat if invalid/resend it ?
         ac_type = resp['action_type']
         assert ac_type in ('buy', 'execute')
         return ac_type
 
-    def get_discard(self, player: Player) -> Card:
+    # noinspection PyMethodMayBeStatic
+    def _get_discard_req(self, player: Player):
         # TODO: allow cancellation back to choosing action_type from here
         #  /when choosing how to pay.
-        resp = self.request({'request': 'discard_for_exec', 'player': player.idx})
+        return {'request': 'discard_for_exec', 'player': player.idx}
+
+    def _get_discard_resp(self, resp, player: Player) -> Card:
         # TODO: somehow detect logic error vs invalid response
         card = self.deser_card_ref(resp['discard_for_exec'])
         assert card in player.cards_of_type(Area.HAND)
         return card
 
-    def get_card_buy(self, player: Player) -> Card:
-        resp = self.request({'request': 'buy_card', 'player': player.idx})
+    # noinspection PyMethodMayBeStatic
+    def _get_card_buy_req(self, player: Player):
+        return {'request': 'buy_card', 'player': player.idx}
+
+    def _get_card_buy_resp(self, resp, player: Player) -> Card:
         card = self.deser_card_ref(resp['buy_card'])
         assert card in player.cards_of_type(Area.HAND)
         return card
 
-    def get_card_payment(self, player: Player, cost: CardCost) -> Counter[AnyResource]:
-        resp = self.request({'request': 'card_payment', 'player': player.idx,
-                             'cost': self.ser(cost)})
+    def _get_card_payment_req(self, player: Player, cost: CardCost):
+        return {'request': 'card_payment', 'player': player.idx,
+                'cost': self.ser(cost)}
+
+    def _get_card_payment_resp(self, resp, player: Player, cost: CardCost
+                               ) -> Counter[AnyResource]:
         return self.deser(resp['card_payment'], Counter[AnyResource])
 
-    def choose_color_exec(self, info: EffectExecInfo, n_times: int) -> Color:
-        resp = self.request({'request': 'color_exec', 'n_times': n_times}, info=info)
+    # noinspection PyMethodMayBeStatic
+    def _choose_color_exec_req(self, info: EffectExecInfo, n_times: int):
+        return {'request': 'color_exec', 'n_times': n_times}
+
+    def _choose_color_exec_resp(self, resp, info: EffectExecInfo, n_times: int) -> Color:
         return self.deser(resp['color_exec'], Color)
 
-    def choose_excl_color(self, info: EffectExecInfo,
-                          top_colors: Collection[Color]) -> Color:
-        resp = self.request({'request': 'color_excl',
-                             'of_colors': self.ser(top_colors)}, info=info)
+    def _choose_excl_color_req(self, info: EffectExecInfo,
+                               top_colors: Collection[Color]):
+        return {'request': 'color_excl', 'of_colors': self.ser(top_colors)}
+
+    def _choose_excl_color_resp(self, resp, info: EffectExecInfo,
+                                top_colors: Collection[Color]) -> Color:
         return self.deser(resp['color_excl'], Color)
 
-    def get_foreach_color(self, info: EffectExecInfo) -> Color:
-        resp = self.request({'request': 'color_foreach'}, info=info)
+    # noinspection PyMethodMayBeStatic
+    def _get_foreach_color_req(self, info: EffectExecInfo):
+        return {'request': 'color_foreach'}
+
+    def _get_foreach_color_resp(self, resp, info: EffectExecInfo) -> Color:
         return self.deser(resp['color_foreach'], Color)
 
-    def choose_from_discard(self, info: EffectExecInfo, target: Player,
-                            filters: CardTypeFilter) -> Card:
-        resp = self.request({
+    def _choose_from_discard_req(self, info: EffectExecInfo, target: Player,
+                                 filters: CardTypeFilter):
+        return {
             'request': 'card_from_discard',
             'target_player': target.idx,
             'filters': self.ser(filters),  # Will get cards themselves in state
-        }, info=info)
-        card = self.deser_card_ref(resp['card_from_discard'])
-        assert card.location.area == Area.DISCARD and card.location.player == target
-        assert card.card_type in filters
+        }
+
+    def _choose_from_discard_resp(self, resp, info: EffectExecInfo, target: Player,
+                                  filters: CardTypeFilter) -> Card | None:
+        if (card_ser := resp['card_from_discard']) is None:
+            return None
+        card = self.deser_card_ref(card_ser)
+        assert card.location.area == Area.DISCARD and card.location.player == target.idx
+        assert filters.is_allowed(card.card_type)
         return card
 
-    def choose_card_exec(self, info: EffectExecInfo, n_times: int,
-                         discard: bool = False) -> Card:
-        resp = self.request({'request': 'card_exec', 'n_times': n_times,
-                             'discard': discard}, info=info)
+    # noinspection PyMethodMayBeStatic
+    def _choose_card_exec_req(self, info: EffectExecInfo, n_times: int,
+                              discard: bool = False):
+        return {'request': 'card_exec', 'n_times': n_times, 'discard': discard}
+
+    def _choose_card_exec_resp(self, resp, info: EffectExecInfo, n_times: int,
+                               discard: bool = False) -> Card:
         card = self.deser_card_ref(resp['card_exec'])
-        assert Color.has_instance(card.location.area)
-        assert card.location.player == info.player
+        assert PlaceableCardType.has_instance(card.location.area)
+        assert card.location.player == info.player.idx
         return card
 
-    def get_spend(self, info: EffectExecInfo, filters: ResourceFilter,
-                  amount: int) -> None | Counter[AnyResource]:
-        resp = self.request({'request': 'spend_resources', 'amount': amount,
-                             'filters': self.ser(filters)}, info=info)
+    def _get_spend_req(self, info: EffectExecInfo, filters: ResourceFilter,
+                       amount: int):
+        return {'request': 'spend_resources', 'amount': amount,
+                'filters': self.ser(filters)}
+
+    def _get_spend_resp(self, resp, info: EffectExecInfo, filters: ResourceFilter,
+                        amount: int) -> None | Counter[AnyResource]:
         if (result_ser := resp['spend_resources']) is None:
             return None
         # TODO: could have more checking here - it happens in the Game backend,
         #  and there should be a way of telling IFrontend that it was invalid
         return self.deser(result_ser, Counter[AnyResource])
 
-    def choose_card_move(self, info: EffectExecInfo,
-                         adjacencies: AdjacenciesMappingT) -> Card | None:
-        resp = self.request({'request': 'card_move',
-                             'paths': self.ser(adjacencies)}, info=info)
+    def _choose_card_move_req(self, info: EffectExecInfo,
+                              adjacencies: AdjacenciesMappingT):
+        return {'request': 'card_move', 'paths': self.ser(adjacencies)}
+
+    def _choose_card_move_resp(self, resp, info: EffectExecInfo,
+                               adjacencies: AdjacenciesMappingT) -> Card | None:
         if (card_ser := resp['card_move']) is None:
             return None
         card = self.deser_card_ref(card_ser)
-        assert Color.has_instance(card.location.area)
-        assert card.location.player == info.player
+        assert PlaceableCardType.has_instance(card.location.area)
+        assert card.location.player == info.player.idx
         return card
 
-    def choose_move_where(self, info: EffectExecInfo, card_to_move: Card,
-                          possibilities: Collection[PlaceableCardType]
-                          ) -> PlaceableCardType | None:
-        resp = self.request({
+    def _choose_move_where_req(self, info: EffectExecInfo, card_to_move: Card,
+                               possibilities: Collection[PlaceableCardType]):
+        return {
             'request': 'where_move_card',
             'card': self.ser(card_to_move.location),
-            'possibilities': self.ser(possibilities)}, info=info)
+            'possibilities': self.ser(possibilities)}
+
+    def _choose_move_where_resp(self, resp, info: EffectExecInfo, card_to_move: Card,
+                                possibilities: Collection[PlaceableCardType]
+                                ) -> PlaceableCardType | None:
         if (dest_ser := resp['where_move_card']) is None:
             return None
         dest = self.deser(dest_ser, PlaceableCardType)
@@ -156,10 +336,41 @@ class JsonAdapter(IFrontend):
     # noinspection PyMethodMayBeStatic
     def ser_effect_info_ref(self, info: EffectExecInfo):
         """Serialise EffectExecInfo into an object with **references** to the player/card"""
-        return {'player': info.player.idx, 'card': info.card.location}
+        return {'player': info.player.idx, 'card': self.ser(info.card.location)}
+
+    # noinspection PyUnusedLocal
+    def ser_card_compact(self, serialiser: JsonSerialiser, card: Card) -> JsonT:
+        """Serialise a Card as a reference to its template (for 'template'
+        card_format)"""
+        return {'template_id': self.catalogue.id_of(card),
+                'location': serialiser.ser(card.location),
+                'markers': card.markers}
 
     def serialise_state(self) -> JsonT:
-        return self.ser(self.game)  # Game contains all the state
+        if (profiler := self.game.profiler) is None:
+            return self.ser(self.game)  # Game contains all the state
+        start = perf_counter_ns()
+        try:
+            return self.ser(self.game)
+        finally:
+            profiler.add('state', 'JsonAdapter.serialise_state', start)
+
+    def state_fields(self) -> dict[str, JsonT]:
+        """The state-related fields to add to an outgoing message"""
+        state = self.serialise_state()
+        if self.state_sync == 'full':
+            return {'state': state}
+        self._state_version += 1
+        prev, self._last_state = self._last_state, state
+        if prev is None:
+            return {'state': state, 'state_version': self._state_version}
+        return {'state_patch': make_patch(prev, state),
+                'state_base': self._state_version - 1,
+                'state_version': self._state_version}
+
+    def request_resync(self):
+        """Send the full state with the next message"""
+        self._last_state = None
     # endregion
 
     # region ser/deser methods
@@ -179,7 +390,7 @@ class JsonAdapter(IFrontend):
         if info is not None:
             extra |= {'exec_info': self.ser_effect_info_ref(info)}
         if state:
-            extra |= {'state': self.serialise_state()}
+            extra |= self.state_fields()
         if (tid := self.alloc_thread() if thread else None) is not None:
             extra |= {'thread': tid}
         self.conn.send(obj | extra)
@@ -187,20 +398,44 @@ class JsonAdapter(IFrontend):
 
     def request(self, req: dict[str, JsonT], state=True, info: EffectExecInfo = None):
         th = self.send(req, state=state, info=info)
-        return self.receive(th)
+        resp = self.receive(th)
+        while resp.pop('resync', False):
+            # Client couldn't use the state so didn't answer. receive() has
+            #  already arranged for a full state so just ask again.
+            th = self.send(req, state=state, info=info)
+            resp = self.receive(th)
+        return resp
 
     def receive(self, th: int | None):  # No default so tid isn't accidentally forgotten
         if th is None:
-            return self.conn.receive()
-        received_th: int = -1  # Can't have this tid, start loop
-        resp = None
-        while received_th != th:
-            # Discard everything else (those referred to older threads,
-            #  can't refer to threads not created yet)
-            resp = self.conn.receive()
-            received_th = resp.pop('thread', -1)
+            return self._receive_msg()
+        # Discard everything else (those referred to older threads,
+        #  can't refer to threads not created yet)
+        while (resp := self._reply_to(self._receive_msg(), th)) is None:
+            pass
         return resp
 
+    def _reply_to(self, resp: JsonT, th: int) -> JsonT | None:
+        """``resp`` if it is the reply to thread ``th``, otherwise None"""
+        received_th = resp.pop('thread', -1)
+        if resp.get('resync', False):
+            self.request_resync()
+        if received_th != th:
+            return None
+        ack = resp.pop('ack_version', None)
+        if ack is not None and ack != self._state_version:
+            self.request_resync()  # Client has a different state from us
+        return resp
+
+    def _receive_msg(self) -> JsonT:
+        return self._on_receive(self.conn.receive())
+
+    def _on_receive(self, msg: JsonT) -> JsonT:
+        if isinstance(msg, dict) and (codec := msg.pop('codec', None)) is not None:
+            if codec in self.codecs:
+                self.conn.set_codec(codec)
+        return msg
+
     def alloc_thread(self):
         th = self._next_thread_id
         self._next_thread_id += 1
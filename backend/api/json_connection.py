@@ -2,20 +2,66 @@ from __future__ import annotations
 
 import abc
 
+from .codec import Codec, CODECS
 from ..util import JsonT
 
 
-class JsonConnection(abc.ABC):
+class ClientDisconnected(ConnectionError):
+    """The client closed the connection normally, so nothing more can be
+    sent to or received from it"""
+
+
+class JsonSender(abc.ABC):
+    """The sending half of a JsonConnection. Enough for a JsonAdapter that is
+    given the client's messages (see ``JsonAdapter.answer_from()``)."""
+    # How messages are sent (received ones can be in any codec)
+    codec: Codec = CODECS['json']
+
     def init(self):
         ...
 
+    def set_codec(self, name: str):
+        self.codec = CODECS[name]
+
     @abc.abstractmethod
     def send(self, obj: JsonT):
         ...
 
+    def close(self):
+        ...
+
+
+class JsonConnection(JsonSender):
     @abc.abstractmethod
     def receive(self) -> JsonT:
+        """The next message from the client. Raises ClientDisconnected if
+        the client has gone."""
+
+
+class AsyncJsonConnection(abc.ABC):
+    """Like JsonConnection but for use from an asyncio event loop.
+    Cancelling any of these must leave the connection usable (or closed)."""
+
+    codec: Codec = CODECS['json']
+
+    async def init(self):
         ...
 
-    def close(self):
+    def set_codec(self, name: str):
+        self.codec = CODECS[name]
+
+    @abc.abstractmethod
+    async def send(self, obj: JsonT):
+        ...
+
+    @abc.abstractmethod
+    async def receive(self) -> JsonT:
+        ...
+
+    async def request(self, obj: JsonT) -> JsonT:
+        """Send ``obj`` and wait for the next message"""
+        await self.send(obj)
+        return await self.receive()
+
+    async def close(self):
         ...
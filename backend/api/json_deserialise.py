@@ -4,6 +4,7 @@ import sys
 import typing
 from collections import Counter
 from dataclasses import is_dataclass, fields as d_fields
+from functools import partial
 from typing import Callable, Any, cast, Mapping, TYPE_CHECKING, TypeVar
 
 from .. import core as core_mod
@@ -31,35 +32,75 @@ class JsonDeserialiser:
     def __init__(self):
         # Copy to instance so inst.serialiser_func only affects the instance
         self.dispatch = self.dispatch.copy()
+        # How to deserialise into each type (including generic aliases like
+        #  Counter[AnyResource]), compiled the first time it's needed
+        self._plans: dict[Any, Callable[[JsonT], Any]] = {}
 
     def deserialiser_func(self: JsonDeserialiser | type, *tps: type):
         def decor(fn: JsonDeserFuncT):
             target_dict.update(dict.fromkeys(tps, fn))  # {*tps : fn}
+            if plans is not None:
+                plans.clear()  # Dispatch changed so they may be out of date
             return fn
 
         try:
-            called_on_class = isinstance(self, JsonDeserialiser)
+            called_on_class = not isinstance(self, JsonDeserialiser)
         except NameError:  # JsonDeserialiser not defined, i.e. in this class's definition
             target_dict = _json_deserialiser_dispatch
             tps += (self,)
+            plans = None
             return decor
         if called_on_class:
-            # Called on the class, not an instance, so `self` is None
+            # Called on the class, not an instance, so `self` is the first type
             target_dict = cast('type[JsonDeserialiser]', __class__).dispatch
             tps += (self,)
         else:
             target_dict = self.dispatch
+        plans = None if called_on_class else self._plans
         return decor
 
     def deser(self, j: JsonT, tp: type[T]) -> T:
+        try:
+            plan = self._plans[tp]
+        except KeyError:
+            plan = self._plans[tp] = self._make_plan(tp)
+        return plan(j)
+
+    def _make_plan(self, tp: type) -> Callable[[JsonT], Any]:
+        """Resolve everything that only depends on the type, so that
+        decoding each value only has to do the rest"""
         cls: type = typing.get_origin(tp)  # type: ignore  # Pycharm is stupid, once again
         if cls is None:
             cls = tp  # Must be a regular class - those have origin as None
         for supercls in cls.__mro__:
             if (fn := self.dispatch.get(supercls)) is not None:
-                return fn(self, j, tp)
+                if (make_fast := _fast_plan_makers.get(fn)) is not None:
+                    return make_fast(self, cls, tp)
+                return lambda j: fn(self, j, tp)
+        if (is_dataclass(tp)
+                and type(self).deser_default is JsonDeserialiser.deser_default
+                and type(self).deser_dataclass is JsonDeserialiser.deser_dataclass):
+            return self._make_dataclass_plan(tp)
+        return partial(self._deser_default_for, tp)
+
+    def _deser_default_for(self, tp: type, j: JsonT):
         return self.deser_default(j, tp)
 
+    def _make_dataclass_plan(self, tp: type[DataclassInstance]):
+        # Same as deser_dataclass() but the field types are looked up once
+        field_types: dict[str, type] = {}
+        deser = self.deser
+
+        def deser_dataclass_plan(j: JsonT):
+            assert isinstance(j, dict)
+            inst = tp.__new__(tp)
+            for k, v in j.items():
+                if (attr_tp := field_types.get(k)) is None:
+                    attr_tp = field_types[k] = self._get_dcls_attr_type(tp, k)
+                object.__setattr__(inst, k, deser(v, attr_tp))
+            return inst
+        return deser_dataclass_plan
+
     def deser_default(self, j: JsonT, tp: type):
         if is_dataclass(tp):
             return self.deser_dataclass(j, tp)
@@ -96,21 +137,23 @@ class JsonDeserialiser:
         # noinspection PyTypeHints
         return Counter(self.deser_mapping(j, dict[typing.get_args(tp)[0], int]))
 
-    # noinspection PyMethodMayBeStatic
     def _deser_mapping_key(self, j: str, tp: type):
+        return self._mapping_key_decoder(tp)(j)
+
+    # noinspection PyMethodMayBeStatic
+    def _mapping_key_decoder(self, tp: type) -> Callable[[str], Any]:
         if issubclass(tp, str):
-            return j
+            return _identity
         elif issubclass(tp, bool):
-            return {'False': False, 'True': True}[j]
+            return {'False': False, 'True': True}.__getitem__
         elif tp is type(None):
-            assert j == 'None'
-            return j
+            return _none_key
         elif issubclass(tp, int):
-            return int(j)
+            return int
         elif issubclass(tp, float):
-            return float(j)
+            return float
         elif issubclass(tp, _ColorEnumTree):
-            return tp(int(j))
+            return lambda j: tp(int(j))
         raise AssertionError(f"Bad key type {tp} for mapping-from-object")
 
     @deserialiser_func(_ColorEnumTree)
@@ -130,6 +173,13 @@ class JsonDeserialiser:
 
     @classmethod
     def _get_dcls_attr_type(cls, dcls: type, name: str):
+        # Annotations don't change so only need to evaluate each one once
+        if (tp := _dcls_attr_types.get((dcls, name))) is None:
+            tp = _dcls_attr_types[dcls, name] = cls._eval_dcls_attr_type(dcls, name)
+        return tp
+
+    @classmethod
+    def _eval_dcls_attr_type(cls, dcls: type, name: str):
         annot = cls._get_dcls_attr_annot(dcls, name)
         if not isinstance(annot, str):
             return annot
@@ -151,3 +201,67 @@ class JsonDeserialiser:
             raise TypeError(f"No such field (or is missing annotations): "
                             f"{dcls.__name__}.{name}")
         return tp
+
+
+# (dataclass, field name) -> the evaluated annotation
+_dcls_attr_types: dict[tuple[type, str], Any] = {}
+
+
+def _identity(j):
+    return j
+
+
+def _none_key(j: str):
+    assert j == 'None'
+    return j
+
+
+# Compiled equivalents of the default deserialiser functions. Each takes
+#  (deserialiser, origin class, type) and returns a function of the JSON.
+def _make_atom_plan(_self: JsonDeserialiser, _cls: type, tp: type):
+    def deser_atom(j: JsonT):
+        assert isinstance(j, tp)
+        return j
+    return deser_atom
+
+
+def _make_collection_plan(self: JsonDeserialiser, _cls: type, tp: type):
+    (inner_tp,) = typing.get_args(tp)
+    deser = self.deser
+    return lambda j: tp([deser(v, inner_tp) for v in j])
+
+
+def _make_mapping_plan(self: JsonDeserialiser, _cls: type, tp: type):
+    kt, vt = typing.get_args(tp)
+    deser, key_decoder = self.deser, None
+
+    def deser_mapping(j: JsonT):
+        nonlocal key_decoder
+        if isinstance(j, list):
+            return tp({deser(k, kt): deser(v, vt) for k, v in j})
+        assert isinstance(j, dict)
+        # Only some key types can be object keys, so only get this if needed
+        if key_decoder is None:
+            key_decoder = self._mapping_key_decoder(kt)
+        return {key_decoder(k): deser(v, vt) for k, v in j.items()}
+    return deser_mapping
+
+
+def _make_counter_plan(self: JsonDeserialiser, _cls: type, tp: type):
+    # noinspection PyTypeHints
+    as_dict = _make_mapping_plan(self, dict, dict[typing.get_args(tp)[0], int])
+    return lambda j: Counter(as_dict(j))
+
+
+def _make_color_enum_plan(_self: JsonDeserialiser, _cls: type, tp: type):
+    return tp  # Use that class's ctor
+
+
+_fast_plan_makers: dict[JsonDeserFuncT, Callable[
+        [JsonDeserialiser, type, type], Callable[[JsonT], Any]]] = {
+    JsonDeserialiser.ser_builtin_atom: _make_atom_plan,
+    JsonDeserialiser.deser_collection: _make_collection_plan,
+    JsonDeserialiser.deser_mapping: _make_mapping_plan,
+    JsonDeserialiser.deser_counter: _make_counter_plan,
+    JsonDeserialiser.deser_any_color_enum: _make_color_enum_plan,
+}
@@ -0,0 +1,84 @@
+"""Minimal JSON Patch (RFC 6902) support: only the ``add``, ``remove`` and
+``replace`` operations, which are all that ``make_patch()`` produces."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from ..util import JsonT
+
+__all__ = ['make_patch', 'apply_patch', 'JsonPatchT']
+
+
+JsonPatchT = list[dict[str, Any]]
+
+
+def _escape(key: str):
+    return key.replace('~', '~0').replace('/', '~1')
+
+
+def _unescape(token: str):
+    return token.replace('~1', '/').replace('~0', '~')
+
+
+def make_patch(old: JsonT, new: JsonT) -> JsonPatchT:
+    """Returns the operations that turn ``old`` into ``new``"""
+    ops: JsonPatchT = []
+    _diff(old, new, '', ops)
+    return ops
+
+
+def _diff(old: JsonT, new: JsonT, path: str, ops: JsonPatchT):
+    if old is new:
+        return
+    if type(old) is dict and type(new) is dict:
+        for k in old.keys() - new.keys():
+            ops.append({'op': 'remove', 'path': f'{path}/{_escape(k)}'})
+        for k, v in new.items():
+            if k in old:
+                _diff(old[k], v, f'{path}/{_escape(k)}', ops)
+            else:
+                ops.append({'op': 'add', 'path': f'{path}/{_escape(k)}', 'value': v})
+    elif isinstance(old, (list, tuple)) and isinstance(new, (list, tuple)):
+        # Serialised tuples (e.g. mapping-as-array pairs) are arrays in JSON
+        for i in range(min(len(old), len(new))):
+            _diff(old[i], new[i], f'{path}/{i}', ops)
+        for i in range(len(old), len(new)):
+            ops.append({'op': 'add', 'path': f'{path}/{i}', 'value': new[i]})
+        for i in reversed(range(len(new), len(old))):  # Last first, so indices stay valid
+            ops.append({'op': 'remove', 'path': f'{path}/{i}'})
+    elif type(old) is not type(new) or old != new:  # Types too, as 1 == True
+        ops.append({'op': 'replace', 'path': path, 'value': new})
+
+
+def apply_patch(doc: JsonT, ops: JsonPatchT) -> JsonT:
+    """Applies ``ops`` to ``doc`` (modifying it in-place where possible) and
+    returns the result. Arrays must be lists (i.e. from ``json.loads()``)"""
+    for op in ops:
+        tokens = [_unescape(t) for t in op['path'].split('/')[1:]]
+        if not tokens:  # Whole document
+            if op['op'] == 'remove':
+                raise ValueError("Cannot remove the whole document")
+            doc = op['value']
+            continue
+        parent = doc
+        for t in tokens[:-1]:
+            parent = parent[int(t) if isinstance(parent, list) else t]
+        last = tokens[-1]
+        if isinstance(parent, list):
+            idx = len(parent) if last == '-' else int(last)
+            if op['op'] == 'add':
+                parent.insert(idx, op['value'])
+            elif op['op'] == 'remove':
+                del parent[idx]
+            elif op['op'] == 'replace':
+                parent[idx] = op['value']
+            else:
+                raise ValueError(f"Unsupported patch op {op['op']!r}")
+        elif op['op'] in ('add', 'replace'):
+            parent[last] = op['value']
+        elif op['op'] == 'remove':
+            del parent[last]
+        else:
+            raise ValueError(f"Unsupported patch op {op['op']!r}")
+    return doc
@@ -1,98 +1,126 @@
 from __future__ import annotations
 
-import abc
-import json
-import queue
-import sys
+import asyncio
 import threading
-import time
-from dataclasses import dataclass
+from concurrent.futures import Future
 
-from websockets.sync.server import serve, ServerConnection
+from websockets import ConnectionClosedOK
+from websockets.asyncio.server import serve, Server, ServerConnection
+from websockets.sync.server import (serve as sync_serve,
+                                    ServerConnection as SyncServerConnection)
 
-from .json_connection import JsonConnection
+from .codec import decode_message
+from .json_connection import (JsonConnection, AsyncJsonConnection,
+                              ClientDisconnected)
 from ..util import JsonT
 
 
-class CloseConn(BaseException):
-    pass
-
-
-class _Instruction(abc.ABC):
-    @abc.abstractmethod
-    def run(self, conn: ServerConnection):
-        ...
-
-
-@dataclass
-class _SendInstruction(_Instruction):
-    data: str
-
-    def run(self, conn: ServerConnection):
-        conn.send(self.data)
-
-
-@dataclass
-class _ReceiveInstruction(_Instruction):
-    def run(self, conn: ServerConnection):
-        return conn.recv()
+class AsyncWebsocketConn(AsyncJsonConnection):
+    """Serves a single client over WebSocket. Sending before the client has
+    connected waits for it to connect."""
 
+    def __init__(self, port: int = 3141):
+        self.port = port
+        self._server: Server | None = None
+        self._client: asyncio.Future[ServerConnection] | None = None
+        self._closed: asyncio.Event | None = None
+
+    async def init(self):
+        loop = asyncio.get_running_loop()
+        self._client = loop.create_future()
+        self._closed = asyncio.Event()
+        self._server = await serve(self._handler, 'localhost', self.port)
+
+    async def send(self, obj: JsonT):
+        data = self.codec.encode(obj)
+        # shield() so cancelling one call doesn't cancel the shared Future
+        client = await asyncio.shield(self._client)
+        try:
+            await client.send(data)
+        except ConnectionClosedOK as e:
+            raise ClientDisconnected('Client closed the connection') from e
 
-@dataclass
-class _CloseInstruction(_Instruction):
-    def run(self, conn: ServerConnection):
-        raise CloseConn()
+    async def receive(self) -> JsonT:
+        client = await asyncio.shield(self._client)
+        try:
+            # Cancelling recv() is safe - the message stays in the queue
+            data = await client.recv()
+        except ConnectionClosedOK as e:
+            raise ClientDisconnected('Client closed the connection') from e
+        return decode_message(data)
+
+    async def close(self):
+        if self._server is None:
+            return
+        self._closed.set()
+        if self._client.done():
+            await self._client.result().close()
+        else:
+            self._client.cancel()
+        self._server.close()
+        await self._server.wait_closed()
+        self._server = None
+
+    async def _handler(self, conn: ServerConnection):
+        if self._client.done():
+            await conn.close(1013, 'Already have a client')
+            return
+        self._client.set_result(conn)
+        # The connection is closed when this returns so wait until we're done
+        await self._closed.wait()
 
 
 class WebsocketConn(JsonConnection):
+    """Serves a single client over WebSocket, for synchronous code.
+    The server runs in another thread but sending and receiving happen
+    directly in the calling thread, blocking (without polling) until done."""
+
     def __init__(self, port: int = 3141):
         self.port = port
 
     # noinspection PyAttributeOutsideInit
     def init(self):
-        self._instruction_queue = queue.Queue[_Instruction]()
-        self._results_queue = queue.Queue[str]()
+        self._client = Future[SyncServerConnection]()
+        self._closed = threading.Event()
+        self._accept_lock = threading.Lock()
+        self._server = sync_serve(self._handler, 'localhost', self.port)
+        # Daemon, so it doesn't keep the process alive if the main thread
+        #  dies without calling close()
         self._server_thread = threading.Thread(
-            target=self._server_worker,
-            name='WebSocket Server (Controller Thread)')
+            target=self._server.serve_forever,
+            name='WebSocket Server (Controller Thread)', daemon=True)
         self._server_thread.start()
 
     def send(self, obj: JsonT):
-        # Separators: no whitespace. Sort keys: so we don't give client any
-        #  information about ordering in our sets (and therefore the hashing
-        #  seed which could be used for DoS - although this is unlikely)
-        data = json.dumps(obj, separators=(',', ':'), sort_keys=True)
-        self._instruction_queue.put(_SendInstruction(data))
+        data = self.codec.encode(obj)
+        client = self._client.result()  # Waits for the client to connect
+        try:
+            client.send(data)
+        except ConnectionClosedOK as e:
+            raise ClientDisconnected('Client closed the connection') from e
 
     def receive(self) -> JsonT:
-        self._instruction_queue.put(_ReceiveInstruction())
-        return json.loads(self._results_queue.get())
+        try:
+            data = self._client.result().recv()
+        except ConnectionClosedOK as e:
+            raise ClientDisconnected('Client closed the connection') from e
+        return decode_message(data)
 
     def close(self):
-        self._instruction_queue.put(_CloseInstruction())
-        while self._server_thread.is_alive():
-            time.sleep(0.001)  # Wait for it to exit
-
-    def _server_worker(self):
-        with serve(self._handler, 'localhost', self.port) as self._server:
-            self._server.serve_forever()
-
-    def _handler(self, conn: ServerConnection):
-        try:
-            while True:
-                if not threading.main_thread().is_alive():
-                    print('Main thread died unexpectedly without calling '
-                          'WebsocketConn.close()', sys.stderr)
-                    raise CloseConn()
-                try:
-                    # Need timeout so we can check if main thread is dead and exit if so.
-                    instr = self._instruction_queue.get(timeout=0.02)
-                except queue.Empty:
-                    continue
-                if (result := instr.run(conn)) is not None:
-                    self._results_queue.put(result)
-        except CloseConn:
+        self._closed.set()
+        if self._client.done():
+            self._client.result().close()
+        else:
+            self._client.cancel()
+        self._server.shutdown()
+        self._server_thread.join()
+
+    def _handler(self, conn: SyncServerConnection):
+        with self._accept_lock:  # Each connection has its own thread
+            if accepted := not self._client.done():
+                self._client.set_result(conn)
+        if not accepted:
+            conn.close(1013, 'Already have a client')
             return
-        finally:
-            # Important! This is the only way to close _server_worker
-            self._server.shutdown()
+        # The connection is closed when this returns so wait until we're done
+        self._closed.wait()
@@ -1,8 +1,13 @@
-from .game import Game
+from .game import Game, GameSnapshot
 from .card import *
 from .card_effects import *
 from .common import *
 from .enums import *
 from .ifrontend import IFrontend
-from .player import Player
+from .player import Player, PlayerSnapshot
 from .ruleset import *
+from .rng import *
+from .resumable import *
+from .legal_moves import *
+from .profiling import *
+from .replay import *
@@ -2,8 +2,9 @@ from __future__ import annotations
 
 import abc
 from collections import Counter
-from dataclasses import dataclass, fields
-from typing import TYPE_CHECKING, Mapping
+from dataclasses import dataclass
+from operator import attrgetter
+from typing import TYPE_CHECKING, Mapping, Callable
 
 from .common import Location, ResourceFilter
 from .enums import CardType, Area, PlaceableCardType, AnyResource
@@ -15,26 +16,19 @@ if TYPE_CHECKING:
 
 
 __all__ = ['CardTemplate', 'Card', 'CardCost', 'CardEffect', 'EffectExecInfo',
-           'CANT_EXEC']
-
-
-# Card types: CardTemplate should have frozen immutable attributes 'printed on
-#  the physical card' and Card should have those attributes as frozen
-#  but should have other non-frozen attributes. This is mainly po
-# This is partially possible but not fully because:
-#  - It doesn't let non-frozen dataclasses inherit from frozen ones
-#  - It only lets frozen dataclasses inherit non-frozen ones if there's min.
-#    1 frozen dataclass in the base classes in 3.11-3.12.
-# Therefore, we can create a base _CommonCard class (non-frozen)
-#  and have the Card (non-frozen) class inherit from it. Then, also have the
-#  CardTemplate (frozen) class inherit from _CommonCard and an empty frozen
-#  dataclass. However, in 3.13, they changed it so that for a dataclass to be
-#  non-frozen, ALL its base classes must be non-frozen so this doesn't work.
-# Therefore, we need a different approach. The main point of `frozen` is hashing
-#  support. When I actually think about hashing, the CardTemplate should have
-#  the standard 'all fields equal' hashing but for Card, it should be based on
-#  id() because you can have 2 identical cards but they should be different
-#  keys in a dict.
+           'CANT_EXEC', 'EffectFuncT']
+
+
+# Card types: CardTemplate has the frozen immutable attributes 'printed on
+#  the physical card' and Card is one copy of it in a game, with the
+#  non-frozen attributes (where it is, how many markers it has).
+# CardTemplate has the standard 'all fields equal' hashing but Card's is
+#  based on id() because you can have 2 identical cards, but they should be
+#  different keys in a dict.
+# Card used to be a (dataclass) subclass of CardTemplate, but that meant
+#  copying all the template's attributes into each card's __dict__. Now it
+#  only holds a reference to the (shared) template, and has __slots__, as
+#  there are many cards per game (and snapshot) and many games per server.
 @dataclass(unsafe_hash=True)
 class CardTemplate:  # Frozen-by-convention
     card_type: CardType
@@ -53,23 +47,58 @@ class CardTemplate:  # Frozen-by-convention
         (apart from ``move()`` which is built to handle this).
         Also note that ``player`` **MUST** be specified otherwise the
         card doesn't know which player to attach to."""
-        return Card(
-            self.card_type, self.effect, self.cost, self.always_triggers,
-            self.is_starting_card, to_location, markers
-        )
+        return Card(self, to_location, markers)
 
 
-@dataclass(eq=False)
-class Card(CardTemplate):
-    location: Location = None
-    markers: int = 0
+def _template_attr(name: str):
+    get = attrgetter(f'template.{name}')
+    return property(get, doc=f"The template's ``{name}``")
+
+
+class Card:
+    """A card in a game. The attributes of its ``template`` (``card_type``,
+    ``effect``, etc.) can be read from the Card itself."""
+
+    __slots__ = ('template', 'location', 'markers')
+
+    template: CardTemplate
+    location: Location | None
+    markers: int
+
+    card_type: CardType = _template_attr('card_type')
+    effect: CardEffect = _template_attr('effect')
+    cost: CardCost = _template_attr('cost')
+    always_triggers: bool = _template_attr('always_triggers')
+    is_starting_card: bool = _template_attr('is_starting_card')
+
+    def __init__(self, template: CardTemplate, location: Location = None,
+                 markers: int = 0):
+        self.template = template
+        self.location = location
+        self.markers = markers
+
+    def __repr__(self):
+        return (f'Card({self.template!r}, location={self.location!r}, '
+                f'markers={self.markers!r})')
 
     def execute(self, player: Player):
         # Player is the player to execute the effects for (other players can
         #  execute a player's card and get the effect for themselves in
         #  theory - although maybe not with the base cards)
         info = EffectExecInfo(self, player)
-        self.effect.execute(info)
+        effect = self.template.effect
+        if (profiler := player.game.profiler) is not None:
+            profiler.execute_effect(effect, info)
+            return
+        try:  # Inlined fast path of self.effect.compiled()
+            fn = effect._compiled_
+        except AttributeError:
+            fn = effect.compiled()
+        fn(info)
+
+    def copy(self) -> Card:
+        """Shallow copy (the template is shared, as it's immutable)"""
+        return Card(self.template, self.location, self.markers)
 
     def detach(self, game: Game):
         """Detach ourself from `self.location`"""
@@ -83,9 +112,16 @@ class Card(CardTemplate):
         assert prev is None  # Hope we haven't overwritten anything,
 
     def attach_to(self, game: Game, location: Location):
+        if (journal := game.journal) is not None:
+            journal.append((setattr, self, 'location', self.location))
         self.location = location
         self.attach(game)
 
+    def add_markers(self, game: Game, amount: int):
+        if (journal := game.journal) is not None:
+            journal.append((setattr, self, 'markers', self.markers))
+        self.markers += amount
+
     def move(self, game: Game, to: Location):
         # Check for the case where it didn't have a location before
         if self.location is not None:
@@ -97,7 +133,7 @@ class Card(CardTemplate):
             player = self.location.player
         if isinstance(player, int):
             player = game.players[player]
-        self.move(game, Location(player.idx, area, player.area_next_key(area)))
+        self.move(game, Location.of(player.idx, area, player.area_next_key(area)))
 
     def discard(self, game: Game, player: int | Player = None):
         self.append_to(game, Area.DISCARD, player)
@@ -108,8 +144,7 @@ class Card(CardTemplate):
     def is_dyn_executable(self):
         return CardType.has_instance(self.location.area)
 
-    def __eq__(self, other):
-        return object.__eq__(self, other)  # id()-bsed equality for consistency
+    # Equality and hashing are the default, id()-based ones
 
     def equals(self, other):
         # Still have the field-based equality available, Java-style
@@ -117,13 +152,8 @@ class Card(CardTemplate):
             # Don't use NotImplemented because Python is a STUPID and
             #  bool(NotImplemented) = TypeError. WTF Python?!!
             return False
-        # Pycharm, once again doesn't understand dataclasses
-        # noinspection PyTypeChecker
-        return all(getattr(self, f.name) == getattr(other, f.name)
-                   for f in fields(self))  # Not writing out all the fields
-
-    def __hash__(self):
-        return object.__hash__(self)  # id()-based hash
+        return (self.template == other.template and self.location == other.location
+                and self.markers == other.markers)
 
 
 @dataclass(init=False, frozen=True)
@@ -154,7 +184,7 @@ class CardCost:
                     ResourceFilter.any_color(): wild_cost})
 
 
-@dataclass
+@dataclass(slots=True)
 class EffectExecInfo:
     card: Card
     player: Player
@@ -172,6 +202,13 @@ class EffectExecInfo:
         return self.game.ruleset
 
 
+EffectFuncT = Callable[[EffectExecInfo], object | None]
+
+# Compiled effects, shared between equal effect trees (e.g. the starting cards
+#  are made again for each player but only need compiling once)
+_compiled_cache: dict[CardEffect, EffectFuncT] = {}
+
+
 class CardEffect(abc.ABC):
     """An interface representing an executable effect of a card. Must be
     hashable to enable hashing of CardTemplate objects. Therefore, it
@@ -181,5 +218,32 @@ class CardEffect(abc.ABC):
     def execute(self, info: EffectExecInfo) -> object | None:
         ...
 
+    def compile(self) -> EffectFuncT:
+        """Returns a function that does exactly the same as ``execute()``
+        (including returning CANT_EXEC) for this effect. Compound effects
+        should override this to call their (compiled) children directly
+        instead of going through each of their ``execute()`` methods."""
+        return self.execute
+
+    def compiled(self) -> EffectFuncT:
+        """Cached version of ``compile()``. As effects are immutable, this is
+        stored on the effect itself, so it is shared by all the Cards
+        instantiated from the same CardTemplate."""
+        try:
+            return self._compiled_
+        except AttributeError:
+            pass
+        if (fn := _compiled_cache.get(self)) is None:
+            fn = _compiled_cache[self] = self.compile()
+        object.__setattr__(self, '_compiled_', fn)
+        return fn
+
+    def __getstate__(self):
+        # Compiled functions are closures so can't be pickled, they will be
+        #  recompiled when needed
+        state = self.__dict__.copy()
+        state.pop('_compiled_', None)
+        return state
+
 
 CANT_EXEC = object()
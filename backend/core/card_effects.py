@@ -3,8 +3,9 @@ from __future__ import annotations
 import abc
 import operator
 from dataclasses import dataclass, field
+from typing import Callable
 
-from .card import CardEffect, EffectExecInfo, Card, CANT_EXEC
+from .card import CardEffect, EffectExecInfo, Card, CANT_EXEC, EffectFuncT
 from .common import (ResourceFilter, CardTypeFilter, AdjacenciesMappingT,
                      AdjacenciesFrozendictT)
 from .enums import *
@@ -41,6 +42,13 @@ class NullEffect(CardEffect):
     def execute(self, info: EffectExecInfo):
         pass
 
+    def compile(self) -> EffectFuncT:
+        return _null_effect
+
+
+def _null_effect(_info: EffectExecInfo):
+    pass
+
 
 @dataclass(frozen=True)
 class GainResource(CardEffect):
@@ -48,7 +56,14 @@ class GainResource(CardEffect):
     amount: int
 
     def execute(self, info: EffectExecInfo):
-        info.player.resources[self.resource] += self.amount
+        info.player.gain_resource(self.resource, self.amount)
+
+    def compile(self) -> EffectFuncT:
+        resource, amount = self.resource, self.amount
+
+        def gain_resource(info: EffectExecInfo):
+            info.player.gain_resource(resource, amount)
+        return gain_resource
 
 
 @dataclass(frozen=True)
@@ -65,7 +80,22 @@ class SpendResource(CardEffect):
         assert spent <= info.player.resources  # (Subset)
         assert spent.total() == self.amount
         assert all(map(self.colors.is_allowed, spent))
-        info.player.resources -= spent
+        info.player.spend_resources(spent)
+
+    def compile(self) -> EffectFuncT:
+        colors, amount = self.colors, self.amount
+        is_allowed = colors.is_allowed
+
+        def spend_resource(info: EffectExecInfo):
+            spent = info.frontend.get_spend(info, colors, amount)
+            if spent is None:
+                return CANT_EXEC
+            spent += {}  # Keep only positive values
+            assert spent <= info.player.resources  # (Subset)
+            assert spent.total() == amount
+            assert all(map(is_allowed, spent))
+            info.player.spend_resources(spent)
+        return spend_resource
 
 
 @dataclass(frozen=True)
@@ -73,7 +103,14 @@ class AddMarker(CardEffect):
     amount: int = 1
 
     def execute(self, info: EffectExecInfo):
-        info.card.markers += 1
+        info.card.add_markers(info.game, 1)
+
+    def compile(self) -> EffectFuncT:
+        return _add_marker
+
+
+def _add_marker(info: EffectExecInfo):
+    info.card.add_markers(info.game, 1)
 
 
 @dataclass(frozen=True)
@@ -85,7 +122,16 @@ class RemoveMarker(CardEffect):
     def execute(self, info: EffectExecInfo) -> object | None:
         if info.card.markers < self.amount:
             return CANT_EXEC
-        info.card.markers -= self.amount
+        info.card.add_markers(info.game, -self.amount)
+
+    def compile(self) -> EffectFuncT:
+        amount = self.amount
+
+        def remove_marker(info: EffectExecInfo):
+            if info.card.markers < amount:
+                return CANT_EXEC
+            info.card.add_markers(info.game, -amount)
+        return remove_marker
 
 
 @dataclass(frozen=True)
@@ -116,6 +162,21 @@ class EffectGroup(_AnyEffectGroup):
         for e in self.effects:
             e.execute(info)
 
+    def compile(self) -> EffectFuncT:
+        fns = tuple(e.compiled() for e in self.effects)
+        if len(fns) == 2:  # Most common case (by far)
+            fn_a, fn_b = fns
+
+            def effect_group_2(info: EffectExecInfo):
+                fn_a(info)
+                fn_b(info)
+            return effect_group_2
+
+        def effect_group(info: EffectExecInfo):
+            for fn in fns:
+                fn(info)
+        return effect_group
+
 
 @dataclass(frozen=True, init=False)
 class StrictEffectGroup(_AnyEffectGroup):
@@ -128,6 +189,15 @@ class StrictEffectGroup(_AnyEffectGroup):
             if e.execute(info) is CANT_EXEC:
                 return CANT_EXEC
 
+    def compile(self) -> EffectFuncT:
+        fns = tuple(e.compiled() for e in self.effects)
+
+        def strict_effect_group(info: EffectExecInfo):
+            for fn in fns:
+                if fn(info) is CANT_EXEC:
+                    return CANT_EXEC
+        return strict_effect_group
+
 
 @dataclass(frozen=True, init=False)
 class ConvertEffect(EffectGroup):
@@ -158,6 +228,23 @@ class ConvertEffect(EffectGroup):
         self.gain.execute(info)
         self.effect.execute(info)
 
+    def compile(self) -> EffectFuncT:
+        spend, gain = self.spend.compiled(), self.gain.compiled()
+        if isinstance(self.effect, NullEffect):
+            def convert_effect_no_side_effect(info: EffectExecInfo):
+                if spend(info) is CANT_EXEC:
+                    return
+                gain(info)
+            return convert_effect_no_side_effect
+        side_effect = self.effect.compiled()
+
+        def convert_effect(info: EffectExecInfo):
+            if spend(info) is CANT_EXEC:
+                return
+            gain(info)
+            side_effect(info)
+        return convert_effect
+
 
 @dataclass(frozen=True)
 class SuppressFail(CardEffect):
@@ -165,6 +252,13 @@ class SuppressFail(CardEffect):
 
     def execute(self, info: EffectExecInfo) -> object | None:
         self.effect.execute(info)  # Deliberately not `return`
+
+    def compile(self) -> EffectFuncT:
+        inner = self.effect.compiled()
+
+        def suppress_fail(info: EffectExecInfo):
+            inner(info)
+        return suppress_fail
 # endregion
 
 
@@ -180,12 +274,26 @@ class ConditionalEffect(CardEffect):
             return self.if_true.execute(info)
         return self.if_false.execute(info)
 
+    def compile(self) -> EffectFuncT:
+        cond = self.cond.compile()
+        if_true, if_false = self.if_true.compiled(), self.if_false.compiled()
+
+        def conditional_effect(info: EffectExecInfo):
+            if cond(info):
+                return if_true(info)
+            return if_false(info)
+        return conditional_effect
+
 
 class ICondition(abc.ABC):
     @abc.abstractmethod
     def evaluate(self, info: EffectExecInfo) -> bool:
         pass
 
+    def compile(self) -> Callable[[EffectExecInfo], bool]:
+        """Returns a function equivalent to ``evaluate()``"""
+        return self.evaluate
+
 
 @dataclass(frozen=True)
 class _ComparisonCond(ICondition, abc.ABC):
@@ -200,6 +308,14 @@ class _ComparisonCond(ICondition, abc.ABC):
     def evaluate(self, info: EffectExecInfo) -> bool:
         return self.cmp(self.left.get(info), self.right.get(info))
 
+    def compile(self) -> Callable[[EffectExecInfo], bool]:
+        cmp_fn, left = self.cmp, self.left.compile()
+        if isinstance(self.right, ConstMeasure):  # e.g. 'has >= n cards'
+            right_value = self.right.value
+            return lambda info: cmp_fn(left(info), right_value)
+        right = self.right.compile()
+        return lambda info: cmp_fn(left(info), right(info))
+
 
 @dataclass(frozen=True)
 class LessThanCond(_ComparisonCond):
@@ -260,17 +376,32 @@ class _EffectManyTimes(CardEffect, abc.ABC):
     def get_times(self, info: EffectExecInfo) -> int:
         ...
 
+    def compile_times(self) -> Callable[[EffectExecInfo], int]:
+        """Returns a function equivalent to ``get_times()``"""
+        return self.get_times
+
     def execute(self, info: EffectExecInfo):
         # No better way - cards may have varying (possibly Turing-complete) side effects.
         for _ in range(self.get_times(info)):
             self.effect.execute(info)
 
+    def compile(self) -> EffectFuncT:
+        get_times, inner = self.compile_times(), self.effect.compiled()
+
+        def effect_many_times(info: EffectExecInfo):
+            for _ in range(get_times(info)):
+                inner(info)
+        return effect_many_times
+
 
 @dataclass(frozen=True)
 class ForEachMarker(_EffectManyTimes):
     def get_times(self, info: EffectExecInfo) -> int:
         return info.card.markers
 
+    def compile_times(self) -> Callable[[EffectExecInfo], int]:
+        return lambda info: info.card.markers
+
 
 @dataclass(frozen=True)
 class ForEachCardOfType(_EffectManyTimes):
@@ -279,6 +410,10 @@ class ForEachCardOfType(_EffectManyTimes):
     def get_times(self, info: EffectExecInfo) -> int:
         return info.player.num_cards_of_type(self.tp)
 
+    def compile_times(self) -> Callable[[EffectExecInfo], int]:
+        tp = self.tp
+        return lambda info: info.player.num_cards_of_type(tp)
+
 
 @dataclass(frozen=True)
 class ForEachColorSet(_EffectManyTimes):
@@ -318,6 +453,9 @@ class ForEachM(_EffectManyTimes):
 
     def get_times(self, info: EffectExecInfo) -> int:
         return self.measure.get(info)
+
+    def compile_times(self) -> Callable[[EffectExecInfo], int]:
+        return self.measure.compile()
 # endregion
 
 
@@ -327,6 +465,10 @@ class IMeasure(abc.ABC):
     def get(self, info: EffectExecInfo) -> float | int:
         pass
 
+    def compile(self) -> Callable[[EffectExecInfo], float | int]:
+        """Returns a function equivalent to ``get()``"""
+        return self.get
+
 
 @dataclass(frozen=True)
 class ConstMeasure(IMeasure):
@@ -335,6 +477,10 @@ class ConstMeasure(IMeasure):
     def get(self, info: EffectExecInfo) -> float | int:
         return self.value
 
+    def compile(self) -> Callable[[EffectExecInfo], float | int]:
+        value = self.value
+        return lambda info: value
+
 
 @dataclass(frozen=True)
 class CardsOfType(IMeasure):
@@ -343,18 +489,28 @@ class CardsOfType(IMeasure):
     def get(self, info: EffectExecInfo) -> float | int:
         return info.player.num_cards_of_type(self.tp)
 
+    def compile(self) -> Callable[[EffectExecInfo], float | int]:
+        tp = self.tp
+        return lambda info: info.player.num_cards_of_type(tp)
+
 
 @dataclass(frozen=True)
 class DiscardedCards(IMeasure):
     def get(self, info: EffectExecInfo) -> float | int:
         return info.player.num_cards_of_type(Area.DISCARD)
 
+    def compile(self) -> Callable[[EffectExecInfo], float | int]:
+        return lambda info: info.player.num_cards_of_type(Area.DISCARD)
+
 
 @dataclass(frozen=True)
 class NumMarkers(IMeasure):
     def get(self, info: EffectExecInfo) -> float | int:
         return info.card.markers
 
+    def compile(self) -> Callable[[EffectExecInfo], float | int]:
+        return lambda info: info.card.markers
+
 
 @dataclass(frozen=True)
 class ResourceCount(IMeasure):
@@ -362,6 +518,10 @@ class ResourceCount(IMeasure):
 
     def get(self, info: EffectExecInfo) -> float | int:
         return info.player.resources[self.resource]
+
+    def compile(self) -> Callable[[EffectExecInfo], float | int]:
+        resource = self.resource
+        return lambda info: info.player.resources[resource]
 # endregion
 
 
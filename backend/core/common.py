@@ -16,27 +16,47 @@ AdjacenciesMappingT = Mapping[PlaceableCardType, Collection[PlaceableCardType]]
 AdjacenciesFrozendictT = Mapping[PlaceableCardType, Collection[PlaceableCardType]]
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Location:
+    """Where a card is. Immutable, so one object can be shared by everything
+    that refers to that place (use ``Location.of()`` to get it)."""
     player: int
     area: Area
     key: int
 
+    @classmethod
+    def of(cls, player: int, area: Area, key: int) -> Location:
+        """The shared Location for this place. Faster than constructing a
+        new one (frozen dataclasses are slow to construct) and saves memory."""
+        try:
+            return _locations[player, area, key]
+        except KeyError:
+            loc = _locations[player, area, key] = Location(player, area, key)
+            return loc
+
     def get(self, game: Game) -> Card:
         return game.get_areas_for(self.player)[self.area][self.key]
 
     def clear(self, game: Game) -> Card:
-        return game.get_areas_for(self.player)[self.area].pop(self.key)
+        player = game.players[self.player]
+        card = player.area_pop(self.area, self.key)
+        if (journal := game.journal) is not None:
+            journal.append((player.area_reinsert, self.area, self.key, card))
+        return card
 
     def put(self, game: Game, card: Card):
-        dest_area = game.get_areas_for(self.player)[self.area]
-        # I wish there was a Python function for these 3 lines (insert value
-        #  and return previous value)
-        prev = dest_area.get(self.key)
-        dest_area[self.key] = card
+        player = game.players[self.player]
+        prev = player.area_put(self.area, self.key, card)
+        if (journal := game.journal) is not None:
+            journal.append((player.area_pop, self.area, self.key) if prev is None
+                           else (player.area_put, self.area, self.key, prev))
         return prev
 
 
+# There are only a few places per player (keys are reused between games)
+_locations: dict[tuple[int, Area, int], Location] = {}
+
+
 @dataclass(frozen=True)
 class ResourceFilter:
     allowed_resources: frozenset[AnyResource]
@@ -46,6 +46,9 @@ class EnumHierarchyData(Generic[T]):
     name_to_inst: dict[str, ExtendableEnum[T]]
     value_to_inst: dict[T, ExtendableEnum[T]]
     all_instances: set[ExtendableEnum[T]]  # Fast containment check
+    # Incremented whenever a member is added to the hierarchy, as the
+    #  members of (at least) the top class change
+    version: int = 0
 
     @classmethod
     def empty(cls):
@@ -76,6 +79,7 @@ class EnumHierarchyData(Generic[T]):
         self.all_instances.add(inst)
         self.name_to_inst[inst.name] = inst
         self.value_to_inst[inst.value] = inst
+        self.version += 1
 
     def __contains__(self, item):
         if isinstance(item, ExtendableEnum):
@@ -96,12 +100,23 @@ class EnumHierarchyData(Generic[T]):
         return self[item]  # See definition above for why this works
 
 
+@dataclass(frozen=True)
+class _MemberCache(Generic[T]):
+    """The members of one eenum class, in the order they're iterated"""
+    version: int  # Of the EnumHierarchyData when this was made
+    members: tuple[ExtendableEnum[T], ...]
+    member_set: frozenset[ExtendableEnum[T]]
+    by_name: dict[str, ExtendableEnum[T]]
+    by_value: dict[T, ExtendableEnum[T]]
+
+
 # Inverted class hierarchy: if Bar adds extra enum members to Foo,
 #  Foo is a subclass of Bar as all instances of Foo are instances of Bar too.
 class ExtendableEnumMeta(type, Generic[T]):
     _eenum_top_: type[ExtendableEnum[T]] | None = None
     _eenum_data_: EnumHierarchyData
     _eenum_members_: set[ExtendableEnum[T]] | None
+    _eenum_cache_: _MemberCache[T] | None
 
     @classmethod
     def _is_special_name(cls, name: str):
@@ -111,6 +126,7 @@ class ExtendableEnumMeta(type, Generic[T]):
                  name: str, bases: tuple[type, ...], ns: dict[str, ...],
                  **kwargs):
         super().__init__(name, bases, ns, **kwargs)
+        cls._eenum_cache_ = None  # Each class needs its own (not inherited)
         if ns.get('_eenum_special_'):  # Must be defined on the class itself, not inherited
             return
         else:
@@ -126,6 +142,7 @@ class ExtendableEnumMeta(type, Generic[T]):
             cls._eenum_members_ = cls._eenum_data_.all_instances
             cls._init_members_from_ns(ns, possible_members=None,
                                       allow_exclude=False, allow_none=True)
+            cls._eenum_cache_ = None  # May have been made before members were set
             return
         eenum_tops = {b._eenum_top_ for b in eenum_bases}
         if len(eenum_tops) > 1:
@@ -141,6 +158,7 @@ class ExtendableEnumMeta(type, Generic[T]):
             # Makes no sense to allow exclude in a root class (would
             #  only be excluding from the current class)
             ns, possible_members, allow_exclude=possible_members is not None)
+        cls._eenum_cache_ = None
 
     def _init_members_from_ns(cls, ns: dict[str, object],
                               possible_members: set[ExtendableEnum[T]] | None,
@@ -256,32 +274,55 @@ class ExtendableEnumMeta(type, Generic[T]):
     def is_top(cls):
         return cls._eenum_top_ is cls
 
+    def _eenum_cached_(cls) -> _MemberCache[T]:
+        """The (cached) member tables, only rebuilt if the hierarchy has
+        been extended since they were made"""
+        cache = cls._eenum_cache_
+        if cache is None or cache.version != cls._eenum_data_.version:
+            cache = cls._eenum_cache_ = cls._make_member_cache()
+        return cache
+
+    def _make_member_cache(cls) -> _MemberCache[T]:
+        try:  # Try to sort it by value...
+            ls = sorted(cls._eenum_members_, key=lambda m: m.value)
+        except TypeError:  # .. if we can't sort it by definition order
+            # Ordering information is implicitly stored in the ordering of value_to_inst.
+            ls = [m for m in cls._eenum_data_.value_to_inst.values()
+                  if m in cls._eenum_members_]
+        return _MemberCache(cls._eenum_data_.version, tuple(ls), frozenset(ls),
+                            {m.name: m for m in ls}, {m.value: m for m in ls})
+
     def __contains__(cls, item) -> TypeGuard[Self]:
-        return item in cls._eenum_members_
+        return item in cls._eenum_cached_().member_set
 
     def has_instance(cls, item) -> TypeGuard[Self]:
-        return item in cls
+        return item in cls._eenum_cached_().member_set
 
     def __getitem__(cls: type[ExtendableEnum[T]], item):
         if cls is ExtendableEnum:
             # noinspection PyUnresolvedReferences
             return cls.__class_getitem__(item)  # plz call Generic's getitem
+        cache = cls._eenum_cached_()
+        if not isinstance(item, ExtendableEnum):
+            # Names first, like EnumHierarchyData.__getitem__
+            try:
+                return cache.by_name[item]
+            except (KeyError, TypeError):  # (Could be a value or unhashable)
+                pass
+            try:
+                return cache.by_value[item]
+            except (KeyError, TypeError):
+                pass
         inst = cls._eenum_data_[item]
-        if inst not in cls._eenum_members_:
+        if inst not in cache.member_set:
             raise KeyError(item)
         return inst
 
     def __iter__(cls):
-        try:  # Try to sort it by value...
-            ls = sorted(cls._eenum_members_, key=lambda m: m.value)
-        except TypeError:  # .. if we can't sort it by definition order
-            # Ordering information is implicitly stored in the ordering of value_to_inst.
-            ls = [m for m in cls._eenum_data_.value_to_inst.values()
-                  if m in cls._eenum_members_]
-        yield from ls
+        return iter(cls._eenum_cached_().members)
 
     def __len__(cls):
-        return len(cls._eenum_members_)
+        return len(cls._eenum_cached_().members)
 
 
 class ExtendableEnum(Generic[T], metaclass=ExtendableEnumMeta):
@@ -312,6 +353,9 @@ class ExtendableEnum(Generic[T], metaclass=ExtendableEnumMeta):
         self._init_ran_ = True
         self.name = name
         self.value = value
+        # Value because name could have aliases. Cached as it's used a lot
+        #  (e.g. Player.areas is keyed by members)
+        self._hash_ = hash((self._eenum_top_, value))
         # This will be instantiated from the class first defining it which we
         #  treat as canonical until there's a better candidate.
         self._eenum_canonical_class_ = type(self)
@@ -330,18 +374,26 @@ class ExtendableEnum(Generic[T], metaclass=ExtendableEnumMeta):
         return self._eenum_top_ == other._eenum_top_ and self.value == other.value
 
     def __hash__(self):
-        # Value because name could have aliases
-        return hash((self._eenum_top_, self.value))
+        return self._hash_
+
+    def __reduce__(self):
+        # Members are singletons so copy/pickle them by looking them up again
+        #  (the default tries to call __new__ with no name)
+        return self._eenum_canonical_class_, (self.name,)
 
     @classmethod
     def has_instance(cls, inst: object) -> TypeGuard[Self]:
-        return inst in cls
+        # Inlined _eenum_cached_() as this is called a lot
+        cache = cls._eenum_cache_
+        if cache is None or cache.version != cls._eenum_data_.version:
+            cache = cls._eenum_cached_()
+        return inst in cache.member_set
 
     # Just for the typing (doesn't work properly on the __iter__ as it's
     #  defined on the metaclass)
     @classmethod
     def members(cls) -> tuple[Self, ...]:
-        return tuple(cls)  # Already iterable
+        return cls._eenum_cached_().members  # (Immutable so can be shared)
 
     def _on_adopted_(self, into: ExtendableEnumMeta[T]):
         if (self._eenum_canonical_class_ is None
@@ -1,14 +1,48 @@
 from __future__ import annotations
 
-import random
+import copy
 import time
+from collections import Counter
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
 from .enums import *
 from .ifrontend import IFrontend
-from .player import Player
+from .player import Player, PlayerSnapshot
+from .rng import RngMode, derived_rng
 from .ruleset import IRuleset
 
+if TYPE_CHECKING:
+    from .profiling import Profiler
+
+
+@dataclass(frozen=True)
+class GameSnapshot:
+    """The mutable state of a Game, see ``Game.snapshot()``. Picklable."""
+    players: tuple[PlayerSnapshot, ...]
+    moon_phases: tuple[frozenset[MoonPhase], ...] | None
+    round_num: int
+    turn_num: int
+    curr_player_idx: int
+    scoring: bool
+    players_ranked: tuple[int, ...] | None
+    winners: tuple[int, ...] | None
+
+
+@dataclass(frozen=True)
+class Checkpoint:
+    """A point in the undo journal to roll back to, see ``Game.checkpoint()``.
+    The scalar state is saved here instead of journaling every change."""
+    journal_len: int
+    round_num: int
+    turn_num: int
+    curr_player_idx: int
+    scoring: bool
+    moon_phases: list[set[MoonPhase]] | None  # Replaced, never modified
+    final_scores: tuple[int | None, ...]
+    players_ranked: list[Player] | None
+    winners: list[Player] | None
+
 
 @dataclass
 class Game:
@@ -19,12 +53,18 @@ class Game:
     # Defaults don't actually matter here, we override __init__
     moon_phases: list[set[MoonPhase]] = None
     seed: str = None
+    rng_mode: RngMode = 'compat'  # See derived_rng()
     round_num: int = 0
     turn_num: int = 0
     curr_player_idx: int = 0
+    scoring: bool = False  # Whether the turns are over (and points are being counted)
     # Only used at end
     players_ranked: list[Player] | None = None
     winners: list[Player] | None = None
+    # Undo entries (function, *args) for each change since checkpoint() was
+    #  first called, or None if changes aren't being recorded.
+    journal: list[tuple] | None = None
+    profiler: Profiler | None = None  # See Profiler.attach()
 
     # TODO: I hate having it here but there's not much choice?
     #  1. Have it here - bad because JsonAdapter's (semi-frontend) internals
@@ -32,16 +72,18 @@ class Game:
     #  2. Having it on JsonAdapter - bad because then the exclusions are very
     #     far from the actual attributes (so code for each class is very spread
     #     out) and it requires a lot of ugly special cases.
-    _ser_exclude_ = ('frontend', 'ruleset')  # TODO: maybe include ruleset?
+    _ser_exclude_ = ('frontend', 'ruleset', 'scoring', 'journal', 'profiler',
+                     'rng_mode')  # TODO: maybe include ruleset?
 
     def __init__(self, n_players: int, frontend: IFrontend, ruleset: IRuleset,
-                 seed: int | str = None):
+                 seed: int | str = None, rng_mode: RngMode = 'compat'):
         self.frontend = frontend
         self.ruleset = ruleset
         if seed is None:
             # TODO: maybe this could be urandom/SystemRandom instead?
             seed = time.time_ns()
         self.seed = str(seed)
+        self.rng_mode = rng_mode
         self.round_num = 0
         self.turn_num = 0
         self.n_players = n_players
@@ -58,7 +100,24 @@ class Game:
     def run_game(self):
         for self.round_num in range(3):
             self.do_round()
-        self.count_points()
+        self.finish_game()
+
+    def resume(self):
+        """Continue the game from the start of the current player's turn
+        (or their scoring), e.g. after ``restore()``-ing a snapshot taken in
+        ``IFrontend.on_turn_start()``"""
+        if self.scoring:
+            return self.finish_game(self.curr_player_idx)
+        self.do_turn(self.curr_player_idx)
+        for self.turn_num in range(self.turn_num + 1, 6):
+            self.rotate_cards()
+            self.do_turn()
+        for self.round_num in range(self.round_num + 1, 3):
+            self.do_round()
+        self.finish_game()
+
+    def finish_game(self, start_player: int = 0):
+        self.count_points(start_player)
         self.frontend.register_result(self.winners)
 
     def do_round(self):
@@ -99,27 +158,113 @@ class Game:
             # (i+by)-th player gets from i-th player so i-th player get from (i-by)-th
             p.hand = p.posses_area_obj(hands_old[(i - by) % self.n_players])
 
-    def do_turn(self):
+    def do_turn(self, start_player: int = 0):
         # TODO: hooks for UI to display state changes
-        for self.curr_player_idx, p in enumerate(self.players):
-            p.do_turn()
+        for self.curr_player_idx in range(start_player, self.n_players):
+            p = self.players[self.curr_player_idx]
+            self.frontend.on_turn_start(p)
+            if (profiler := self.profiler) is None:
+                p.do_turn()
+                continue
+            start = time.perf_counter_ns()
+            try:
+                p.do_turn()
+            finally:
+                profiler.add('turn', 'Player.do_turn', start)
 
-    def count_points(self):
-        for p in self.players:
+    def count_points(self, start_player: int = 0):
+        self.scoring = True
+        for self.curr_player_idx in range(start_player, self.n_players):
+            p = self.players[self.curr_player_idx]
+            self.frontend.on_turn_start(p)
             p.count_points()
         self.players_ranked = sorted(
             self.players, key=lambda pl: pl.final_score, reverse=True)
         self.winners = [p for p in self.players
                         if p.final_score == self.players_ranked[0].final_score]
 
+    def snapshot(self) -> GameSnapshot:
+        """Save the current state, so it can be returned to using
+        ``restore()``. This only copies the mutable parts (areas, resources,
+        markers, etc.); the card templates and effects are shared."""
+        def indices(players: list[Player] | None):
+            return None if players is None else tuple(p.idx for p in players)
+        return GameSnapshot(
+            tuple([p.snapshot() for p in self.players]),
+            None if self.moon_phases is None else tuple(map(frozenset, self.moon_phases)),
+            self.round_num, self.turn_num, self.curr_player_idx, self.scoring,
+            indices(self.players_ranked), indices(self.winners))
+
+    def restore(self, snapshot: GameSnapshot, copy_cards=False):
+        """Restore the state from ``snapshot`` (in-place, the Player objects
+        stay the same). See ``Player.restore()`` for ``copy_cards``."""
+        assert len(snapshot.players) == self.n_players
+        for p, p_snapshot in zip(self.players, snapshot.players):
+            p.restore(p_snapshot, copy_cards)
+        self.moon_phases = (None if snapshot.moon_phases is None else
+                            [set(m) for m in snapshot.moon_phases])
+        self.round_num = snapshot.round_num
+        self.turn_num = snapshot.turn_num
+        self.curr_player_idx = snapshot.curr_player_idx
+        self.scoring = snapshot.scoring
+
+        def players(indices: tuple[int, ...] | None):
+            return None if indices is None else [self.players[i] for i in indices]
+        self.players_ranked = players(snapshot.players_ranked)
+        self.winners = players(snapshot.winners)
+
+    def checkpoint(self) -> Checkpoint:
+        """Start recording changes (if not already) so ``rollback()`` can
+        undo everything after this point. Rolling back only takes as long as
+        the changes made since then."""
+        if self.journal is None:
+            self.journal = []
+        return Checkpoint(
+            len(self.journal), self.round_num, self.turn_num,
+            self.curr_player_idx, self.scoring, self.moon_phases,
+            tuple(p.final_score for p in self.players), self.players_ranked,
+            self.winners)
+
+    def rollback(self, checkpoint: Checkpoint):
+        """Undo all the changes since ``checkpoint``. Later checkpoints
+        are no longer valid after this."""
+        journal = self.journal
+        while len(journal) > checkpoint.journal_len:
+            fn, *args = journal.pop()
+            fn(*args)
+        self.round_num = checkpoint.round_num
+        self.turn_num = checkpoint.turn_num
+        self.curr_player_idx = checkpoint.curr_player_idx
+        self.scoring = checkpoint.scoring
+        self.moon_phases = checkpoint.moon_phases
+        for p, score in zip(self.players, checkpoint.final_scores):
+            p.final_score = score
+        self.players_ranked = checkpoint.players_ranked
+        self.winners = checkpoint.winners
+
+    def stop_journal(self):
+        """Stop recording changes (all checkpoints become invalid)"""
+        self.journal = None
+
+    def clone(self, frontend: IFrontend = None) -> Game:
+        """An independent copy of this game. If ``frontend`` is given, the
+        copy uses it instead (and registers with it)."""
+        game = copy.copy(self)  # Shares the ruleset, seed, etc.
+        game.journal = None
+        game.players = [Player(p.idx, game, {}, Counter()) for p in self.players]
+        game.restore(self.snapshot(), copy_cards=True)
+        if frontend is not None:
+            game.frontend = frontend
+            frontend.register_game(game)
+        return game
+
     # TODO: could there be a cleaner way of doing this?
     def does_color_run(self, color: Color, is_last: bool):
         return color in self.curr_moons or (
             is_last and MoonPhase.LAST_TURN in self.curr_moons)
 
     def get_rng(self, reason: str, *args: object):
-        seed_str = f'{self.seed}+[{reason}@{args!s}]'
-        return random.Random(seed_str)
+        return derived_rng(self.seed, reason, *args, mode=self.rng_mode)
 
     @property
     def curr_moons(self):
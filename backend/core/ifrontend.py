@@ -20,6 +20,12 @@ class IFrontend(abc.ABC):
     def register_game(self, game: Game):
         ...
 
+    def on_turn_start(self, player: Player):
+        """Called before each player's turn and before counting each
+        player's points at the end (``game.scoring`` is set then).
+        ``Game.resume()`` can continue the game from these points."""
+        pass
+
     @abc.abstractmethod
     def get_spend(self, info: EffectExecInfo, filters: ResourceFilter,
                   amount: int) -> None | Counter[AnyResource]:
@@ -0,0 +1,278 @@
+"""The legal answers to each decision an IFrontend is asked for, so bots and
+clients don't have to find them by trial and error (and the engine's
+asserts). ``legal_options(name, *args)`` takes the same arguments as the
+IFrontend method (or use ``Decision.options()``)."""
+
+from __future__ import annotations
+
+import functools
+from collections import Counter
+from typing import Any, Callable, Collection, Literal, Mapping, TYPE_CHECKING
+
+from .card import Card, CardCost, EffectExecInfo
+from .common import ResourceFilter, CardTypeFilter, AdjacenciesMappingT
+from .enums import AnyResource, Area, Color, PlaceableCardType
+
+if TYPE_CHECKING:
+    from .player import Player
+
+__all__ = ['legal_options', 'action_types', 'can_pay', 'can_afford',
+           'affordable_cards', 'payment_options', 'spend_options',
+           'placed_cards', 'move_options', 'LossFnT', 'LossT', 'points_lost',
+           'cheapest_spend', 'cheapest_payment']
+
+# How bad it is to take ``taken`` of the resource from the ``have`` there are
+LossFnT = Callable[[AnyResource, int, int], float]
+# A LossFnT or, if each unit of a resource costs the same, the cost of each
+#  unit (which can be solved much faster)
+LossT = LossFnT | Mapping[AnyResource, float]
+
+
+# region resources
+@functools.lru_cache(maxsize=None)
+def _allowed(filters: ResourceFilter) -> tuple[AnyResource, ...]:
+    # There are only a few filters (one per cost/effect), so keep them all
+    return tuple(r for r in AnyResource.members() if filters.is_allowed(r))
+
+
+def _allowed_counts(player: Player, filters: ResourceFilter
+                    ) -> tuple[tuple[AnyResource, ...], tuple[int, ...]]:
+    resources = player.resources
+    allowed = tuple(r for r in _allowed(filters) if resources[r] > 0)
+    return allowed, tuple(resources[r] for r in allowed)
+
+
+@functools.lru_cache(maxsize=4096)
+def _multisets(counts: tuple[int, ...], amount: int) -> tuple[tuple[int, ...], ...]:
+    """Every way of taking exactly ``amount`` from the piles of size
+    ``counts`` (as how many are taken from each pile). Only depends on the
+    counts, so is cached by them - no need to invalidate anything when the
+    game changes."""
+    if not counts:
+        return ((),) if amount == 0 else ()
+    first, rest = counts[0], counts[1:]
+    rest_max = sum(rest)
+    result = []
+    # Most of the first pile first, so the order is the same every time
+    for n in range(min(first, amount), max(0, amount - rest_max) - 1, -1):
+        result += [(n,) + tail for tail in _multisets(rest, amount - n)]
+    return tuple(result)
+
+
+def can_pay(player: Player, filters: ResourceFilter, amount: int) -> bool:
+    """Whether ``player`` has ``amount`` resources allowed by ``filters``"""
+    resources = player.resources
+    return sum([resources[r] for r in _allowed(filters)]) >= amount
+
+
+def can_afford(player: Player, cost: CardCost) -> bool:
+    return any(can_pay(player, filters, n)
+               for filters, n in cost.possibilities.items())
+
+
+def spend_options(player: Player, filters: ResourceFilter,
+                  amount: int) -> list[Counter[AnyResource]]:
+    """Every exact set of ``amount`` resources allowed by ``filters`` that
+    ``player`` has"""
+    allowed, counts = _allowed_counts(player, filters)
+    return [Counter({r: n for r, n in zip(allowed, taken) if n})
+            for taken in _multisets(counts, amount)]
+
+
+def payment_options(player: Player, cost: CardCost) -> list[Counter[AnyResource]]:
+    """Every payment for ``cost`` that ``player`` can make (each one once,
+    even if it is allowed by several of the cost's possibilities)"""
+    result = []
+    seen = set()
+    for filters, n in cost.possibilities.items():
+        for payment in spend_options(player, filters, n):
+            if (key := frozenset(payment.items())) not in seen:
+                seen.add(key)
+                result.append(payment)
+    return result
+
+
+def points_lost(player: Player) -> LossFnT:
+    """The points ``player`` would actually lose at the end (with the
+    ``resources_per_point`` of their ruleset) if the game ended now"""
+    per_point = {r: player.ruleset.resources_per_point(r)
+                 for r in AnyResource.members()}
+
+    def loss(r: AnyResource, have: int, taken: int) -> float:
+        n = per_point[r]
+        return have // n - (have - taken) // n
+    return loss
+
+
+def cheapest_spend(player: Player, filters: ResourceFilter, amount: int,
+                   loss: LossT = None) -> Counter[AnyResource] | None:
+    """The exact set of ``amount`` resources allowed by ``filters`` with
+    the smallest total ``loss`` (default: ``points_lost(player)``), or None
+    if the player doesn't have enough. Ties go to the first way found,
+    taking as much as possible of the resources earliest in
+    ``AnyResource.members()``."""
+    result = _solve(player, filters, amount,
+                    points_lost(player) if loss is None else loss)
+    return None if result is None else result[1]
+
+
+def cheapest_payment(player: Player, cost: CardCost, loss: LossT = None
+                     ) -> Counter[AnyResource] | None:
+    """The payment for ``cost`` with the smallest total ``loss`` over all
+    of its possibilities (see ``cheapest_spend()``), or None if the player
+    can't afford it"""
+    if loss is None:
+        loss = points_lost(player)
+    best = None
+    for filters, n in cost.possibilities.items():
+        if (result := _solve(player, filters, n, loss)) is not None and (
+                best is None or result[0] < best[0]):
+            best = result
+    return None if best is None else best[1]
+
+
+def _solve(player: Player, filters: ResourceFilter, amount: int,
+           loss: LossT) -> tuple[float, Counter[AnyResource]] | None:
+    allowed, counts = _allowed_counts(player, filters)
+    if sum(counts) < amount:
+        return None
+    if not callable(loss):
+        # Same cost for each unit, so taking the cheapest first is optimal
+        payment = Counter()
+        total = 0.0
+        for r, have in sorted(zip(allowed, counts), key=lambda i: loss[i[0]]):
+            if amount == 0:
+                break
+            payment[r] = taken = min(amount, have)
+            amount -= taken
+            total += taken * loss[r]
+        return total, payment
+    tables = tuple([tuple([loss(r, have, t) for t in range(min(have, amount) + 1)])
+                    for r, have in zip(allowed, counts)])
+    total, taken = _cheapest(tables, amount)
+    return total, Counter({r: t for r, t in zip(allowed, taken) if t})
+
+
+@functools.lru_cache(maxsize=4096)
+def _cheapest(tables: tuple[tuple[float, ...], ...], amount: int
+              ) -> tuple[float, tuple[int, ...]]:
+    """The cheapest way to take exactly ``amount`` in total, where taking
+    ``t`` of resource ``i`` costs ``tables[i][t]``. Only depends on the
+    losses, so is cached by them (the same few come up again and again)."""
+    # best[j] = (loss, amounts) of the cheapest way to take j resources
+    #  from the resources considered so far. Each resource is a bounded
+    #  knapsack step, so it's O(len(tables) * amount ** 2) overall.
+    inf = float('inf')
+    best: list[tuple[float, tuple[int, ...]]] = [(0.0, ())] + [(inf, ())] * amount
+    for costs in tables:
+        new = [(inf, ())] * (amount + 1)
+        for j, (prev, taken) in enumerate(best):
+            if prev == inf:
+                continue
+            for t in range(min(len(costs) - 1, amount - j), -1, -1):
+                if (total := prev + costs[t]) < new[j + t][0]:
+                    new[j + t] = (total, taken + (t,))
+        best = new
+    return best[amount]
+# endregion
+
+
+# region cards
+def affordable_cards(player: Player) -> list[Card]:
+    return [c for c in player.cards_of_type(Area.HAND)
+            if can_afford(player, c.cost)]
+
+
+def action_types(player: Player) -> list[Literal['buy', 'execute']]:
+    if any(can_afford(player, c.cost) for c in player.cards_of_type(Area.HAND)):
+        return ['buy', 'execute']
+    return ['execute']
+
+
+def placed_cards(player: Player) -> list[Card]:
+    return [c for tp in PlaceableCardType.members()
+            for c in player.cards_of_type(tp)]
+
+
+def move_options(player: Player, adjacencies: AdjacenciesMappingT
+                 ) -> list[Card | None]:
+    """The cards that can be moved (somewhere in ``adjacencies``) and None"""
+    options: list[Card | None] = [
+        c for c in placed_cards(player)
+        if not c.is_starting_card and adjacencies.get(c.location.area)]
+    options.append(None)
+    return options
+# endregion
+
+
+# region decisions
+def _get_action_type(player: Player):
+    return action_types(player)
+
+
+def _get_card_buy(player: Player):
+    return affordable_cards(player)
+
+
+def _get_card_payment(player: Player, cost: CardCost):
+    return payment_options(player, cost)
+
+
+def _get_discard(player: Player):
+    return player.cards_of_type(Area.HAND)
+
+
+def _get_spend(info: EffectExecInfo, filters: ResourceFilter, amount: int):
+    return [*spend_options(info.player, filters, amount), None]
+
+
+def _get_foreach_color(info: EffectExecInfo):
+    return list(Color.members())
+
+
+def _choose_from_discard(info: EffectExecInfo, target: Player,
+                         filters: CardTypeFilter):
+    return [*(c for c in target.cards_of_type(Area.DISCARD)
+              if filters.is_allowed(c.card_type)), None]
+
+
+def _choose_card_exec(info: EffectExecInfo, n_times: int, discard: bool = False):
+    return placed_cards(info.player)
+
+
+def _choose_color_exec(info: EffectExecInfo, n_times: int):
+    return list(Color.members())
+
+
+def _choose_excl_color(info: EffectExecInfo, top_colors: Collection[Color]):
+    return list(top_colors)
+
+
+def _choose_card_move(info: EffectExecInfo, adjacencies: AdjacenciesMappingT):
+    return move_options(info.player, adjacencies)
+
+
+def _choose_move_where(info: EffectExecInfo, card_to_move: Card,
+                       possibilities: Collection[PlaceableCardType]):
+    return [*possibilities, None]
+
+
+_DECISIONS: dict[str, Callable[..., list]] = {
+    f.__name__[1:]: f for f in (
+        _get_action_type, _get_card_buy, _get_card_payment, _get_discard,
+        _get_spend, _get_foreach_color, _choose_from_discard,
+        _choose_card_exec, _choose_color_exec, _choose_excl_color,
+        _choose_card_move, _choose_move_where)
+}
+
+
+def legal_options(name: str, *args) -> list[Any]:
+    """All the legal answers to the IFrontend method ``name`` called with
+    ``args``. Resources are Counters (compare them with ``==``), None is
+    included if it is a valid answer (e.g. not spending)."""
+    try:
+        fn = _DECISIONS[name]
+    except KeyError:
+        raise ValueError(f'{name!r} is not a decision') from None
+    return fn(*args)
+# endregion
@@ -1,17 +1,27 @@
 from __future__ import annotations
 
 from collections import Counter, OrderedDict
-from dataclasses import dataclass, replace as d_replace
+from dataclasses import dataclass, field
 from typing import Callable, TYPE_CHECKING, Sequence, MutableSequence
 
 from .card import Card, CardTemplate, CardCost
+from .common import Location
 from .enums import *
 
 if TYPE_CHECKING:
     from .game import Game
 
 
-@dataclass
+@dataclass(frozen=True)
+class PlayerSnapshot:
+    """The mutable state of a Player. The Card objects are shared with the
+    player, so their location and markers are stored separately."""
+    areas: tuple[tuple[Area, tuple[tuple[Card, Location, int], ...]], ...]
+    resources: tuple[tuple[AnyResource, int], ...]
+    final_score: int | None
+
+
+@dataclass(slots=True)
 class Player:
     idx: int  # Which player we are
     game: Game
@@ -33,8 +43,16 @@ class Player:
     resources: Counter[AnyResource]  # points are also a resource...
     # Used only at the final evaluation:
     final_score: int | None = None
+    # Number of cards (all of them / not counting starting cards) in each
+    #  area. Kept up to date when cards are put in or removed from the areas
+    #  so counting cards is O(1).
+    n_cards: dict[Area, int] = field(default=None, repr=False, compare=False)
+    n_non_starting: dict[Area, int] = field(default=None, repr=False, compare=False)
+
+    _ser_exclude_ = ('game', 'n_cards', 'n_non_starting')
 
-    _ser_exclude_ = ('game',)
+    def __post_init__(self):
+        self.recount()
 
     @classmethod
     def new(cls, idx: int, game: Game):
@@ -46,6 +64,32 @@ class Player:
             self.place_card(c)
         self.resources |= self.ruleset.get_starting_resources()
 
+    def snapshot(self) -> PlayerSnapshot:
+        # Locations are never modified in-place, so can be shared
+        return PlayerSnapshot(
+            tuple([(a, tuple([(c, c.location, c.markers) for c in area.values()]))
+                   for a, area in self.areas.items()]),
+            tuple(self.resources.items()), self.final_score)
+
+    def restore(self, snapshot: PlayerSnapshot, copy_cards=False):
+        """Put the state back to what it was in ``snapshot``. If
+        ``copy_cards`` is false, the same Card objects are used again, so
+        this player (and its game) shouldn't be used at the same time as
+        other players restored from the same snapshot."""
+        areas = {}
+        for area_type, cards in snapshot.areas:
+            area = areas[area_type] = OrderedDict()
+            for c, loc, markers in cards:
+                if copy_cards:
+                    c = c.copy()
+                c.location = loc
+                c.markers = markers
+                area[loc.key] = c
+        self.areas = areas
+        self.recount()
+        self.resources = Counter(dict(snapshot.resources))
+        self.final_score = snapshot.final_score
+
     def place_card(self, card: Card):
         card_type = card.card_type
         assert PlaceableCardType.has_instance(card_type)
@@ -69,7 +113,85 @@ class Player:
 
     @hand.setter
     def hand(self, value: OrderedDict[int, Card]):
-        self.areas[Area.HAND] = value
+        if (journal := self.game.journal) is not None:
+            journal.append((self.set_area, Area.HAND, self.areas[Area.HAND]))
+        self.set_area(Area.HAND, value)
+
+    # region area changes (these keep the counts up to date)
+    def recount(self):
+        self.n_cards = {a: len(cards) for a, cards in self.areas.items()}
+        self.n_non_starting = {
+            a: sum([not c.is_starting_card for c in cards.values()])
+            for a, cards in self.areas.items()}
+
+    def set_area(self, area: Area, value: OrderedDict[int, Card]):
+        self.areas[area] = value
+        self.n_cards[area] = len(value)
+        self.n_non_starting[area] = sum([not c.is_starting_card for c in value.values()])
+
+    def area_put(self, area: Area, key: int, card: Card) -> Card | None:
+        """Put ``card`` at ``key``, returning the card that was there"""
+        cards = self.areas[area]
+        prev = cards.get(key)
+        cards[key] = card
+        if prev is None:
+            self.n_cards[area] += 1
+        elif not prev.is_starting_card:
+            self.n_non_starting[area] -= 1
+        if not card.is_starting_card:
+            self.n_non_starting[area] += 1
+        return prev
+
+    def area_pop(self, area: Area, key: int) -> Card:
+        card = self.areas[area].pop(key)
+        self.n_cards[area] -= 1
+        if not card.is_starting_card:
+            self.n_non_starting[area] -= 1
+        return card
+
+    def area_reinsert(self, area: Area, key: int, card: Card):
+        """Undo ``area_pop()``. The keys in an area are in increasing order
+        (see ``area_next_key()``) so ``card`` goes back before the bigger
+        ones. Only used when rolling back, so it can scan the area."""
+        cards = self.areas[area]
+        later = [k for k in cards if k > key]
+        self.area_put(area, key, card)
+        for k in later:
+            cards.move_to_end(k)
+    # endregion
+
+    def gain_resource(self, resource: AnyResource, amount: int):
+        resources = self.resources
+        if (journal := self.game.journal) is not None:
+            journal.append((self._set_resource, resource, resources.get(resource)))
+        resources[resource] += amount
+
+    def spend_resources(self, spent: Counter[AnyResource]):
+        resources = self.resources
+        if (journal := self.game.journal) is not None:
+            # Only the resources that change: the ones ``-=`` removes (any
+            #  that end up <= 0) and the other spent ones
+            removed = [(r, n) for r, n in resources.items() if n <= spent[r]]
+            if removed:
+                # Putting them back would put them at the end
+                journal.append((self._reorder_resources, tuple(resources)))
+            journal += [(self._set_resource, r, n) for r, n in removed]
+            journal += [(self._set_resource, r, resources.get(r))
+                        for r in spent if resources[r] > spent[r]]
+        resources -= spent
+
+    # Undoing resource changes. These look up self.resources when they're
+    #  called as restore() replaces it.
+    def _set_resource(self, resource: AnyResource, n: int | None):
+        if n is None:
+            self.resources.pop(resource, None)
+        else:
+            self.resources[resource] = n
+
+    def _reorder_resources(self, order: tuple[AnyResource, ...]):
+        resources = self.resources
+        for r in order:
+            resources[r] = resources.pop(r)
 
     def init_hand_from_deck(self, deck: MutableSequence[CardTemplate]):
         self.init_hand([deck.pop() for _ in range(self.ruleset.cards_per_player)])
@@ -113,7 +235,7 @@ class Player:
     def pay_for_card(self, cost: CardCost):
         payment = self.frontend.get_card_payment(self, cost)
         assert cost.matches_exact(payment)
-        self.resources -= payment
+        self.spend_resources(payment)
 
     def action_execute(self):
         self.frontend.get_discard(self).discard(self.game, self)
@@ -126,7 +248,7 @@ class Player:
         effective_color = card.location.area
         if not Color.has_instance(effective_color):
             return False
-        is_last = self.cards_of_type(effective_color)[-1] is card
+        is_last = next(reversed(self.areas[effective_color].values())) is card
         return self.game.does_color_run(effective_color, is_last)
 
     def execute_filtered(self, predicate: Callable[[Card], bool]):
@@ -144,8 +266,13 @@ class Player:
     def posses_area_obj(self, area: OrderedDict[int, Card]):
         """Change the locations of cards in ``area`` to this player. This
         doesn't actually move the cards so **use with caution**!"""
+        journal = self.game.journal
+        idx = self.idx
         for c in area.values():
-            c.location = d_replace(c.location, player=self.idx)
+            loc = c.location
+            if journal is not None:
+                journal.append((setattr, c, 'location', loc))
+            c.location = Location.of(idx, loc.area, loc.key)
         return area
 
     def cards_of_type(self, tp: Area, include_starting=True):
@@ -153,7 +280,7 @@ class Player:
                 [c for c in self.areas[tp].values() if not c.is_starting_card])
 
     def num_cards_of_type(self, tp: Area, include_starting=False):
-        return len(self.cards_of_type(tp, include_starting))
+        return (self.n_cards if include_starting else self.n_non_starting)[tp]
 
     def area_next_key(self, area: Area):
         if len(self.areas[area]) == 0:
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import copy
+import dataclasses
+import json
+import threading
+from collections import Counter
+from time import perf_counter_ns
+from typing import Any, Collection, Literal, TYPE_CHECKING
+
+from .card import CardEffect
+from .common import ResourceFilter, CardTypeFilter, AdjacenciesMappingT
+from .enums import Color, PlaceableCardType, AnyResource
+from .ifrontend import IFrontend
+
+if TYPE_CHECKING:
+    from .card import Card, CardCost, EffectExecInfo
+    from .game import Game
+    from .player import Player
+
+__all__ = ['Profiler']
+
+
+class Profiler:
+    """Counts and times what happens in the games it is attached to:
+
+    - ``'turn'``: ``Player.do_turn``
+    - ``'frontend'``: each IFrontend call (named by method)
+    - ``'effect'``: each ``CardEffect.execute``, including the effects
+      nested inside others (named by effect class). Profiled games run a
+      copy of each effect tree with a timer around every effect instead of
+      the compiled effects, so they are a bit slower
+    - ``'state'``: ``JsonAdapter.serialise_state``
+
+    The engine only checks ``game.profiler``, so this costs almost nothing
+    when no profiler is attached. Times include the time of everything
+    nested inside (e.g. turns include the frontend calls and effects).
+
+    If ``trace`` is true, every event is also kept so it can be exported
+    to the Chrome trace-event format (``write_chrome_trace()``), which
+    trace viewers like Perfetto or chrome://tracing can open."""
+
+    def __init__(self, trace: bool = False):
+        # (category, name): [count, total_ns]
+        self.stats: dict[tuple[str, str], list[int]] = {}
+        # (category, name, start_ns, duration_ns, thread id)
+        self.events: list[tuple[str, str, int, int, int]] | None = [] if trace else None
+        self._origin = perf_counter_ns()
+
+    def attach(self, game: Game):
+        """Start profiling ``game`` (after it has been created)"""
+        if game.profiler is self:
+            return
+        assert game.profiler is None, "Game already has a profiler"
+        game.profiler = self
+        game.frontend = _ProfilingFrontend(game.frontend, self)
+
+    @staticmethod
+    def detach(game: Game):
+        if (frontend := game.frontend) is not None and isinstance(frontend, _ProfilingFrontend):
+            game.frontend = frontend.inner
+        game.profiler = None
+
+    # region recording
+    def add(self, category: str, name: str, start_ns: int):
+        """Record an event that started at ``start_ns``
+        (``time.perf_counter_ns()``) and has just ended"""
+        duration = perf_counter_ns() - start_ns
+        try:
+            entry = self.stats[category, name]
+        except KeyError:
+            entry = self.stats[category, name] = [0, 0]
+        entry[0] += 1
+        entry[1] += duration
+        if self.events is not None:
+            self.events.append((category, name, start_ns, duration,
+                                threading.get_ident()))
+
+    def execute_effect(self, effect: CardEffect, info: EffectExecInfo):
+        """Execute ``effect`` (for ``Card.execute``), timing it and every
+        effect inside it"""
+        try:
+            timed = _timed_effects[effect]
+        except KeyError:
+            timed = _timed_effects[effect] = _TimedEffect(_with_timed_children(effect))
+        timed.execute(info)
+    # endregion
+
+    # region export
+    def summary(self) -> dict[str, dict[str, dict[str, float]]]:
+        """``{category: {name: {'count', 'total_ms', 'mean_us'}}}``, with
+        the names in order of total time"""
+        result: dict[str, dict[str, dict[str, float]]] = {}
+        for (cat, name), (count, total) in sorted(
+                self.stats.items(), key=lambda i: -i[1][1]):
+            result.setdefault(cat, {})[name] = {
+                'count': count, 'total_ms': total / 1e6,
+                'mean_us': total / count / 1e3}
+        return result
+
+    def report(self) -> str:
+        lines = []
+        for cat, entries in self.summary().items():
+            lines.append(f'{cat}:')
+            for name, s in entries.items():
+                lines.append(f'  {name:<28} {s["count"]:8} calls '
+                             f'{s["total_ms"]:10.2f} ms {s["mean_us"]:10.2f} us/call')
+        return '\n'.join(lines)
+
+    def chrome_trace(self) -> dict[str, Any]:
+        """The events in the Chrome trace-event format (complete events,
+        times in microseconds)"""
+        if self.events is None:
+            raise ValueError('Profiler was not created with trace=True')
+        tids: dict[int, int] = {}  # Small numbers are easier to read
+        origin = self._origin
+        events = [{
+            'name': name, 'cat': cat, 'ph': 'X', 'pid': 0,
+            'tid': tids.setdefault(tid, len(tids)),
+            'ts': (start - origin) / 1e3, 'dur': duration / 1e3,
+        } for cat, name, start, duration, tid in self.events]
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def write_chrome_trace(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.chrome_trace(), f, separators=(',', ':'))
+    # endregion
+
+
+# The timed copy of each effect tree, shared like the compiled effects
+_timed_effects: dict[CardEffect, _TimedEffect] = {}
+
+
+class _TimedEffect(CardEffect):
+    """Records the time of ``inner.execute()`` in the game's profiler"""
+
+    def __init__(self, inner: CardEffect):
+        self.inner = inner
+        self.name = type(inner).__name__
+
+    def execute(self, info: EffectExecInfo) -> object | None:
+        profiler = info.game.profiler
+        start = perf_counter_ns()
+        try:
+            return self.inner.execute(info)
+        finally:
+            profiler.add('effect', self.name, start)
+
+
+def _with_timed_children(effect: CardEffect) -> CardEffect:
+    """A copy of ``effect`` with each effect in its fields (and in tuples in
+    its fields) replaced by a _TimedEffect of a copy of it. Effects are
+    immutable, so ``execute()`` only ever reaches its children through its
+    fields."""
+    changes = {}
+    for f in dataclasses.fields(effect) if dataclasses.is_dataclass(effect) else ():
+        value = getattr(effect, f.name)
+        if isinstance(value, CardEffect):
+            changes[f.name] = _TimedEffect(_with_timed_children(value))
+        elif isinstance(value, tuple) and any(isinstance(v, CardEffect) for v in value):
+            changes[f.name] = tuple(
+                _TimedEffect(_with_timed_children(v)) if isinstance(v, CardEffect) else v
+                for v in value)
+    if not changes:
+        return effect
+    # Not dataclasses.replace() as some effects have their own __init__
+    timed = copy.copy(effect)
+    for name, value in changes.items():
+        object.__setattr__(timed, name, value)
+    return timed
+
+
+class _ProfilingFrontend(IFrontend):
+    """Times each call to ``inner``"""
+
+    def __init__(self, inner: IFrontend, profiler: Profiler):
+        self.inner = inner
+        self.profiler = profiler
+
+    def __getattr__(self, name: str):
+        return getattr(self.inner, name)  # Anything specific to inner
+
+    def _call(self, name: str, *args):
+        start = perf_counter_ns()
+        try:
+            return getattr(self.inner, name)(*args)
+        finally:
+            self.profiler.add('frontend', name, start)
+
+    def register_game(self, game: Game):
+        return self._call('register_game', game)
+
+    def register_result(self, winners: list[Player]):
+        return self._call('register_result', winners)
+
+    def on_turn_start(self, player: Player):
+        return self._call('on_turn_start', player)
+
+    def get_action_type(self, player: Player) -> Literal['buy', 'execute']:
+        return self._call('get_action_type', player)
+
+    def get_card_buy(self, player: Player) -> Card:
+        return self._call('get_card_buy', player)
+
+    def get_card_payment(self, player: Player, cost: CardCost) -> Counter[AnyResource]:
+        return self._call('get_card_payment', player, cost)
+
+    def get_discard(self, player: Player) -> Card:
+        return self._call('get_discard', player)
+
+    def get_spend(self, info: EffectExecInfo, filters: ResourceFilter,
+                  amount: int) -> None | Counter[AnyResource]:
+        return self._call('get_spend', info, filters, amount)
+
+    def get_foreach_color(self, info: EffectExecInfo) -> Color:
+        return self._call('get_foreach_color', info)
+
+    def choose_from_discard(self, info: EffectExecInfo, target: Player,
+                            filters: CardTypeFilter) -> Card | None:
+        return self._call('choose_from_discard', info, target, filters)
+
+    def choose_card_exec(self, info: EffectExecInfo, n_times: int,
+                         discard: bool = False) -> Card:
+        return self._call('choose_card_exec', info, n_times, discard)
+
+    def choose_color_exec(self, info: EffectExecInfo, n_times: int) -> Color:
+        return self._call('choose_color_exec', info, n_times)
+
+    def choose_excl_color(self, info: EffectExecInfo,
+                          top_colors: Collection[Color]) -> Color:
+        return self._call('choose_excl_color', info, top_colors)
+
+    def choose_card_move(self, info: EffectExecInfo,
+                         adjacencies: AdjacenciesMappingT) -> Card | None:
+        return self._call('choose_card_move', info, adjacencies)
+
+    def choose_move_where(self, info: EffectExecInfo, card_to_move: Card,
+                          possibilities: Collection[PlaceableCardType]
+                          ) -> PlaceableCardType | None:
+        return self._call('choose_move_where', info, card_to_move, possibilities)
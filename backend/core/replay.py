@@ -0,0 +1,386 @@
+"""Recording games and replaying them at engine speed, e.g. to check that an
+engine change doesn't change the results of real games (see
+``python -m backend.sim.replay``)
+
+A replay log is an append-only file with one game per line (NDJSON)::
+
+    {"v": 1, "ruleset": "DefaultRuleset", "seed": "...", "n_players": 4,
+     "answers": [code, answer, code, answer, ...],
+     "scores": [...], "winners": [...]}
+
+plus ``"rng": "counter"`` for games not using the default ``rng_mode``.
+
+where each ``code`` is the decision (see ``_KINDS``) and its ``answer`` is
+a card as ``[player, area, key]`` (its location when chosen), resources as
+``[resource, n, resource, n, ...]``, an enum as its value, an action type
+as a string, or ``null``.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Callable, Collection, Iterable, Iterator, Literal, Sequence
+
+from .card import Card, CardCost, EffectExecInfo
+from .common import (Location, ResourceFilter, CardTypeFilter,
+                     AdjacenciesMappingT)
+from .enums import Area, Color, PlaceableCardType, AnyResource
+from .game import Game
+from .ifrontend import IFrontend
+from .player import Player
+from .resumable import freeze_answer, thaw_answer
+from .rng import RngMode, RNG_MODES
+from .ruleset import IRuleset, DefaultRuleset
+
+__all__ = ['GameRecord', 'GameResult', 'RecordingFrontend', 'ReplayFrontend',
+           'ReplayLog', 'ReplayError', 'replay_game', 'ruleset_name', 'AnswerT']
+
+
+FORMAT_VERSION = 1
+
+# (decision method name, frozen answer)
+AnswerT = tuple[str, Any]
+
+
+@dataclass(frozen=True)
+class GameResult:
+    """Compact summary of a finished game (cheap to pickle/store)"""
+    seed: str
+    scores: tuple[int, ...]
+    winners: tuple[int, ...]
+
+    @classmethod
+    def from_game(cls, game: Game):
+        return cls(game.seed, tuple(p.final_score for p in game.players),
+                   tuple(p.idx for p in game.winners))
+
+
+class ReplayError(ValueError):
+    pass
+
+
+def ruleset_name(ruleset: IRuleset) -> str:
+    return type(ruleset).__qualname__
+
+
+# region answer encoding
+def _enc_card(loc: Location | None):
+    return None if loc is None else [loc.player, loc.area.value, loc.key]
+
+
+def _dec_card(j) -> Location | None:
+    return None if j is None else Location.of(j[0], Area(j[1]), j[2])
+
+
+def _enc_resources(c: Counter[AnyResource] | None):
+    return None if c is None else [v for r, n in sorted(
+        c.items(), key=lambda i: i[0].value) for v in (r.value, n)]
+
+
+def _dec_resources(j) -> Counter[AnyResource] | None:
+    if j is None:
+        return None
+    return Counter({AnyResource(j[i]): j[i + 1] for i in range(0, len(j), 2)})
+
+
+def _enc_enum(e):
+    return None if e is None else e.value
+
+
+def _enum_decoder(tp: type) -> Callable[[Any], Any]:
+    return lambda j: None if j is None else tp(j)
+
+
+def _identity(o):
+    return o
+
+
+# Decision name: (code, encode, decode) - the encoders take frozen answers
+_KINDS: dict[str, tuple[str, Callable[[Any], Any], Callable[[Any], Any]]] = {
+    'get_action_type': ('a', _identity, _identity),
+    'get_card_buy': ('b', _enc_card, _dec_card),
+    'get_card_payment': ('p', _enc_resources, _dec_resources),
+    'get_discard': ('d', _enc_card, _dec_card),
+    'get_spend': ('s', _enc_resources, _dec_resources),
+    'get_foreach_color': ('f', _enc_enum, _enum_decoder(Color)),
+    'choose_from_discard': ('r', _enc_card, _dec_card),
+    'choose_card_exec': ('x', _enc_card, _dec_card),
+    'choose_color_exec': ('c', _enc_enum, _enum_decoder(Color)),
+    'choose_excl_color': ('e', _enc_enum, _enum_decoder(Color)),
+    'choose_card_move': ('m', _enc_card, _dec_card),
+    'choose_move_where': ('w', _enc_enum, _enum_decoder(PlaceableCardType)),
+}
+_NAME_BY_CODE = {code: name for name, (code, _, _) in _KINDS.items()}
+# endregion
+
+
+@dataclass(frozen=True)
+class GameRecord:
+    """Everything needed to play a game again: its setup and the answers to
+    all the decisions (frozen, see ``freeze_answer()``), and its result so
+    it can be checked."""
+    ruleset: str
+    n_players: int
+    answers: tuple[AnswerT, ...]
+    result: GameResult
+    rng_mode: RngMode = 'compat'
+
+    @classmethod
+    def of_game(cls, game: Game, answers: Sequence[AnswerT]) -> GameRecord:
+        """The record of ``game``, which has finished"""
+        return cls(ruleset_name(game.ruleset), game.n_players, tuple(answers),
+                   GameResult.from_game(game), game.rng_mode)
+
+    @property
+    def seed(self):
+        return self.result.seed
+
+    def to_json(self) -> str:
+        answers = []
+        for name, answer in self.answers:
+            code, encode, _ = _KINDS[name]
+            answers += (code, encode(answer))
+        j = {
+            'v': FORMAT_VERSION, 'ruleset': self.ruleset, 'seed': self.seed,
+            'n_players': self.n_players, 'answers': answers,
+            'scores': self.result.scores, 'winners': self.result.winners,
+        }
+        if self.rng_mode != 'compat':
+            j['rng'] = self.rng_mode
+        return json.dumps(j, separators=(',', ':'))
+
+    @classmethod
+    def from_json(cls, line: str) -> GameRecord:
+        try:
+            j = json.loads(line)
+            version = j['v']
+        except (ValueError, TypeError, KeyError) as e:
+            raise ReplayError(f'Bad replay record: {e!r}') from e
+        if version != FORMAT_VERSION:
+            raise ReplayError(f'Unknown replay format version {version!r}')
+        try:
+            flat = j['answers']
+            answers = []
+            for i in range(0, len(flat), 2):
+                name = _NAME_BY_CODE[flat[i]]
+                answers.append((name, _KINDS[name][2](flat[i + 1])))
+            if (rng_mode := j.get('rng', 'compat')) not in RNG_MODES:
+                raise ValueError(f'Unknown rng mode {rng_mode!r}')
+            return cls(j['ruleset'], j['n_players'], tuple(answers), GameResult(
+                j['seed'], tuple(j['scores']), tuple(j['winners'])), rng_mode)
+        except (ValueError, TypeError, KeyError, IndexError) as e:
+            raise ReplayError(f'Bad replay record: {e!r}') from e
+
+
+class ReplayLog:
+    """An append-only replay file, one game per line. ``append()`` can be
+    called from many threads (e.g. a server's games)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def append(self, record: GameRecord):
+        line = record.to_json() + '\n'
+        with self._lock, open(self.path, 'a', encoding='utf-8') as f:
+            f.write(line)
+
+    def extend(self, records: Iterable[GameRecord]):
+        for r in records:
+            self.append(r)
+
+    def __iter__(self) -> Iterator[GameRecord]:
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield GameRecord.from_json(line)
+
+
+class RecordingFrontend(IFrontend):
+    """Passes each decision to ``inner`` and records its answer. When the
+    game ends, its record is given to ``on_record`` (if set) and is
+    available as ``self.record``."""
+
+    game: Game
+
+    def __init__(self, inner: IFrontend,
+                 on_record: Callable[[GameRecord], None] = None):
+        self.inner = inner
+        self.on_record = on_record
+        self.answers: list[AnswerT] = []
+        self.record: GameRecord | None = None
+
+    def register_game(self, game: Game):
+        self.game = game
+        self.answers = []
+        self.inner.register_game(game)
+
+    def register_result(self, winners: list[Player]):
+        self.record = GameRecord.of_game(self.game, self.answers)
+        if self.on_record is not None:
+            self.on_record(self.record)
+        self.inner.register_result(winners)
+
+    def on_turn_start(self, player: Player):
+        self.inner.on_turn_start(player)
+
+    def _rec(self, name: str, answer):
+        # Freeze now - a card's location will change once it's used
+        self.answers.append((name, freeze_answer(answer)))
+        return answer
+
+    def get_action_type(self, player: Player) -> Literal['buy', 'execute']:
+        return self._rec('get_action_type', self.inner.get_action_type(player))
+
+    def get_card_buy(self, player: Player) -> Card:
+        return self._rec('get_card_buy', self.inner.get_card_buy(player))
+
+    def get_card_payment(self, player: Player, cost: CardCost) -> Counter[AnyResource]:
+        return self._rec('get_card_payment', self.inner.get_card_payment(player, cost))
+
+    def get_discard(self, player: Player) -> Card:
+        return self._rec('get_discard', self.inner.get_discard(player))
+
+    def get_spend(self, info: EffectExecInfo, filters: ResourceFilter,
+                  amount: int) -> None | Counter[AnyResource]:
+        return self._rec('get_spend', self.inner.get_spend(info, filters, amount))
+
+    def get_foreach_color(self, info: EffectExecInfo) -> Color:
+        return self._rec('get_foreach_color', self.inner.get_foreach_color(info))
+
+    def choose_from_discard(self, info: EffectExecInfo, target: Player,
+                            filters: CardTypeFilter) -> Card | None:
+        return self._rec('choose_from_discard',
+                         self.inner.choose_from_discard(info, target, filters))
+
+    def choose_card_exec(self, info: EffectExecInfo, n_times: int,
+                         discard: bool = False) -> Card:
+        return self._rec('choose_card_exec',
+                         self.inner.choose_card_exec(info, n_times, discard))
+
+    def choose_color_exec(self, info: EffectExecInfo, n_times: int) -> Color:
+        return self._rec('choose_color_exec',
+                         self.inner.choose_color_exec(info, n_times))
+
+    def choose_excl_color(self, info: EffectExecInfo,
+                          top_colors: Collection[Color]) -> Color:
+        return self._rec('choose_excl_color',
+                         self.inner.choose_excl_color(info, top_colors))
+
+    def choose_card_move(self, info: EffectExecInfo,
+                         adjacencies: AdjacenciesMappingT) -> Card | None:
+        return self._rec('choose_card_move',
+                         self.inner.choose_card_move(info, adjacencies))
+
+    def choose_move_where(self, info: EffectExecInfo, card_to_move: Card,
+                          possibilities: Collection[PlaceableCardType]
+                          ) -> PlaceableCardType | None:
+        return self._rec('choose_move_where', self.inner.choose_move_where(
+            info, card_to_move, possibilities))
+
+
+class ReplayFrontend(IFrontend):
+    """Gives the recorded answers in order (no I/O and no decisions, so the
+    game runs at engine speed). Raises ReplayError if the game asks for
+    something else, i.e. the engine no longer plays the same way."""
+
+    game: Game
+
+    def __init__(self, answers: Sequence[AnswerT]):
+        self.answers = answers
+        self.n_given = 0
+
+    def register_game(self, game: Game):
+        self.game = game
+
+    def register_result(self, winners: list[Player]):
+        pass
+
+    @property
+    def finished(self):
+        return self.n_given >= len(self.answers)
+
+    def _next(self, name: str):
+        i = self.n_given
+        if i >= len(self.answers):
+            raise ReplayError(f'Ran out of answers, game wants {name}()')
+        expected, answer = self.answers[i]
+        if expected != name:
+            raise ReplayError(f'Recorded {expected}() but game wants {name}() '
+                              f'(answer {i})')
+        self.n_given = i + 1
+        return thaw_answer(answer, self.game)
+
+    def get_action_type(self, player: Player) -> Literal['buy', 'execute']:
+        return self._next('get_action_type')
+
+    def get_card_buy(self, player: Player) -> Card:
+        return self._next('get_card_buy')
+
+    def get_card_payment(self, player: Player, cost: CardCost) -> Counter[AnyResource]:
+        return self._next('get_card_payment')
+
+    def get_discard(self, player: Player) -> Card:
+        return self._next('get_discard')
+
+    def get_spend(self, info: EffectExecInfo, filters: ResourceFilter,
+                  amount: int) -> None | Counter[AnyResource]:
+        return self._next('get_spend')
+
+    def get_foreach_color(self, info: EffectExecInfo) -> Color:
+        return self._next('get_foreach_color')
+
+    def choose_from_discard(self, info: EffectExecInfo, target: Player,
+                            filters: CardTypeFilter) -> Card | None:
+        return self._next('choose_from_discard')
+
+    def choose_card_exec(self, info: EffectExecInfo, n_times: int,
+                         discard: bool = False) -> Card:
+        return self._next('choose_card_exec')
+
+    def choose_color_exec(self, info: EffectExecInfo, n_times: int) -> Color:
+        return self._next('choose_color_exec')
+
+    def choose_excl_color(self, info: EffectExecInfo,
+                          top_colors: Collection[Color]) -> Color:
+        return self._next('choose_excl_color')
+
+    def choose_card_move(self, info: EffectExecInfo,
+                         adjacencies: AdjacenciesMappingT) -> Card | None:
+        return self._next('choose_card_move')
+
+    def choose_move_where(self, info: EffectExecInfo, card_to_move: Card,
+                          possibilities: Collection[PlaceableCardType]
+                          ) -> PlaceableCardType | None:
+        return self._next('choose_move_where')
+
+
+def replay_game(record: GameRecord, ruleset: IRuleset = None) -> GameResult:
+    """Play the game again with the recorded answers and return its result
+    (compare it to ``record.result`` to check it is unchanged). If the
+    game rejects a recorded answer (e.g. it is no longer legal after an
+    engine change) that is a ReplayError too."""
+    if ruleset is None:
+        ruleset = DefaultRuleset()
+    if ruleset_name(ruleset) != record.ruleset:
+        raise ReplayError(f'Game was recorded with {record.ruleset}, '
+                          f'not {ruleset_name(ruleset)}')
+    frontend = ReplayFrontend(record.answers)
+    game = Game(record.n_players, frontend, ruleset, seed=record.seed,
+                rng_mode=record.rng_mode)
+    try:
+        game.run_game()
+    except ReplayError:
+        raise
+    except Exception as e:
+        if (i := frontend.n_given - 1) < 0:
+            raise ReplayError(f'Game failed before the first answer: {e!r}') from e
+        raise ReplayError(f'Game rejected answer {i} to {record.answers[i][0]}(): '
+                          f'{e!r}') from e
+    if not frontend.finished:
+        raise ReplayError(f'Game finished with {len(record.answers) - frontend.n_given}'
+                          f' answers left over')
+    return GameResult.from_game(game)
@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Collection, Literal, TYPE_CHECKING
+
+from .card import Card, CardCost, EffectExecInfo
+from .common import (Location, ResourceFilter, CardTypeFilter,
+                     AdjacenciesMappingT)
+from .enums import Color, PlaceableCardType, AnyResource
+from .game import Game, GameSnapshot, Checkpoint
+from .ifrontend import IFrontend
+from .legal_moves import legal_options
+from .player import Player
+from .rng import RngMode
+
+if TYPE_CHECKING:
+    from .ruleset import IRuleset
+
+__all__ = ['ResumableGame', 'Decision', 'ParkedGame', 'AnswerRejected',
+           'freeze_answer', 'thaw_answer']
+
+
+def freeze_answer(answer):
+    """Make an answer independent of the Game it was given for (so it can be
+    used in copies of it). Cards are replaced by their location."""
+    if isinstance(answer, Card):
+        return answer.location
+    if isinstance(answer, Counter):
+        return Counter(answer)
+    return answer
+
+
+def thaw_answer(answer, game: Game):
+    if isinstance(answer, Location):
+        return answer.get(game)
+    if isinstance(answer, Counter):
+        return Counter(answer)
+    return answer
+
+
+class AnswerRejected(ValueError):
+    """The answer made the game raise an error (its ``__cause__``), so it
+    was discarded and the same decision is still waiting"""
+
+
+@dataclass(frozen=True)
+class Decision:
+    """A call to an ``IFrontend`` method that needs answering. The arguments
+    refer to the live game so are only valid until the game is resumed."""
+    name: str
+    args: tuple
+
+    @property
+    def player(self) -> Player:
+        """The player who is deciding"""
+        first = self.args[0]
+        return first if isinstance(first, Player) else first.player
+
+    def ask(self, frontend: IFrontend):
+        """Get the answer from another frontend (e.g. a bot)"""
+        return getattr(frontend, self.name)(*self.args)
+
+    def options(self) -> list[Any]:
+        """All the legal answers, see ``legal_options()``"""
+        return legal_options(self.name, *self.args)
+
+
+@dataclass(frozen=True)
+class ParkedGame:
+    """Everything needed to continue a ResumableGame (e.g. in another process
+    or after saving it), see ``ResumableGame.park()``"""
+    n_players: int
+    seed: str
+    turn_start: GameSnapshot
+    answers: tuple[Any, ...]  # Since turn_start (frozen)
+    finished: bool
+    rng_mode: RngMode = 'compat'
+
+
+class _Suspend(BaseException):
+    # Not an Exception so nothing in the engine can accidentally catch it
+    def __init__(self, decision: Decision):
+        super().__init__(decision)
+        self.decision = decision
+
+
+class ResumableGame:
+    """Runs a Game without blocking for each decision: ``start()`` and
+    ``answer()`` return the next Decision (or None when the game is over)
+    instead of waiting for an IFrontend to give it. So there doesn't need
+    to be a thread per game and waiting games only take up memory.
+
+    The engine itself is synchronous, so when a decision is needed, the
+    turn is unwound and, once it is answered, the turn is replayed from its
+    start (rolled back using the game's journal) with the answers so far.
+    This means each answer costs as much as running the turn so far."""
+
+    def __init__(self, game: Game):
+        self.game = game
+        self._frontend = _SuspendingFrontend(self)
+        game.frontend = self._frontend
+        self._frontend.register_game(game)
+        self.answers: list[Any] = []  # For the current turn (frozen)
+        self.decision: Decision | None = None
+        self.finished = False
+        self.winners: list[Player] | None = None
+        self._turn_start: Checkpoint | None = None
+        self._replaying = False
+
+    @classmethod
+    def new(cls, n_players: int, ruleset: IRuleset, seed: int | str = None,
+            rng_mode: RngMode = 'compat'):
+        return cls(Game(n_players, _SuspendingFrontend(None), ruleset,
+                        seed=seed, rng_mode=rng_mode))
+
+    def start(self) -> Decision | None:
+        return self._run(self.game.run_game)
+
+    def answer(self, answer) -> Decision | None:
+        """Give the answer to ``self.decision``, returns the next decision.
+        If the answer makes the game raise an error, it is discarded (so the
+        same decision is still waiting) and AnswerRejected is raised from it.
+        Errors that can't be blamed on the answer are re-raised as they are."""
+        assert self.decision is not None, "No decision to answer"
+        turn_start = self._turn_start
+        self.answers.append(freeze_answer(answer))
+        try:
+            return self._replay()
+        except Exception as e:
+            if self._turn_start is not turn_start:  # Not the answer's fault
+                raise
+            self.answers.pop()
+            self._replay()
+            raise AnswerRejected(f'Answer {answer!r} rejected: {e!r}') from e
+
+    def park(self) -> ParkedGame:
+        """Save the game, so it can be continued using ``unpark()``"""
+        assert self.decision is not None or self.finished, "Not started"
+        if self.finished:
+            return ParkedGame(self.game.n_players, self.game.seed,
+                              self.game.snapshot(), (), True, self.game.rng_mode)
+        self.game.rollback(self._turn_start)
+        parked = ParkedGame(self.game.n_players, self.game.seed,
+                            self.game.snapshot(), tuple(self.answers), False,
+                            self.game.rng_mode)
+        self._replay()
+        return parked
+
+    @classmethod
+    def unpark(cls, parked: ParkedGame, ruleset: IRuleset) -> ResumableGame:
+        inst = cls.new(parked.n_players, ruleset, parked.seed, parked.rng_mode)
+        inst.game.restore(parked.turn_start, copy_cards=True)
+        if parked.finished:
+            inst.finished = True
+            inst.winners = inst.game.winners
+            return inst
+        inst.answers = list(parked.answers)
+        inst._turn_start = inst.game.checkpoint()
+        inst._replaying = True
+        inst._run(inst.game.resume)
+        return inst
+
+    def _replay(self):
+        self.game.rollback(self._turn_start)
+        self._replaying = True
+        return self._run(self.game.resume)
+
+    def _run(self, fn) -> Decision | None:
+        self._frontend.n_given = 0
+        try:
+            fn()
+        except _Suspend as s:
+            self.decision = s.decision
+        else:
+            self.decision = None
+            self.finished = True
+        return self.decision
+
+    def _on_turn_start(self):
+        if self._replaying:  # Replaying this turn, so keep its answers
+            self._replaying = False
+            return
+        # Nothing will be rolled back past here so the journal can restart
+        self.game.stop_journal()
+        self._turn_start = self.game.checkpoint()
+        self.answers = []
+        self._frontend.n_given = 0
+
+    def _on_result(self, winners: list[Player]):
+        self.winners = winners
+
+
+class _SuspendingFrontend(IFrontend):
+    """Gives the answers recorded so far, then suspends the game"""
+
+    game: Game
+
+    def __init__(self, owner: ResumableGame | None):
+        self.owner = owner
+        self.n_given = 0
+
+    def register_game(self, game: Game):
+        self.game = game
+
+    def register_result(self, winners: list[Player]):
+        self.owner._on_result(winners)
+
+    def on_turn_start(self, player: Player):
+        self.owner._on_turn_start()
+
+    def _answer(self, name: str, *args):
+        answers = self.owner.answers
+        if self.n_given >= len(answers):
+            raise _Suspend(Decision(name, args))
+        self.n_given += 1
+        return thaw_answer(answers[self.n_given - 1], self.game)
+
+    def get_action_type(self, player: Player) -> Literal['buy', 'execute']:
+        return self._answer('get_action_type', player)
+
+    def get_card_buy(self, player: Player) -> Card:
+        return self._answer('get_card_buy', player)
+
+    def get_card_payment(self, player: Player, cost: CardCost) -> Counter[AnyResource]:
+        return self._answer('get_card_payment', player, cost)
+
+    def get_discard(self, player: Player) -> Card:
+        return self._answer('get_discard', player)
+
+    def get_spend(self, info: EffectExecInfo, filters: ResourceFilter,
+                  amount: int) -> None | Counter[AnyResource]:
+        return self._answer('get_spend', info, filters, amount)
+
+    def get_foreach_color(self, info: EffectExecInfo) -> Color:
+        return self._answer('get_foreach_color', info)
+
+    def choose_from_discard(self, info: EffectExecInfo, target: Player,
+                            filters: CardTypeFilter) -> Card | None:
+        return self._answer('choose_from_discard', info, target, filters)
+
+    def choose_card_exec(self, info: EffectExecInfo, n_times: int,
+                         discard: bool = False) -> Card:
+        return self._answer('choose_card_exec', info, n_times, discard)
+
+    def choose_color_exec(self, info: EffectExecInfo, n_times: int) -> Color:
+        return self._answer('choose_color_exec', info, n_times)
+
+    def choose_excl_color(self, info: EffectExecInfo,
+                          top_colors: Collection[Color]) -> Color:
+        return self._answer('choose_excl_color', info, top_colors)
+
+    def choose_card_move(self, info: EffectExecInfo,
+                         adjacencies: AdjacenciesMappingT) -> Card | None:
+        return self._answer('choose_card_move', info, adjacencies)
+
+    def choose_move_where(self, info: EffectExecInfo, card_to_move: Card,
+                          possibilities: Collection[PlaceableCardType]
+                          ) -> PlaceableCardType | None:
+        return self._answer('choose_move_where', info, card_to_move, possibilities)
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import hashlib
+import random
+import struct
+from typing import Literal, MutableSequence, Sequence, TypeVar
+
+__all__ = ['RngMode', 'RNG_MODES', 'CounterRng', 'derived_rng']
+
+T = TypeVar('T')
+
+# - 'compat': a random.Random seeded with a string, so games (and replays)
+#   from before 'counter' was added are dealt the same
+# - 'counter': CounterRng, much cheaper to create (and to shuffle with)
+RngMode = Literal['compat', 'counter']
+RNG_MODES: tuple[RngMode, ...] = ('compat', 'counter')
+
+_BLOCK = struct.Struct('<8Q')  # A 64-byte blake2b digest as 8 64-bit words
+
+
+class CounterRng:
+    """A counter-based random stream: block ``i`` is the BLAKE2b hash of
+    the key followed by ``i``, split into 64-bit words. Creating one is just
+    hashing the key (``random.Random`` hashes a string seed with SHA-512 and
+    then fills in the whole Mersenne Twister state), so it is cheap to make
+    one for each thing that needs to be random.
+
+    Numbers below ``n`` are ``(word * n) >> 64``; the bias from that is
+    at most ``n / 2**64``, which doesn't matter for shuffling cards.
+    Only the methods of ``random.Random`` that the game uses are here."""
+
+    __slots__ = ('_hash', '_counter', '_words')
+
+    def __init__(self, key: bytes):
+        self._hash = hashlib.blake2b(key)
+        self._counter = 0
+        self._words: list[int] = []
+
+    def _refill(self) -> list[int]:
+        h = self._hash.copy()
+        h.update(self._counter.to_bytes(8, 'little'))
+        self._counter += 1
+        # Reversed as they are pop()ed from the end
+        self._words = words = list(_BLOCK.unpack(h.digest()))[::-1]
+        return words
+
+    def _next_word(self) -> int:
+        return (self._words or self._refill()).pop()
+
+    def getrandbits(self, k: int) -> int:
+        value, n_bits = 0, 0
+        while n_bits < k:
+            value |= self._next_word() << n_bits
+            n_bits += 64
+        return value & ((1 << k) - 1)
+
+    def random(self) -> float:
+        """A float in [0.0, 1.0)"""
+        return (self._next_word() >> 11) * (1.0 / (1 << 53))
+
+    def randrange(self, start: int, stop: int = None) -> int:
+        if stop is None:
+            start, stop = 0, start
+        if stop <= start:
+            raise ValueError(f'empty range for randrange({start}, {stop})')
+        return start + ((self._next_word() * (stop - start)) >> 64)
+
+    def choice(self, seq: Sequence[T]) -> T:
+        if not seq:
+            raise IndexError('Cannot choose from an empty sequence')
+        return seq[(self._next_word() * len(seq)) >> 64]
+
+    def shuffle(self, x: MutableSequence):
+        """Shuffle ``x`` in place (Fisher-Yates, like ``random.shuffle``)"""
+        words = self._words
+        for i in reversed(range(1, len(x))):
+            if not words:
+                words = self._refill()
+            j = (words.pop() * (i + 1)) >> 64
+            x[i], x[j] = x[j], x[i]
+
+
+def derived_rng(seed: str, reason: str, *args: object,
+                mode: RngMode = 'compat') -> random.Random | CounterRng:
+    """The random source used for ``reason`` in a game with this seed"""
+    seed_str = f'{seed}+[{reason}@{args!s}]'
+    if mode == 'counter':
+        return CounterRng(seed_str.encode())
+    if mode != 'compat':
+        raise ValueError(f'Unknown rng mode {mode!r}')
+    return random.Random(seed_str)
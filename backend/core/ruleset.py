@@ -2,14 +2,41 @@ from __future__ import annotations
 
 import abc
 from collections import Counter
-from typing import Sequence, Collection
+from typing import Sequence, Collection, Iterable
 
-from .card import CardTemplate, CardCost, CardEffect
+from .card import CardTemplate, Card, CardCost, CardEffect
 from .card_effects import *
 from .common import ResourceFilter
 from .enums import MoonPhase, AnyResource, Color, PlaceableCardType, CardType, Area
 
-__all__ = ['IRuleset', 'DefaultRuleset']
+__all__ = ['IRuleset', 'DefaultRuleset', 'CardCatalogue']
+
+
+class CardCatalogue:
+    """Stable ids for card templates (their index in ``templates``).
+    Equal templates get the same id."""
+
+    def __init__(self, templates: Iterable[CardTemplate]):
+        self._all = tuple(templates)  # Keep alive so the id()s stay valid
+        self._ids: dict[CardTemplate, int] = {}
+        for t in self._all:
+            self._ids.setdefault(t, len(self._ids))
+        self.templates = tuple(self._ids)
+        # Cards keep a reference to the template they were made from so try
+        #  that first (hashing effects is slow)
+        self._ids_by_obj = {id(t): self._ids[t] for t in self._all}
+
+    def __len__(self):
+        return len(self.templates)
+
+    def id_of(self, card: CardTemplate | Card) -> int:
+        """The id of ``card``'s template (or of ``card`` if it's a template).
+        Raises KeyError if it isn't in the catalogue."""
+        t = card.template if isinstance(card, Card) else card
+        try:
+            return self._ids_by_obj[id(t)]
+        except KeyError:
+            return self._ids[t]
 
 
 class IRuleset(abc.ABC):
@@ -46,10 +73,18 @@ class IRuleset(abc.ABC):
     def get_starting_resources(self) -> Counter[AnyResource]:
         ...
 
+    def get_catalogue(self) -> CardCatalogue:
+        """All the cards that can be dealt: the starting cards and then
+        each round's deck. Subclasses should cache this."""
+        return CardCatalogue([*self.get_starting_cards(),
+                              *(t for r in range(3) for t in self.get_deck(r))])
+
 
 # noinspection PyMethodMayBeStatic
 class DefaultRuleset(IRuleset):
     _decks_cached: list[list[CardTemplate]] = None
+    _starting_cached: list[CardTemplate] = None
+    _catalogue_cached: CardCatalogue = None
 
     def _starting_card_effect(self, color: Color):
         if color != Color.YELLOW:
@@ -58,9 +93,17 @@ class DefaultRuleset(IRuleset):
                              GainResource(Color.YELLOW, 1))
 
     def get_starting_cards(self) -> list[CardTemplate]:
-        return [CardTemplate(c, self._starting_card_effect(c), CardCost.free(),
+        if (cards := type(self)._starting_cached) is None:
+            cards = type(self)._starting_cached = [
+                CardTemplate(c, self._starting_card_effect(c), CardCost.free(),
                              is_starting_card=True)
                 for c in Color.members()]
+        return cards.copy()
+
+    def get_catalogue(self) -> CardCatalogue:
+        if (catalogue := type(self)._catalogue_cached) is None:
+            catalogue = type(self)._catalogue_cached = super().get_catalogue()
+        return catalogue
 
     def get_deck(self, round_idx: int) -> list[CardTemplate]:
         return self._get_decks()[round_idx]
@@ -73,11 +116,13 @@ class DefaultRuleset(IRuleset):
     def get_swap_dirn(self, round_idx: int) -> int:
         return [1, -1, 1][round_idx]
 
+    _resources_per_point = {
+        AnyResource.PURPLE: 3, AnyResource.GREEN: 3,  AnyResource.RED: -1,
+        AnyResource.BLUE: 3,  AnyResource.YELLOW: 1, AnyResource.POINTS: 1
+    }
+
     def resources_per_point(self, r: AnyResource) -> int:
-        return {
-            AnyResource.PURPLE: 3, AnyResource.GREEN: 3,  AnyResource.RED: -1,
-            AnyResource.BLUE: 3,  AnyResource.YELLOW: 1, AnyResource.POINTS: 1
-        }[r]
+        return self._resources_per_point[r]
 
     def get_adjacencies(self) -> dict[PlaceableCardType, Collection[PlaceableCardType]]:
         return {Color.PURPLE: {Color.GREEN},
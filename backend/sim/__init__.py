@@ -0,0 +1,6 @@
+from .bots import *
+from .runner import *
+from .tournament import *
+from .scripted import *
+from .mcts import *
+from .replay import *
@@ -0,0 +1,75 @@
+"""Headless self-play: ``python -m backend.sim -n 1000 --bots greedy,random``"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from .bots import BOTS
+from .runner import run_games, game_seed
+from .tournament import run_tournament
+from ..core import Profiler
+
+
+def parse_bots(spec: str, n_players: int | None):
+    bots = spec.split(',')
+    if len(bots) == 1 and n_players is not None:
+        bots *= n_players
+    if n_players is not None and len(bots) != n_players:
+        raise SystemExit(f'Got {len(bots)} bots for {n_players} players')
+    if unknown := [b for b in bots if b not in BOTS]:
+        raise SystemExit(f'Unknown bot(s) {unknown}, '
+                         f'expected one of {", ".join(BOTS)}')
+    return bots
+
+
+def make_parser():
+    parser = argparse.ArgumentParser(
+        prog='python -m backend.sim', description='Play seeded games between bots')
+    parser.add_argument('-n', '--games', type=int, default=100)
+    parser.add_argument('-p', '--players', type=int, default=None,
+                        help='Number of players (default: one per --bots entry, or 4)')
+    parser.add_argument('-b', '--bots', default='greedy',
+                        help=f'Comma-separated bot for each seat (or one for '
+                             f'all seats), from: {", ".join(BOTS)}')
+    parser.add_argument('-s', '--seed', default=None,
+                        help='Base seed, game i uses "<seed>/<i>"')
+    parser.add_argument('-j', '--workers', type=int, default=1,
+                        help='Worker processes to shard games across '
+                             '(0 = one per CPU)')
+    parser.add_argument('--profile', action='store_true',
+                        help='Print where the time went (only with -j 1)')
+    parser.add_argument('--trace', metavar='PATH', default=None,
+                        help='Save a Chrome trace-event file of the games '
+                             '(only with -j 1)')
+    return parser
+
+
+def main(argv: list[str] = None):
+    args = make_parser().parse_args(argv)
+    n_players = args.players
+    if n_players is None and ',' not in args.bots:
+        n_players = 4
+    bots = parse_bots(args.bots, n_players)
+    base_seed = args.seed if args.seed is not None else time.time_ns()
+    profiler = None
+    if args.profile or args.trace:
+        if args.workers != 1:
+            raise SystemExit('--profile and --trace need -j 1')
+        profiler = Profiler(trace=args.trace is not None)
+    if args.workers == 1:
+        seeds = (game_seed(base_seed, i) for i in range(args.games))
+        stats = run_games(seeds, bots, profiler=profiler)
+    else:
+        stats = run_tournament(args.games, bots, base_seed,
+                               workers=args.workers or None)
+    print(f'Base seed: {base_seed}')
+    print(stats.report(bots))
+    if args.trace:
+        profiler.write_chrome_trace(args.trace)
+    if profiler is not None:
+        print(profiler.report())
+
+
+if __name__ == '__main__':
+    main()
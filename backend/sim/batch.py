@@ -0,0 +1,639 @@
+"""Struct-of-arrays engine that plays many games in lockstep using NumPy:
+``python -m backend.sim.batch -n 10000 -p 4``
+
+All the state is held in arrays shaped ``(games, players, ...)`` so each
+step of the game (and each card effect) is a few vectorised operations over
+every game in the batch instead of one Python call per game.
+
+Only the deterministic effects are supported (the only decision they ask for
+is whether to spend resources) and every seat plays the same fixed policy:
+
+- Buy the first card in hand that is supported and affordable, paying with
+  the first way of paying the cost that can be afforded. Otherwise, execute,
+  discarding the first card in hand.
+- Always spend resources when an effect asks for them and there are enough.
+- Resources are taken least valuable first (as ``BotFrontend`` does).
+
+``ReferenceBot`` plays the same policy on the object engine, so for the same
+seed both engines give the same final scores.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from dataclasses import dataclass
+from typing import Callable, Sequence, TypeVar
+
+import numpy as np
+
+from .bots import BotFrontend
+from .runner import GameResult, SimStats, game_seed
+from ..core import (Player, Card, CardTemplate, CardEffect, IRuleset,
+                    DefaultRuleset, AnyResource, Area, Color, MoonPhase,
+                    PlaceableCardType, NullEffect, GainResource, SpendResource,
+                    AddMarker, RemoveMarker, DiscardThis, EffectGroup,
+                    StrictEffectGroup, ConvertEffect, SuppressFail,
+                    ConditionalEffect, _ComparisonCond, MostCardsOfType,
+                    ForEachMarker, ForEachCardOfType, ForEachColorSet,
+                    ForEachDiscard, ForEachPlacedMagic, ForEachEmptyColor,
+                    ForEachM, ConstMeasure, CardsOfType, DiscardedCards,
+                    NumMarkers, ResourceCount, RngMode, RNG_MODES,
+                    derived_rng)
+
+__all__ = ['BatchState', 'BatchEngine', 'ReferenceBot', 'UnsupportedEffect',
+           'effect_kernel', 'is_supported', 'run_batch']
+
+
+T = TypeVar('T')
+
+N_ROUNDS = 3
+N_TURNS = 6
+
+_RESOURCES = AnyResource.members()
+_AREAS = Area.members()
+_MOONS = MoonPhase.members()
+_R_IDX = {r: i for i, r in enumerate(_RESOURCES)}
+_A_IDX = {a: i for i, a in enumerate(_AREAS)}
+_M_IDX = {m: i for i, m in enumerate(_MOONS)}
+_COLORS = np.array([_A_IDX[c] for c in Color.members()])
+_DISCARD = _A_IDX[Area.DISCARD]
+_ARTIFACT = _A_IDX[Area.ARTIFACT]
+_LAST_TURN = _M_IDX[MoonPhase.LAST_TURN]
+
+# The card an effect is being executed for: (player, area, slot)
+LocT = tuple[int, int, int]
+# Runs an effect/measure for the games ``g`` (distinct indices into the batch)
+KernelT = Callable[['BatchState', np.ndarray, LocT], np.ndarray | None]
+
+
+class UnsupportedEffect(Exception):
+    """The effect needs a decision that the batch engine can't make"""
+
+
+@dataclass
+class BatchState:
+    """The state of all the games in a batch. Cards are stored as indices
+    into ``BatchEngine.templates`` (-1 for no card)"""
+    resources: np.ndarray  # (games, players, resources)
+    cards: np.ndarray  # (games, players, areas, slots), placed cards
+    markers: np.ndarray  # (games, players, areas, slots)
+    next_slot: np.ndarray  # (games, players, areas), like area_next_key()
+    counts: np.ndarray  # (games, players, areas), like num_cards_of_type()
+    hands: np.ndarray  # (games, players, cards_per_player)
+    moons: np.ndarray  # (games, turns, moon phases), which phases are active
+    is_starting: np.ndarray  # (templates,)
+    spend_order: Sequence[int]  # Resource indices, least valuable first
+
+    @classmethod
+    def empty(cls, n_games: int, n_players: int, n_slots: int, hand_size: int,
+              is_starting: np.ndarray, spend_order: Sequence[int]):
+        gp = (n_games, n_players)
+        return cls(
+            resources=np.zeros(gp + (len(_RESOURCES),), np.int64),
+            cards=np.full(gp + (len(_AREAS), n_slots), -1, np.int32),
+            markers=np.zeros(gp + (len(_AREAS), n_slots), np.int64),
+            next_slot=np.zeros(gp + (len(_AREAS),), np.int64),
+            counts=np.zeros(gp + (len(_AREAS),), np.int64),
+            hands=np.full(gp + (hand_size,), -1, np.int32),
+            moons=np.zeros((n_games, N_TURNS, len(_MOONS)), bool),
+            is_starting=is_starting, spend_order=spend_order)
+
+    def pay(self, g: np.ndarray, p: int, allowed: np.ndarray, amount):
+        """Take ``amount`` of the ``allowed`` resources (least valuable first)
+        from player ``p`` in games ``g``, who must have enough of them.
+        ``allowed`` is ``(resources,)`` or ``(len(g), resources)``."""
+        left = np.array(amount, np.int64)
+        for r in self.spend_order:
+            have = self.resources[g, p, r]
+            taken = np.where(allowed[..., r], np.minimum(have, left), 0)
+            self.resources[g, p, r] = have - taken
+            left = left - taken
+
+    def place(self, g: np.ndarray, p: int, area: np.ndarray, t: np.ndarray):
+        slot = self.next_slot[g, p, area]
+        self.cards[g, p, area, slot] = t
+        self.next_slot[g, p, area] = slot + 1
+        self.counts[g, p, area] += ~self.is_starting[t]
+
+    def discard(self, g: np.ndarray, p: int, t: np.ndarray):
+        self.counts[g, p, _DISCARD] += ~self.is_starting[t]
+
+
+# region kernels
+_kernel_makers: dict[type, Callable[[object], KernelT]] = {}
+_times_makers: dict[type, Callable[[object], KernelT]] = {}
+_kernel_cache: dict[CardEffect, KernelT | None] = {}
+
+
+def _register(registry: dict[type, Callable[[T], KernelT]], *tps: type):
+    def decor(fn: Callable[[T], KernelT]):
+        for tp in tps:
+            registry[tp] = fn
+        return fn
+    return decor
+
+
+def _kernel(*tps: type):
+    return _register(_kernel_makers, *tps)
+
+
+def _times(*tps: type):
+    return _register(_times_makers, *tps)
+
+
+def _lookup(registry: dict[type, Callable[[object], KernelT]], obj: object):
+    for tp in type(obj).__mro__:
+        if (maker := registry.get(tp)) is not None:
+            return maker(obj)
+    raise UnsupportedEffect(obj)
+
+
+def make_kernel(obj: CardEffect | object) -> KernelT:
+    """Compiles an effect, condition or measure to a function that runs it
+    for many games at once. Effects return a boolean array of the games where
+    they couldn't execute (or None if they always can), conditions a boolean
+    array and measures an array or a scalar (if it's the same for all games).
+    Raises UnsupportedEffect if ``obj`` isn't deterministic."""
+    return _lookup(_kernel_makers, obj)
+
+
+def effect_kernel(effect: CardEffect) -> KernelT | None:
+    """Cached ``make_kernel()``, returning None for unsupported effects"""
+    try:
+        return _kernel_cache[effect]
+    except KeyError:
+        pass
+    try:
+        kernel = make_kernel(effect)
+    except UnsupportedEffect:
+        kernel = None
+    _kernel_cache[effect] = kernel
+    return kernel
+
+
+def is_supported(card: CardTemplate) -> bool:
+    """Can the batch engine place (and therefore run) this card?"""
+    return (PlaceableCardType.has_instance(card.card_type)
+            and effect_kernel(card.effect) is not None)
+
+
+def _count_area(tp: Area):
+    if tp not in _A_IDX or tp == Area.HAND or tp == Area.SPARE:
+        raise UnsupportedEffect(tp)  # Only placed/discarded cards are counted
+    return _A_IDX[tp]
+
+
+@_kernel(NullEffect)
+def _(e: NullEffect) -> KernelT:
+    def null_effect(st: BatchState, g: np.ndarray, loc: LocT):
+        pass
+    return null_effect
+
+
+@_kernel(GainResource)
+def _(e: GainResource) -> KernelT:
+    r, amount = _R_IDX[e.resource], e.amount
+
+    def gain_resource(st: BatchState, g: np.ndarray, loc: LocT):
+        st.resources[g, loc[0], r] += amount
+    return gain_resource
+
+
+@_kernel(SpendResource)
+def _(e: SpendResource) -> KernelT:
+    allowed = np.array([e.colors.is_allowed(r) for r in _RESOURCES])
+    amount = e.amount
+
+    def spend_resource(st: BatchState, g: np.ndarray, loc: LocT):
+        p = loc[0]
+        able = st.resources[g, p][:, allowed].sum(1) >= amount
+        st.pay(g[able], p, allowed, amount)
+        return ~able
+    return spend_resource
+
+
+@_kernel(AddMarker)
+def _(e: AddMarker) -> KernelT:
+    def add_marker(st: BatchState, g: np.ndarray, loc: LocT):
+        p, a, k = loc
+        st.markers[g, p, a, k] += 1  # Always 1, like AddMarker.execute()
+    return add_marker
+
+
+@_kernel(RemoveMarker)
+def _(e: RemoveMarker) -> KernelT:
+    amount = e.amount
+
+    def remove_marker(st: BatchState, g: np.ndarray, loc: LocT):
+        p, a, k = loc
+        able = st.markers[g, p, a, k] >= amount
+        st.markers[g[able], p, a, k] -= amount
+        return ~able
+    return remove_marker
+
+
+@_kernel(DiscardThis)
+def _(e: DiscardThis) -> KernelT:
+    def discard_this(st: BatchState, g: np.ndarray, loc: LocT):
+        p, a, k = loc
+        g = g[st.cards[g, p, a, k] >= 0]  # Not already discarded
+        t = st.cards[g, p, a, k]
+        st.cards[g, p, a, k] = -1  # (Markers are kept, as on the Card)
+        st.counts[g, p, a] -= ~st.is_starting[t]
+        st.discard(g, p, t)
+    return discard_this
+
+
+@_kernel(EffectGroup)
+def _(e: EffectGroup) -> KernelT:
+    fns = tuple(make_kernel(c) for c in e.effects)
+
+    def effect_group(st: BatchState, g: np.ndarray, loc: LocT):
+        for fn in fns:
+            fn(st, g, loc)
+    return effect_group
+
+
+@_kernel(StrictEffectGroup)
+def _(e: StrictEffectGroup) -> KernelT:
+    fns = tuple(make_kernel(c) for c in e.effects)
+
+    def strict_effect_group(st: BatchState, g: np.ndarray, loc: LocT):
+        failed = np.zeros(len(g), bool)
+        live = np.arange(len(g))  # Games that haven't failed yet
+        for fn in fns:
+            f = fn(st, g[live], loc)
+            if f is not None and f.any():
+                failed[live[f]] = True
+                live = live[~f]
+        return failed
+    return strict_effect_group
+
+
+@_kernel(ConvertEffect)
+def _(e: ConvertEffect) -> KernelT:
+    spend, gain, side_effect = map(make_kernel, e.effects)
+
+    def convert_effect(st: BatchState, g: np.ndarray, loc: LocT):
+        if (failed := spend(st, g, loc)) is not None:
+            g = g[~failed]
+        gain(st, g, loc)
+        side_effect(st, g, loc)
+    return convert_effect
+
+
+@_kernel(SuppressFail)
+def _(e: SuppressFail) -> KernelT:
+    inner = make_kernel(e.effect)
+
+    def suppress_fail(st: BatchState, g: np.ndarray, loc: LocT):
+        inner(st, g, loc)
+    return suppress_fail
+
+
+@_kernel(ConditionalEffect)
+def _(e: ConditionalEffect) -> KernelT:
+    cond = make_kernel(e.cond)
+    if_true, if_false = make_kernel(e.if_true), make_kernel(e.if_false)
+
+    def conditional_effect(st: BatchState, g: np.ndarray, loc: LocT):
+        c = np.broadcast_to(cond(st, g, loc), g.shape)
+        failed_t = if_true(st, g[c], loc)
+        failed_f = if_false(st, g[~c], loc)
+        if failed_t is None and failed_f is None:
+            return None
+        failed = np.zeros(len(g), bool)
+        if failed_t is not None:
+            failed[c] = failed_t
+        if failed_f is not None:
+            failed[~c] = failed_f
+        return failed
+    return conditional_effect
+
+
+@_kernel(_ComparisonCond)
+def _(e: _ComparisonCond) -> KernelT:
+    cmp_fn, left, right = e.cmp, make_kernel(e.left), make_kernel(e.right)
+    return lambda st, g, loc: cmp_fn(left(st, g, loc), right(st, g, loc))
+
+
+@_kernel(MostCardsOfType)
+def _(e: MostCardsOfType) -> KernelT:
+    a, include_tie = _count_area(e.tp), e.include_tie
+
+    def most_cards_of_type(st: BatchState, g: np.ndarray, loc: LocT):
+        p = loc[0]
+        counts = st.counts[g, :, a]
+        others = np.delete(counts, p, axis=1)
+        if others.shape[1] == 0:
+            return np.ones(len(g), bool)
+        best_other = others.max(1)
+        if include_tie:
+            return best_other <= counts[:, p]
+        return best_other < counts[:, p]
+    return most_cards_of_type
+
+
+@_kernel(ForEachMarker, ForEachCardOfType, ForEachColorSet, ForEachDiscard,
+         ForEachPlacedMagic, ForEachEmptyColor, ForEachM)
+def _(e: ForEachM) -> KernelT:
+    get_times, inner = _lookup(_times_makers, e), make_kernel(e.effect)
+
+    def effect_many_times(st: BatchState, g: np.ndarray, loc: LocT):
+        times = np.broadcast_to(get_times(st, g, loc), g.shape)
+        for i in range(int(times.max(initial=0))):
+            inner(st, g[times > i], loc)
+    return effect_many_times
+
+
+@_times(ForEachMarker)
+def _(e: ForEachMarker) -> KernelT:
+    return lambda st, g, loc: st.markers[g, loc[0], loc[1], loc[2]]
+
+
+@_times(ForEachCardOfType)
+def _(e: ForEachCardOfType) -> KernelT:
+    a = _count_area(e.tp)
+    return lambda st, g, loc: st.counts[g, loc[0], a]
+
+
+@_times(ForEachColorSet)
+def _(e: ForEachColorSet) -> KernelT:
+    return lambda st, g, loc: st.counts[g, loc[0]][:, _COLORS].min(1)
+
+
+@_times(ForEachDiscard)
+def _(e: ForEachDiscard) -> KernelT:
+    return lambda st, g, loc: st.counts[g, loc[0], _DISCARD]
+
+
+@_times(ForEachPlacedMagic)
+def _(e: ForEachPlacedMagic) -> KernelT:
+    return lambda st, g, loc: st.counts[g, loc[0]][:, _COLORS].sum(1)
+
+
+@_times(ForEachEmptyColor)
+def _(e: ForEachEmptyColor) -> KernelT:
+    return lambda st, g, loc: (st.counts[g, loc[0]][:, _COLORS] == 0).sum(1)
+
+
+@_times(ForEachM)
+def _(e: ForEachM) -> KernelT:
+    return make_kernel(e.measure)
+
+
+@_kernel(ConstMeasure)
+def _(e: ConstMeasure) -> KernelT:
+    value = e.value
+    return lambda st, g, loc: value
+
+
+@_kernel(CardsOfType)
+def _(e: CardsOfType) -> KernelT:
+    a = _count_area(e.tp)
+    return lambda st, g, loc: st.counts[g, loc[0], a]
+
+
+@_kernel(DiscardedCards)
+def _(e: DiscardedCards) -> KernelT:
+    return lambda st, g, loc: st.counts[g, loc[0], _DISCARD]
+
+
+@_kernel(NumMarkers)
+def _(e: NumMarkers) -> KernelT:
+    return lambda st, g, loc: st.markers[g, loc[0], loc[1], loc[2]]
+
+
+@_kernel(ResourceCount)
+def _(e: ResourceCount) -> KernelT:
+    r = _R_IDX[e.resource]
+    return lambda st, g, loc: st.resources[g, loc[0], r]
+# endregion
+
+
+class BatchEngine:
+    """Plays one game per seed, all in lockstep. For the same seed (and
+    ``rng_mode``), the result is the same as ``Game`` with ``ReferenceBot``
+    in every seat."""
+
+    def __init__(self, seeds: Sequence[int | str], n_players: int,
+                 ruleset: IRuleset = None, rng_mode: RngMode = 'compat'):
+        if ruleset is None:
+            ruleset = DefaultRuleset()
+        self.seeds = [str(s) for s in seeds]
+        self.rng_mode = rng_mode
+        self.n_players = n_players
+        self.ruleset = ruleset
+        self._init_templates()
+        hand_size = ruleset.cards_per_player
+        # Enough for every card a player could get plus their starting card
+        n_slots = 1 + N_ROUNDS * hand_size
+        spend_order = sorted(range(len(_RESOURCES)), key=lambda r: (
+            1 / ruleset.resources_per_point(_RESOURCES[r])))
+        self.state = BatchState.empty(len(self.seeds), n_players, n_slots,
+                                      hand_size, self.is_starting, spend_order)
+        self.scores: np.ndarray | None = None
+
+    def _init_templates(self):
+        self.starting_ids = []
+        self.deck_ids: list[list[int]] = []
+        self.templates: list[CardTemplate] = []
+        for t in self.ruleset.get_starting_cards():
+            self.starting_ids.append(len(self.templates))
+            self.templates.append(t)
+        for round_idx in range(N_ROUNDS):
+            deck = self.ruleset.get_deck(round_idx)
+            self.deck_ids.append(list(range(
+                len(self.templates), len(self.templates) + len(deck))))
+            self.templates += deck
+        self.kernels = [effect_kernel(t.effect) for t in self.templates]
+        self.supported = np.array([is_supported(t) for t in self.templates])
+        self.is_starting = np.array([t.is_starting_card for t in self.templates])
+        self.area = np.array([_A_IDX[t.card_type] if t.card_type in _A_IDX
+                              else -1 for t in self.templates])
+        n_ways = max(len(t.cost.possibilities) for t in self.templates)
+        shape = (len(self.templates), n_ways)
+        self.cost_allowed = np.zeros(shape + (len(_RESOURCES),), bool)
+        self.cost_amount = np.zeros(shape, np.int64)
+        self.cost_valid = np.zeros(shape, bool)
+        for i, t in enumerate(self.templates):
+            for k, (filters, n) in enumerate(t.cost.possibilities.items()):
+                self.cost_allowed[i, k] = [filters.is_allowed(r) for r in _RESOURCES]
+                self.cost_amount[i, k] = n
+                self.cost_valid[i, k] = True
+
+    @property
+    def n_games(self):
+        return len(self.seeds)
+
+    def run(self) -> np.ndarray:
+        """Plays all the games, returning the final scores (games, players)"""
+        self.init_players()
+        for round_idx in range(N_ROUNDS):
+            self.prepare_round(round_idx)
+            for turn in range(N_TURNS):
+                if turn != 0:
+                    self.rotate_cards(round_idx)
+                for p in range(self.n_players):
+                    self.do_turn(p, turn)
+        return self.count_points()
+
+    def init_players(self):
+        st, every = self.state, np.arange(self.n_games)
+        for t in self.starting_ids:
+            for p in range(self.n_players):
+                st.place(every, p, self.area[t], t)
+        for r, n in self.ruleset.get_starting_resources().items():
+            st.resources[:, :, _R_IDX[r]] += n
+
+    def prepare_round(self, round_idx: int):
+        # The shuffles have to be exactly the same as Game's so are per-game
+        st, n_dealt = self.state, self.n_players * self.ruleset.cards_per_player
+        pool = [_M_IDX[m] for m in self.ruleset.get_moon_pool()]
+        mode = self.rng_mode
+        st.moons[:] = False
+        st.moons[:, -1, _LAST_TURN] = True
+        for gi, seed in enumerate(self.seeds):
+            deck = self.deck_ids[round_idx].copy()
+            derived_rng(seed, 'game.deck.shuffle', round_idx, mode=mode).shuffle(deck)
+            # Each player pop()s their hand from the end of the deck
+            st.hands[gi] = np.array(deck[:-n_dealt - 1:-1]).reshape(
+                self.n_players, -1)
+            phases = pool.copy()
+            derived_rng(seed, 'game.moons.shuffle', round_idx,
+                        mode=mode).shuffle(phases)
+            for turn in range(N_TURNS - 1):
+                st.moons[gi, turn, [phases.pop(), phases.pop()]] = True
+
+    def rotate_cards(self, round_idx: int):
+        # Player i gets the hand of player i-by, like Game.rotate_cards()
+        by = self.ruleset.get_swap_dirn(round_idx)
+        self.state.hands = np.roll(self.state.hands, by, axis=1)
+
+    def affordable(self, p: int) -> np.ndarray:
+        """Which ways of paying for each card in hand player ``p`` can
+        afford (games, cards_per_player, ways)"""
+        st = self.state
+        hand = st.hands[:, p]
+        t = np.where(hand >= 0, hand, 0)
+        have = (st.resources[:, p, None, None, :] * self.cost_allowed[t]).sum(-1)
+        return (hand >= 0)[..., None] & self.cost_valid[t] & (have >= self.cost_amount[t])
+
+    def do_turn(self, p: int, turn: int):
+        st = self.state
+        hand = st.hands[:, p]
+        afford = self.affordable(p)
+        can_buy = afford.any(-1) & self.supported[np.where(hand >= 0, hand, 0)]
+        buys = can_buy.any(1)
+        if (g := np.flatnonzero(buys)).size:
+            h = can_buy[g].argmax(1)  # First buyable card
+            self.buy(g, p, h, afford[g, h].argmax(1))
+        if (g := np.flatnonzero(~buys)).size:
+            self.execute(g, p, (hand[g] >= 0).argmax(1), turn)
+
+    def buy(self, g: np.ndarray, p: int, h: np.ndarray, way: np.ndarray):
+        st = self.state
+        t = st.hands[g, p, h]
+        st.hands[g, p, h] = -1
+        st.pay(g, p, self.cost_allowed[t, way], self.cost_amount[t, way])
+        st.place(g, p, self.area[t], t)
+
+    def execute(self, g: np.ndarray, p: int, h: np.ndarray, turn: int):
+        st = self.state
+        st.discard(g, p, st.hands[g, p, h])
+        st.hands[g, p, h] = -1
+        runs_last = st.moons[g, turn, _LAST_TURN]
+        for c in Color.members():
+            a = _A_IDX[c]
+            runs_color = st.moons[g, turn, _M_IDX[c]]
+            n_slots = st.next_slot[g, p, a].max()
+            for k in range(n_slots):
+                t = st.cards[g, p, a, k]
+                is_last = ~(st.cards[g, p, a, k + 1:n_slots] >= 0).any(1)
+                runs = (t >= 0) & (runs_color | (runs_last & is_last))
+                self.run_cards(g[runs], (p, a, k), t[runs])
+
+    def run_cards(self, g: np.ndarray, loc: LocT, t: np.ndarray):
+        """Execute the card at ``loc`` (which is template ``t``) in games ``g``"""
+        if g.size == 0:
+            return
+        if (t == t[0]).all():  # Usually the starting card
+            self.kernels[t[0]](self.state, g, loc)
+            return
+        for tid in np.unique(t):
+            self.kernels[tid](self.state, g[t == tid], loc)
+
+    def count_points(self) -> np.ndarray:
+        st = self.state
+        for p in range(self.n_players):
+            for k in range(st.next_slot[:, p, _ARTIFACT].max()):
+                t = st.cards[:, p, _ARTIFACT, k]
+                g = np.flatnonzero(t >= 0)
+                self.run_cards(g, (p, _ARTIFACT, k), t[g])
+        per_point = np.array([self.ruleset.resources_per_point(r)
+                              for r in _RESOURCES])
+        self.scores = (st.resources // per_point).sum(-1)
+        return self.scores
+
+    def results(self) -> list[GameResult]:
+        results = []
+        for seed, scores in zip(self.seeds, self.scores.tolist()):
+            best = max(scores)
+            results.append(GameResult(seed, tuple(scores), tuple(
+                i for i, s in enumerate(scores) if s == best)))
+        return results
+
+
+def run_batch(n_games: int, n_players: int, base_seed: int | str,
+              ruleset: IRuleset = None, batch_size: int = 4096,
+              rng_mode: RngMode = 'compat') -> SimStats:
+    """Play ``n_games`` (seeded like ``run_games()``) in batches"""
+    stats = SimStats(n_players)
+    stats.start()
+    for start in range(0, n_games, batch_size):
+        seeds = [game_seed(base_seed, i)
+                 for i in range(start, min(start + batch_size, n_games))]
+        engine = BatchEngine(seeds, n_players, ruleset, rng_mode)
+        engine.run()
+        for result in engine.results():
+            stats.add(result)
+    stats.stop()
+    return stats
+
+
+class ReferenceBot(BotFrontend):
+    """The policy of BatchEngine, on the object engine"""
+
+    def pick(self, options: Sequence[T], key: Callable[[T], float]) -> T:
+        return options[0]
+
+    def affordable_cards(self, player: Player) -> list[Card]:
+        return [c for c in super().affordable_cards(player) if is_supported(c)]
+
+    def get_action_type(self, player: Player):
+        return 'buy' if self.affordable_cards(player) else 'execute'
+
+
+def main(argv: list[str] = None):
+    parser = argparse.ArgumentParser(
+        prog='python -m backend.sim.batch',
+        description='Play seeded games in lockstep with the batch engine')
+    parser.add_argument('-n', '--games', type=int, default=1000)
+    parser.add_argument('-p', '--players', type=int, default=4)
+    parser.add_argument('-s', '--seed', default=None,
+                        help='Base seed, game i uses "<seed>/<i>"')
+    parser.add_argument('--batch-size', type=int, default=4096)
+    parser.add_argument('--rng', choices=RNG_MODES, default='compat',
+                        help="How games are shuffled ('counter' is faster, "
+                             "'compat' deals the same as older versions)")
+    args = parser.parse_args(argv)
+    base_seed = args.seed if args.seed is not None else time.time_ns()
+    stats = run_batch(args.games, args.players, base_seed,
+                      batch_size=args.batch_size, rng_mode=args.rng)
+    print(f'Base seed: {base_seed}')
+    print(stats.report(['reference'] * args.players))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,276 @@
+from __future__ import annotations
+
+import abc
+import random
+from collections import Counter
+from typing import Callable, Collection, Literal, Sequence, TypeVar
+
+from .heuristics import estimate_card, estimate_points, resource_value
+from ..core import (Game, Player, IFrontend, IRuleset, Card, Area, CardCost,
+                    AnyResource, EffectExecInfo, Color, CardTypeFilter,
+                    ResourceFilter, PlaceableCardType, AdjacenciesMappingT)
+from ..core import legal_moves
+
+__all__ = ['BotFrontend', 'RandomBot', 'GreedyBot', 'CostAwareBot',
+           'SeatedFrontend', 'BOTS']
+
+
+T = TypeVar('T')
+
+
+class BotFrontend(IFrontend, abc.ABC):
+    """An in-process IFrontend that decides directly on the core objects.
+
+    This class works out the legal options for each decision and
+    subclasses only decide how to pick one of them (see ``pick()``).
+    A single bot can play all the seats of a game (each decision is made
+    for the player it is about) or use SeatedFrontend to mix bots."""
+
+    game: Game
+    _values: tuple[IRuleset, dict[AnyResource, float]] | None = None
+
+    def __init__(self, seed: int | str = None):
+        self.rng = random.Random(seed)
+
+    def register_game(self, game: Game):
+        self.game = game
+
+    def register_result(self, winners: list[Player]):
+        pass
+
+    @abc.abstractmethod
+    def pick(self, options: Sequence[T], key: Callable[[T], float]) -> T:
+        """Choose one of ``options`` (never empty). ``key`` scores an option
+        (higher is better) for bots that want to use it."""
+        ...
+
+    # region options
+    def affordable_cards(self, player: Player) -> list[Card]:
+        return legal_moves.affordable_cards(player)
+
+    def payment_options(self, player: Player, cost: CardCost) -> list[Counter[AnyResource]]:
+        """One possible payment for each way of paying the cost we can afford"""
+        return [p for filters, n in cost.possibilities.items()
+                if (p := self.choose_resources(player, filters, n)) is not None]
+
+    def choose_resources(self, player: Player, filters: ResourceFilter,
+                         amount: int) -> Counter[AnyResource] | None:
+        """Pick exactly ``amount`` resources allowed by ``filters`` from the
+        player's resources, or None if they don't have enough."""
+        # Losing as few points as possible
+        return legal_moves.cheapest_spend(player, filters, amount,
+                                          self.resource_values(player))
+
+    def placed_cards(self, player: Player) -> list[Card]:
+        return legal_moves.placed_cards(player)
+    # endregion
+
+    # region estimates (used as keys by bots that care about them)
+    def card_value(self, card: Card, player: Player) -> float:
+        return estimate_card(card, player)
+
+    def exec_value(self, card: Card, player: Player) -> float:
+        return estimate_points(card.effect, EffectExecInfo(card, player))
+
+    def color_value(self, color: Color, player: Player) -> float:
+        return sum(self.exec_value(c, player) for c in player.cards_of_type(color))
+
+    def payment_loss(self, player: Player, payment: Counter[AnyResource]) -> float:
+        return sum(n * resource_value(player, r) for r, n in payment.items())
+
+    def resource_values(self, player: Player) -> dict[AnyResource, float]:
+        """What ``payment_loss()`` counts each resource as (for the solver)"""
+        if (cached := self._values) is None or cached[0] is not player.ruleset:
+            cached = self._values = (player.ruleset, {
+                r: resource_value(player, r) for r in AnyResource.members()})
+        return cached[1]
+
+    def buy_value(self, card: Card, player: Player) -> float:
+        return self.card_value(card, player)
+
+    def run_value(self, player: Player) -> float:
+        """Value of the 'execute' action"""
+        return sum(self.exec_value(c, player) for tp in Color.members()
+                   for c in player.cards_of_type(tp) if player.can_run_card(c))
+    # endregion
+
+    # region IFrontend decisions
+    def get_action_type(self, player: Player) -> Literal['buy', 'execute']:
+        options: list[Literal['buy', 'execute']] = ['execute']
+        if affordable := self.affordable_cards(player):
+            options.append('buy')
+
+        def key(action: str):
+            if action == 'buy':
+                return max(self.buy_value(c, player) for c in affordable)
+            return self.run_value(player)
+        return self.pick(options, key)
+
+    def get_card_buy(self, player: Player) -> Card:
+        return self.pick(self.affordable_cards(player),
+                         lambda c: self.buy_value(c, player))
+
+    def get_card_payment(self, player: Player, cost: CardCost) -> Counter[AnyResource]:
+        return self.pick(self.payment_options(player, cost),
+                         lambda p: -self.payment_loss(player, p))
+
+    def get_discard(self, player: Player) -> Card:
+        return self.pick(player.cards_of_type(Area.HAND),
+                         lambda c: -self.card_value(c, player))
+
+    def get_spend(self, info: EffectExecInfo, filters: ResourceFilter,
+                  amount: int) -> None | Counter[AnyResource]:
+        spend = self.choose_resources(info.player, filters, amount)
+        if spend is None:
+            return None
+        # Converting is almost always worth it, so prefer spending
+        return self.pick([spend, None], lambda s: 0 if s is None else 1)
+
+    def get_foreach_color(self, info: EffectExecInfo) -> Color:
+        return self.pick(Color.members(),
+                         lambda c: info.player.num_cards_of_type(c))
+
+    def choose_from_discard(self, info: EffectExecInfo, target: Player,
+                            filters: CardTypeFilter) -> Card | None:
+        options = [c for c in target.cards_of_type(Area.DISCARD)
+                   if filters.is_allowed(c.card_type)]
+        if not options:
+            return None
+        return self.pick(options, lambda c: self.card_value(c, info.player))
+
+    def choose_card_exec(self, info: EffectExecInfo, n_times: int,
+                         discard: bool = False) -> Card:
+        options = [c for c in self.placed_cards(info.player) if c is not info.card]
+        return self.pick(options or self.placed_cards(info.player),
+                         lambda c: self.exec_value(c, info.player))
+
+    def choose_color_exec(self, info: EffectExecInfo, n_times: int) -> Color:
+        return self.pick(Color.members(),
+                         lambda c: self.color_value(c, info.player))
+
+    def choose_excl_color(self, info: EffectExecInfo,
+                          top_colors: Collection[Color]) -> Color:
+        return self.pick(list(top_colors),
+                         lambda c: -self.color_value(c, info.player))
+
+    def choose_card_move(self, info: EffectExecInfo,
+                         adjacencies: AdjacenciesMappingT) -> Card | None:
+        return self.pick(
+            legal_moves.move_options(info.player, adjacencies),
+            lambda c: 0 if c is None else max(
+                self.color_value(tp, info.player)
+                for tp in adjacencies[c.location.area]))
+
+    def choose_move_where(self, info: EffectExecInfo, card_to_move: Card,
+                          possibilities: Collection[PlaceableCardType]
+                          ) -> PlaceableCardType | None:
+        if not possibilities:
+            return None
+        return self.pick(list(possibilities),
+                         lambda tp: self.color_value(tp, info.player))
+    # endregion
+
+
+class RandomBot(BotFrontend):
+    """Picks uniformly from the legal options"""
+
+    def pick(self, options: Sequence[T], key: Callable[[T], float]) -> T:
+        return self.rng.choice(options)
+
+    def choose_resources(self, player: Player, filters: ResourceFilter,
+                         amount: int) -> Counter[AnyResource] | None:
+        pool = [r for r in AnyResource.members() if filters.is_allowed(r)
+                for _ in range(player.resources[r])]
+        if len(pool) < amount:
+            return None
+        return Counter(self.rng.sample(pool, amount))
+
+
+class GreedyBot(BotFrontend):
+    """Picks the option that looks like it gives the most points, ignoring
+    what it costs"""
+
+    def pick(self, options: Sequence[T], key: Callable[[T], float]) -> T:
+        return max(options, key=key)  # First one wins ties, so deterministic
+
+
+class CostAwareBot(GreedyBot):
+    """Like GreedyBot but buys cards based on their value minus the points
+    lost paying for them"""
+
+    def buy_value(self, card: Card, player: Player) -> float:
+        payment = legal_moves.cheapest_payment(player, card.cost,
+                                               self.resource_values(player))
+        return self.card_value(card, player) - self.payment_loss(player, payment)
+
+
+BOTS: dict[str, type[BotFrontend]] = {
+    'random': RandomBot,
+    'greedy': GreedyBot,
+    'cost': CostAwareBot,
+}
+
+
+class SeatedFrontend(IFrontend):
+    """Dispatches each decision to the frontend of the player it is for"""
+
+    def __init__(self, seats: Sequence[IFrontend]):
+        self.seats = list(seats)
+
+    def register_game(self, game: Game):
+        for f in self.seats:
+            f.register_game(game)
+
+    def register_result(self, winners: list[Player]):
+        for f in self.seats:
+            f.register_result(winners)
+
+    def _for(self, player: Player) -> IFrontend:
+        return self.seats[player.idx]
+
+    def on_turn_start(self, player: Player):
+        self._for(player).on_turn_start(player)
+
+    def get_action_type(self, player: Player) -> Literal['buy', 'execute']:
+        return self._for(player).get_action_type(player)
+
+    def get_card_buy(self, player: Player) -> Card:
+        return self._for(player).get_card_buy(player)
+
+    def get_card_payment(self, player: Player, cost: CardCost) -> Counter[AnyResource]:
+        return self._for(player).get_card_payment(player, cost)
+
+    def get_discard(self, player: Player) -> Card:
+        return self._for(player).get_discard(player)
+
+    def get_spend(self, info: EffectExecInfo, filters: ResourceFilter,
+                  amount: int) -> None | Counter[AnyResource]:
+        return self._for(info.player).get_spend(info, filters, amount)
+
+    def get_foreach_color(self, info: EffectExecInfo) -> Color:
+        return self._for(info.player).get_foreach_color(info)
+
+    def choose_from_discard(self, info: EffectExecInfo, target: Player,
+                            filters: CardTypeFilter) -> Card:
+        return self._for(info.player).choose_from_discard(info, target, filters)
+
+    def choose_card_exec(self, info: EffectExecInfo, n_times: int,
+                         discard: bool = False) -> Card:
+        return self._for(info.player).choose_card_exec(info, n_times, discard)
+
+    def choose_color_exec(self, info: EffectExecInfo, n_times: int) -> Color:
+        return self._for(info.player).choose_color_exec(info, n_times)
+
+    def choose_excl_color(self, info: EffectExecInfo,
+                          top_colors: Collection[Color]) -> Color:
+        return self._for(info.player).choose_excl_color(info, top_colors)
+
+    def choose_card_move(self, info: EffectExecInfo,
+                         adjacencies: AdjacenciesMappingT) -> Card | None:
+        return self._for(info.player).choose_card_move(info, adjacencies)
+
+    def choose_move_where(self, info: EffectExecInfo, card_to_move: Card,
+                          possibilities: Collection[PlaceableCardType]
+                          ) -> PlaceableCardType | None:
+        return self._for(info.player).choose_move_where(
+            info, card_to_move, possibilities)
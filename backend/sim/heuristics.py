@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from typing import Callable
+
+from ..core import (CardEffect, EffectExecInfo, Card, Player, Color,
+                    AnyResource, ResourceFilter)
+from ..core.card_effects import *
+
+__all__ = ['estimate_points', 'estimate_card', 'resource_value',
+           'remaining_turns']
+
+
+_EstimatorT = Callable[[CardEffect, EffectExecInfo], float]
+_estimators: dict[type, _EstimatorT] = {}
+
+
+def _estimator(*tps: type):
+    def decor(fn: _EstimatorT):
+        _estimators.update(dict.fromkeys(tps, fn))
+        return fn
+    return decor
+
+
+def resource_value(player: Player, r: AnyResource) -> float:
+    """Roughly how many points a single unit of ``r`` is worth (can be
+    negative, e.g. red in the default rules)"""
+    return 1 / player.ruleset.resources_per_point(r)
+
+
+def cheapest_resource_value(player: Player, filters: ResourceFilter) -> float:
+    return min(resource_value(player, r) for r in filters.allowed_resources)
+
+
+def remaining_turns(player: Player) -> int:
+    """Number of turns left in the game after the current one"""
+    game = player.game
+    return (2 - game.round_num) * 6 + (5 - game.turn_num)
+
+
+def estimate_points(effect: CardEffect, info: EffectExecInfo) -> float:
+    """Cheap, side-effect-free guess at how many points running ``effect``
+    once (right now) would be worth to ``info.player``. Conditions are
+    evaluated against the current state; anything needing a frontend
+    decision is guessed."""
+    for tp in type(effect).__mro__:
+        if (fn := _estimators.get(tp)) is not None:
+            return fn(effect, info)
+    return 1.0  # Special effects: some value but we don't know how much
+
+
+def estimate_card(card: Card, player: Player) -> float:
+    """Estimated total value of having ``card`` (bought/placed now) over the
+    rest of the game"""
+    value = estimate_points(card.effect, EffectExecInfo(card, player))
+    if Color.has_instance(card.card_type):
+        # Each color runs ~2/5 of turns, and we only execute on some of them
+        return value * (1 + remaining_turns(player) * 0.2)
+    return value  # Artifacts run once at the end, events run once now
+
+
+@_estimator(NullEffect, AddMarker, RemoveMarker, DiscardThis)
+def _est_nothing(_effect: CardEffect, _info: EffectExecInfo):
+    return 0.0
+
+
+@_estimator(GainResource)
+def _est_gain(effect: GainResource, info: EffectExecInfo):
+    return effect.amount * resource_value(info.player, effect.resource)
+
+
+@_estimator(SpendResource)
+def _est_spend(effect: SpendResource, info: EffectExecInfo):
+    return -effect.amount * cheapest_resource_value(info.player, effect.colors)
+
+
+@_estimator(_AnyEffectGroup)
+def _est_group(effect: _AnyEffectGroup, info: EffectExecInfo):
+    return sum(estimate_points(e, info) for e in effect.effects)
+
+
+@_estimator(ConvertEffect)
+def _est_convert(effect: ConvertEffect, info: EffectExecInfo):
+    return max(0.0, _est_group(effect, info))  # Optional so never negative
+
+
+@_estimator(SuppressFail)
+def _est_suppress(effect: SuppressFail, info: EffectExecInfo):
+    return estimate_points(effect.effect, info)
+
+
+@_estimator(ConditionalEffect)
+def _est_conditional(effect: ConditionalEffect, info: EffectExecInfo):
+    branch = effect.if_true if effect.cond.evaluate(info) else effect.if_false
+    return estimate_points(branch, info)
+
+
+@_estimator(_EffectManyTimes)
+def _est_many_times(effect: _EffectManyTimes, info: EffectExecInfo):
+    return effect.get_times(info) * estimate_points(effect.effect, info)
+
+
+@_estimator(ForEachMarker)
+def _est_foreach_marker(effect: ForEachMarker, info: EffectExecInfo):
+    # Usually comes with an AddMarker before it so count that one too
+    return (info.card.markers + 1) * estimate_points(effect.effect, info)
+
+
+@_estimator(ForEachDynChosenColor)
+def _est_foreach_chosen(effect: ForEachDynChosenColor, info: EffectExecInfo):
+    # Can't call get_times() as that asks the frontend
+    times = max(info.player.num_cards_of_type(c) for c in Color.members())
+    return times * estimate_points(effect.effect, info)
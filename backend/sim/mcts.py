@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+import math
+import time
+from collections import Counter
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Collection, Literal, Sequence, TypeVar
+
+from .bots import BotFrontend, SeatedFrontend
+from .runner import make_frontend
+from .scripted import ScriptedFrontend, AnswerT, freeze_answer
+from ..core import (Game, GameSnapshot, Player, IRuleset, Card, CardCost,
+                    AnyResource, EffectExecInfo, Color, CardTypeFilter,
+                    ResourceFilter, PlaceableCardType, AdjacenciesMappingT)
+
+__all__ = ['MctsBot', 'playout_reward']
+
+
+T = TypeVar('T')
+
+# Score difference that counts as a fairly convincing win/loss
+REWARD_SCALE = 10
+
+
+def playout_reward(game: Game, player_idx: int) -> float:
+    """Between 0 and 1, 0.5 for a draw, based on the score difference to the
+    best other player"""
+    scores = [p.final_score for p in game.players]
+    mine = scores[player_idx]
+    best_other = max((s for i, s in enumerate(scores) if i != player_idx),
+                     default=mine)
+    return 0.5 + 0.5 * math.tanh((mine - best_other) / REWARD_SCALE)
+
+
+@dataclass(frozen=True)
+class _PlayoutJob:
+    """Everything needed to run playouts, so they can run in another process"""
+    snapshot: GameSnapshot  # At the start of the turn
+    ruleset: IRuleset
+    n_players: int
+    seed: str
+    player_idx: int
+    answers: tuple[AnswerT, ...]  # Since the start of the turn, then the candidate
+    rollout_bot: str
+    playout_seeds: tuple[str, ...]
+
+
+class _PlayoutRunner:
+    """Runs playouts from a snapshot, rolling back to it after each one"""
+
+    def __init__(self, snapshot: GameSnapshot, ruleset: IRuleset, n_players: int,
+                 seed: str):
+        self.game = Game(n_players, SeatedFrontend([]), ruleset, seed=seed)
+        self.game.restore(snapshot, copy_cards=True)
+        self.start = self.game.checkpoint()
+        self.dirty = False
+
+    def run(self, answers: Sequence[AnswerT], player_idx: int, rollout_bot: str,
+            playout_seeds: Sequence[str]) -> list[float]:
+        game, rewards = self.game, []
+        for playout_seed in playout_seeds:
+            if self.dirty:
+                game.rollback(self.start)
+            self.dirty = True
+            game.frontend = ScriptedFrontend(answers, make_frontend(
+                [rollout_bot] * game.n_players, playout_seed))
+            game.frontend.register_game(game)
+            # We don't know how the later rounds will be dealt so, instead of
+            #  using the real seed, deal them differently in each playout.
+            game.seed = playout_seed
+            game.resume()
+            rewards.append(playout_reward(game, player_idx))
+        return rewards
+
+
+def _run_playouts(job: _PlayoutJob) -> list[float]:
+    runner = _PlayoutRunner(job.snapshot, job.ruleset, job.n_players, job.seed)
+    return runner.run(job.answers, job.player_idx, job.rollout_bot,
+                      job.playout_seeds)
+
+
+class MctsBot(BotFrontend):
+    """Decides by simulating the rest of the game for each option.
+
+    At the start of each turn (and before counting points) this takes a
+    snapshot of the game. For each decision, the playouts restore that
+    snapshot, replay this turn's answers so far, give the option being
+    tried and let ``rollout_bot`` play the rest of the game (with the later
+    rounds dealt differently for each playout). The search tree is a single
+    level: options are chosen to be simulated using UCB1 and the most
+    simulated one is picked.
+
+    The budget for each decision is ``playouts`` and/or ``time_limit``
+    (seconds). With ``workers > 1``, playouts run in a thread or process
+    pool (only processes will use more than one CPU), ``chunk_size`` at a
+    time."""
+
+    def __init__(self, seed: int | str = None, playouts: int | None = 100,
+                 time_limit: float | None = None, workers: int = 1,
+                 pool: Literal['thread', 'process'] = 'process',
+                 rollout_bot: str = 'greedy', exploration: float = 0.5,
+                 chunk_size: int = 1):
+        super().__init__(seed)
+        if playouts is None and time_limit is None:
+            raise ValueError("Need a playout and/or time budget")
+        self.playouts = playouts
+        self.time_limit = time_limit
+        self.workers = workers
+        self.pool = pool
+        self.rollout_bot = rollout_bot
+        self.exploration = exploration
+        self.chunk_size = chunk_size
+        self._executor: Executor | None = None
+        self._root: GameSnapshot | None = None
+        self._runner: _PlayoutRunner | None = None  # For self._root
+        self._answers: list[AnswerT] = []
+        self._deciding: tuple[str, int] | None = None
+
+    def register_result(self, winners: list[Player]):
+        self.close()
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def on_turn_start(self, player: Player):
+        self._root = self.game.snapshot()
+        self._runner = None
+        self._answers = []
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            if self.pool == 'process':
+                self._executor = ProcessPoolExecutor(self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(self.workers)
+        return self._executor
+
+    # region search
+    def pick(self, options: Sequence[T], key: Callable[[T], float]) -> T:
+        if len(options) == 1:
+            return options[0]
+        if self._root is None:  # Not started by Game, so can't simulate
+            return max(options, key=key)
+        name, player_idx = self._deciding
+        visits, totals = self.search(
+            name, player_idx, [freeze_answer(o) for o in options])
+        best = max(range(len(options)), key=lambda i: (
+            visits[i], totals[i] / visits[i] if visits[i] else 0))
+        return options[best]
+
+    def search(self, name: str, player_idx: int, candidates: list
+               ) -> tuple[list[int], list[float]]:
+        """Returns the number of playouts and total reward for each candidate"""
+        n = len(candidates)
+        visits, totals, pending = [0] * n, [0.0] * n, [0] * n
+        deadline = (None if self.time_limit is None
+                    else time.perf_counter() + self.time_limit)
+        started = 0
+
+        def budget_left():
+            if self.playouts is not None and started >= self.playouts:
+                return False
+            return deadline is None or time.perf_counter() < deadline
+
+        while budget_left():
+            wave = []  # Fill each worker, then wait for all of them
+            for _ in range(self.workers):
+                if not budget_left():
+                    break
+                arm = self._select(visits, totals, pending)
+                k = self.chunk_size
+                if self.playouts is not None:
+                    k = min(k, self.playouts - started)
+                pending[arm] += k
+                started += k
+                wave.append((arm, self._make_job(name, player_idx, candidates[arm], k)))
+            if self.workers == 1:
+                results = [self._run_locally(job) for _, job in wave]
+            else:
+                results = list(self.executor.map(_run_playouts, [j for _, j in wave]))
+            for (arm, _), rewards in zip(wave, results):
+                pending[arm] -= len(rewards)
+                visits[arm] += len(rewards)
+                totals[arm] += sum(rewards)
+        return visits, totals
+
+    def _select(self, visits: list[int], totals: list[float], pending: list[int]):
+        # Pending playouts count as visits, so a wave spreads out (virtual loss)
+        counts = [v + p for v, p in zip(visits, pending)]
+        for i, c in enumerate(counts):
+            if c == 0:
+                return i
+        log_total = math.log(sum(counts))
+
+        def ucb(i: int):
+            mean = totals[i] / visits[i] if visits[i] else 0.5
+            return mean + self.exploration * math.sqrt(log_total / counts[i])
+        return max(range(len(counts)), key=ucb)
+
+    def _run_locally(self, job: _PlayoutJob):
+        if self._runner is None:
+            self._runner = _PlayoutRunner(
+                job.snapshot, job.ruleset, job.n_players, job.seed)
+        return self._runner.run(job.answers, job.player_idx, job.rollout_bot,
+                                job.playout_seeds)
+
+    def _make_job(self, name: str, player_idx: int, candidate, n: int):
+        return _PlayoutJob(
+            self._root, self.game.ruleset, self.game.n_players, self.game.seed,
+            player_idx, (*self._answers, (name, candidate)), self.rollout_bot,
+            tuple(f'{self.game.seed}+[mcts@{self.rng.getrandbits(64)}]'
+                  for _ in range(n)))
+    # endregion
+
+    # region IFrontend decisions (recorded, so playouts can replay them)
+    def _decide(self, name: str, player: Player, method: Callable[..., T],
+                *args) -> T:
+        self._deciding = (name, player.idx)
+        answer = method(*args)
+        self._answers.append((name, freeze_answer(answer)))
+        return answer
+
+    def get_action_type(self, player: Player) -> Literal['buy', 'execute']:
+        return self._decide('get_action_type', player,
+                            super().get_action_type, player)
+
+    def get_card_buy(self, player: Player) -> Card:
+        return self._decide('get_card_buy', player, super().get_card_buy, player)
+
+    def get_card_payment(self, player: Player, cost: CardCost) -> Counter[AnyResource]:
+        return self._decide('get_card_payment', player,
+                            super().get_card_payment, player, cost)
+
+    def get_discard(self, player: Player) -> Card:
+        return self._decide('get_discard', player, super().get_discard, player)
+
+    def get_spend(self, info: EffectExecInfo, filters: ResourceFilter,
+                  amount: int) -> None | Counter[AnyResource]:
+        return self._decide('get_spend', info.player,
+                            super().get_spend, info, filters, amount)
+
+    def get_foreach_color(self, info: EffectExecInfo) -> Color:
+        return self._decide('get_foreach_color', info.player,
+                            super().get_foreach_color, info)
+
+    def choose_from_discard(self, info: EffectExecInfo, target: Player,
+                            filters: CardTypeFilter) -> Card | None:
+        return self._decide('choose_from_discard', info.player,
+                            super().choose_from_discard, info, target, filters)
+
+    def choose_card_exec(self, info: EffectExecInfo, n_times: int,
+                         discard: bool = False) -> Card:
+        return self._decide('choose_card_exec', info.player,
+                            super().choose_card_exec, info, n_times, discard)
+
+    def choose_color_exec(self, info: EffectExecInfo, n_times: int) -> Color:
+        return self._decide('choose_color_exec', info.player,
+                            super().choose_color_exec, info, n_times)
+
+    def choose_excl_color(self, info: EffectExecInfo,
+                          top_colors: Collection[Color]) -> Color:
+        return self._decide('choose_excl_color', info.player,
+                            super().choose_excl_color, info, top_colors)
+
+    def choose_card_move(self, info: EffectExecInfo,
+                         adjacencies: AdjacenciesMappingT) -> Card | None:
+        return self._decide('choose_card_move', info.player,
+                            super().choose_card_move, info, adjacencies)
+
+    def choose_move_where(self, info: EffectExecInfo, card_to_move: Card,
+                          possibilities: Collection[PlaceableCardType]
+                          ) -> PlaceableCardType | None:
+        return self._decide('choose_move_where', info.player, super().choose_move_where,
+                            info, card_to_move, possibilities)
+    # endregion
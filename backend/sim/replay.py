@@ -0,0 +1,82 @@
+"""Recording bot games to a replay log and checking a log still replays
+the same (the replay types are in ``backend.core.replay``):
+
+- ``python -m backend.sim.replay record games.ndjson -n 100 -b greedy``
+- ``python -m backend.sim.replay check games.ndjson``
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+
+from .runner import game_seed, make_frontend
+from ..core import (Game, DefaultRuleset, GameRecord, RecordingFrontend,
+                    ReplayFrontend, ReplayLog, ReplayError, replay_game,
+                    ruleset_name)
+
+__all__ = ['GameRecord', 'RecordingFrontend', 'ReplayFrontend', 'ReplayLog',
+           'ReplayError', 'replay_game', 'ruleset_name']
+
+
+# region CLI
+def _record(args: argparse.Namespace):
+    from .__main__ import parse_bots
+    bots = parse_bots(args.bots, args.players)
+    base_seed = args.seed if args.seed is not None else time.time_ns()
+    log = ReplayLog(args.log)
+    for i in range(args.games):
+        seed = game_seed(base_seed, i)
+        game = Game(len(bots), RecordingFrontend(make_frontend(bots, seed),
+                                                 log.append),
+                    DefaultRuleset(), seed=seed)
+        game.run_game()
+    print(f'Recorded {args.games} games to {args.log}')
+
+
+def _check(args: argparse.Namespace):
+    records = list(ReplayLog(args.log))  # Load first so it's not timed
+    ruleset = DefaultRuleset()
+    n_bad = 0
+    start = time.perf_counter()
+    for i, record in enumerate(records):
+        try:
+            result = replay_game(record, ruleset)
+        except Exception as e:  # Keep checking the rest of the log
+            n_bad += 1
+            print(f'Game {i} (seed {record.seed!r}): {e}')
+            continue
+        if result != record.result:
+            n_bad += 1
+            print(f'Game {i} (seed {record.seed!r}): scores {result.scores} '
+                  f'(winners {result.winners}), recorded {record.result.scores} '
+                  f'(winners {record.result.winners})')
+    elapsed = time.perf_counter() - start
+    rate = len(records) / elapsed if elapsed else float('nan')
+    print(f'Replayed {len(records)} games in {elapsed:.2f}s ({rate:.1f} games/sec), '
+          f'{n_bad} differ')
+    return 1 if n_bad else 0
+
+
+def main(argv: list[str] = None):
+    parser = argparse.ArgumentParser(prog='python -m backend.sim.replay')
+    sub = parser.add_subparsers(dest='command', required=True)
+    rec = sub.add_parser('record', help='Record bot games to a replay log')
+    rec.add_argument('log')
+    rec.add_argument('-n', '--games', type=int, default=100)
+    rec.add_argument('-p', '--players', type=int, default=4)
+    rec.add_argument('-b', '--bots', default='greedy')
+    rec.add_argument('-s', '--seed', default=None)
+    check = sub.add_parser('check', help='Replay a log, checking the results')
+    check.add_argument('log')
+    args = parser.parse_args(argv)
+    if args.command == 'record':
+        _record(args)
+        return 0
+    return _check(args)
+# endregion
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import statistics
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Iterable, Sequence, Callable
+
+from .bots import BOTS, SeatedFrontend
+from ..core import (Game, IRuleset, DefaultRuleset, IFrontend, Profiler,
+                    GameResult)
+
+__all__ = ['GameResult', 'SimStats', 'play_game', 'game_seed', 'run_games']
+
+
+def game_seed(base_seed: int | str, i: int):
+    return f'{base_seed}/{i}'
+
+
+def make_frontend(bots: Sequence[str], seed: str) -> IFrontend:
+    return SeatedFrontend([BOTS[name](f'{seed}+[bot@{i}]')
+                           for i, name in enumerate(bots)])
+
+
+def play_game(seed: str, bots: Sequence[str], ruleset: IRuleset = None,
+              profiler: Profiler = None) -> GameResult:
+    """Play a full game with one bot (by name, see ``BOTS``) in each seat"""
+    if ruleset is None:
+        ruleset = DefaultRuleset()
+    game = Game(len(bots), make_frontend(bots, seed), ruleset, seed=seed)
+    if profiler is not None:
+        profiler.attach(game)
+    game.run_game()
+    return GameResult.from_game(game)
+
+
+@dataclass
+class SimStats:
+    n_players: int
+    games: int = 0
+    wins: list[float] = None  # Ties split the win between the winners
+    scores: list[Counter[int]] = None  # Histogram for each seat
+    elapsed: float = 0.0
+    _start: float = field(default=None, repr=False)
+
+    def __post_init__(self):
+        if self.wins is None:
+            self.wins = [0.0] * self.n_players
+        if self.scores is None:
+            self.scores = [Counter() for _ in range(self.n_players)]
+
+    def start(self):
+        self._start = time.perf_counter()
+
+    def stop(self):
+        self.elapsed += time.perf_counter() - self._start
+        self._start = None
+
+    def add(self, result: GameResult):
+        self.games += 1
+        for w in result.winners:
+            self.wins[w] += 1 / len(result.winners)
+        for seat, score in enumerate(result.scores):
+            self.scores[seat][score] += 1
+
+    def merge(self, other: SimStats):
+        self.games += other.games
+        for seat in range(self.n_players):
+            self.wins[seat] += other.wins[seat]
+            self.scores[seat] += other.scores[seat]
+
+    @property
+    def games_per_sec(self):
+        return self.games / self.elapsed if self.elapsed else float('nan')
+
+    def seat_summary(self, seat: int):
+        values = list(self.scores[seat].elements())
+        return {
+            'win_rate': self.wins[seat] / self.games if self.games else 0.0,
+            'mean': statistics.fmean(values) if values else float('nan'),
+            'stdev': statistics.pstdev(values) if values else float('nan'),
+            'min': min(values, default=None),
+            'median': statistics.median(values) if values else None,
+            'max': max(values, default=None),
+        }
+
+    def report(self, bots: Sequence[str] = None) -> str:
+        lines = [f'{self.games} games in {self.elapsed:.2f}s '
+                 f'({self.games_per_sec:.1f} games/sec)']
+        for seat in range(self.n_players):
+            s = self.seat_summary(seat)
+            name = f' ({bots[seat]})' if bots else ''
+            lines.append(
+                f'  seat {seat}{name}: win rate {s["win_rate"]:.1%}, score '
+                f'mean {s["mean"]:.2f} sd {s["stdev"]:.2f} '
+                f'[min {s["min"]}, median {s["median"]}, max {s["max"]}]')
+        return '\n'.join(lines)
+
+
+def run_games(seeds: Iterable[str], bots: Sequence[str],
+              ruleset: IRuleset = None,
+              on_result: Callable[[GameResult], None] = None,
+              profiler: Profiler = None) -> SimStats:
+    """Play one game per seed in this process"""
+    stats = SimStats(len(bots))
+    stats.start()
+    for seed in seeds:
+        result = play_game(seed, bots, ruleset, profiler)
+        stats.add(result)
+        if on_result is not None:
+            on_result(result)
+    stats.stop()
+    return stats
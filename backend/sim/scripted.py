@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from collections import Counter
+from typing import Collection, Literal, Sequence
+
+from ..core import (Game, Player, IFrontend, Card, CardCost, AnyResource,
+                    EffectExecInfo, Color, CardTypeFilter, ResourceFilter,
+                    PlaceableCardType, AdjacenciesMappingT, AnswerT,
+                    freeze_answer, thaw_answer)
+
+__all__ = ['ScriptedFrontend', 'freeze_answer', 'thaw_answer', 'AnswerT']
+
+
+class ScriptedFrontend(IFrontend):
+    """Gives the ``answers`` in order, then lets ``fallback`` decide"""
+
+    game: Game
+
+    def __init__(self, answers: Sequence[AnswerT], fallback: IFrontend):
+        self.answers = list(answers)
+        self.fallback = fallback
+        self.n_given = 0
+
+    def register_game(self, game: Game):
+        self.game = game
+        self.fallback.register_game(game)
+
+    def register_result(self, winners: list[Player]):
+        self.fallback.register_result(winners)
+
+    def on_turn_start(self, player: Player):
+        self.fallback.on_turn_start(player)
+
+    def _next(self, name: str):
+        if self.n_given >= len(self.answers):
+            return None
+        expected, answer = self.answers[self.n_given]
+        if expected != name:
+            raise ValueError(f'Script expected {expected}() but got {name}() '
+                             f'(answer {self.n_given})')
+        self.n_given += 1
+        return [thaw_answer(answer, self.game)]
+
+    @property
+    def finished(self):
+        return self.n_given >= len(self.answers)
+
+    def get_action_type(self, player: Player) -> Literal['buy', 'execute']:
+        if (a := self._next('get_action_type')) is not None:
+            return a[0]
+        return self.fallback.get_action_type(player)
+
+    def get_card_buy(self, player: Player) -> Card:
+        if (a := self._next('get_card_buy')) is not None:
+            return a[0]
+        return self.fallback.get_card_buy(player)
+
+    def get_card_payment(self, player: Player, cost: CardCost) -> Counter[AnyResource]:
+        if (a := self._next('get_card_payment')) is not None:
+            return a[0]
+        return self.fallback.get_card_payment(player, cost)
+
+    def get_discard(self, player: Player) -> Card:
+        if (a := self._next('get_discard')) is not None:
+            return a[0]
+        return self.fallback.get_discard(player)
+
+    def get_spend(self, info: EffectExecInfo, filters: ResourceFilter,
+                  amount: int) -> None | Counter[AnyResource]:
+        if (a := self._next('get_spend')) is not None:
+            return a[0]
+        return self.fallback.get_spend(info, filters, amount)
+
+    def get_foreach_color(self, info: EffectExecInfo) -> Color:
+        if (a := self._next('get_foreach_color')) is not None:
+            return a[0]
+        return self.fallback.get_foreach_color(info)
+
+    def choose_from_discard(self, info: EffectExecInfo, target: Player,
+                            filters: CardTypeFilter) -> Card | None:
+        if (a := self._next('choose_from_discard')) is not None:
+            return a[0]
+        return self.fallback.choose_from_discard(info, target, filters)
+
+    def choose_card_exec(self, info: EffectExecInfo, n_times: int,
+                         discard: bool = False) -> Card:
+        if (a := self._next('choose_card_exec')) is not None:
+            return a[0]
+        return self.fallback.choose_card_exec(info, n_times, discard)
+
+    def choose_color_exec(self, info: EffectExecInfo, n_times: int) -> Color:
+        if (a := self._next('choose_color_exec')) is not None:
+            return a[0]
+        return self.fallback.choose_color_exec(info, n_times)
+
+    def choose_excl_color(self, info: EffectExecInfo,
+                          top_colors: Collection[Color]) -> Color:
+        if (a := self._next('choose_excl_color')) is not None:
+            return a[0]
+        return self.fallback.choose_excl_color(info, top_colors)
+
+    def choose_card_move(self, info: EffectExecInfo,
+                         adjacencies: AdjacenciesMappingT) -> Card | None:
+        if (a := self._next('choose_card_move')) is not None:
+            return a[0]
+        return self.fallback.choose_card_move(info, adjacencies)
+
+    def choose_move_where(self, info: EffectExecInfo, card_to_move: Card,
+                          possibilities: Collection[PlaceableCardType]
+                          ) -> PlaceableCardType | None:
+        if (a := self._next('choose_move_where')) is not None:
+            return a[0]
+        return self.fallback.choose_move_where(info, card_to_move, possibilities)
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Sequence
+
+from .runner import GameResult, SimStats, play_game, game_seed
+from ..core import IRuleset, DefaultRuleset
+
+__all__ = ['run_tournament']
+
+
+# Compact form of a GameResult sent back from the workers: (scores, winners).
+#  The seed is implied by the index so doesn't need to be sent back.
+_CompactResultT = tuple[tuple[int, ...], tuple[int, ...]]
+
+# Each worker process makes its ruleset once (in _init_worker) so the deck
+#  cache (DefaultRuleset._decks_cached) is built once per process, not per game
+_worker_ruleset: IRuleset | None = None
+
+
+def _init_worker(ruleset_cls: type[IRuleset]):
+    global _worker_ruleset
+    _worker_ruleset = ruleset_cls()
+    _worker_ruleset.get_deck(0)  # Build the deck cache now
+
+
+def _play_chunk(base_seed: str, start: int, stop: int,
+                bots: Sequence[str]) -> list[_CompactResultT]:
+    results = []
+    for i in range(start, stop):
+        r = play_game(game_seed(base_seed, i), bots, _worker_ruleset)
+        results.append((r.scores, r.winners))
+    return results
+
+
+def _default_chunk_size(n_games: int, workers: int):
+    # Enough chunks per worker to balance the load and stream results
+    #  back regularly, but big enough that the IPC cost doesn't matter.
+    return max(1, min(256, n_games // (workers * 8)))
+
+
+def run_tournament(n_games: int, bots: Sequence[str], base_seed: int | str,
+                   workers: int = None, chunk_size: int = None,
+                   ruleset_cls: type[IRuleset] = DefaultRuleset,
+                   on_result: Callable[[GameResult], None] = None) -> SimStats:
+    """Play games ``0..n_games-1`` (seeds from ``game_seed(base_seed, i)``,
+    same as the single-process runner) sharded by seed range across a
+    process pool. Results are merged as each chunk finishes."""
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = _default_chunk_size(n_games, workers)
+    base_seed = str(base_seed)
+    stats = SimStats(len(bots))
+    stats.start()
+    with ProcessPoolExecutor(workers, initializer=_init_worker,
+                             initargs=(ruleset_cls,)) as pool:
+        futures = {pool.submit(_play_chunk, base_seed, start,
+                               min(start + chunk_size, n_games), bots): start
+                   for start in range(0, n_games, chunk_size)}
+        for fut in as_completed(futures):
+            for i, (scores, winners) in enumerate(fut.result(), futures[fut]):
+                result = GameResult(game_seed(base_seed, i), scores, winners)
+                stats.add(result)
+                if on_result is not None:
+                    on_result(result)
+    stats.stop()
+    return stats
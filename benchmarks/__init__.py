@@ -0,0 +1,3 @@
+"""Micro-benchmarks, run each one with ``python -m benchmarks.<name>``.
+``python -m benchmarks.suite`` runs the main ones together and compares
+the results to a baseline."""
@@ -0,0 +1,50 @@
+"""Size and encode/decode time of a mid-game state message in each codec:
+``python -m benchmarks.bench_codec``"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+import zlib
+
+from backend.api.codec import CODECS
+from backend.api.json_serialise import JsonSerialiser
+from backend.core import Game, DefaultRuleset
+from backend.sim import GreedyBot
+
+
+def make_state(n_players: int):
+    game = Game(n_players, GreedyBot(), DefaultRuleset(), seed='bench')
+    for game.round_num in range(2):
+        game.do_round()
+    return {'request': 'action_type', 'player': 0, 'thread': 1,
+            'state': JsonSerialiser().ser(game)}
+
+
+def bench(n_players: int = 4, number: int = 100) -> dict[str, dict[str, float]]:
+    """Returns the sizes (bytes, and after deflate) and times (microseconds)"""
+    msg = make_state(n_players)
+    results = {}
+    for name, codec in CODECS.items():
+        data = codec.encode(msg)
+        raw = data.encode() if isinstance(data, str) else data
+        encode = min(timeit.repeat(lambda: codec.encode(msg), number=number, repeat=5))
+        decode = min(timeit.repeat(lambda: codec.decode(data), number=number, repeat=5))
+        results[name] = {'size': len(raw), 'deflated': len(zlib.compress(raw)),
+                         'encode': encode / number * 1e6,
+                         'decode': decode / number * 1e6}
+    return results
+
+
+def main(argv: list[str] = None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.bench_codec')
+    parser.add_argument('-p', '--players', type=int, default=4)
+    parser.add_argument('-n', '--number', type=int, default=100)
+    args = parser.parse_args(argv)
+    for name, r in bench(args.players, args.number).items():
+        print(f"{name:>8}: {r['size']:7} B ({r['deflated']:6} B deflated), "
+              f"encode {r['encode']:8.1f} us, decode {r['decode']:8.1f} us")
+
+
+if __name__ == '__main__':
+    main()
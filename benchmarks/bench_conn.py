@@ -0,0 +1,55 @@
+"""Round-trip time of a request through WebsocketConn to a client that
+answers immediately: ``python -m benchmarks.bench_conn``"""
+
+from __future__ import annotations
+
+import argparse
+import threading
+import time
+
+from websockets import ConnectionClosed
+from websockets.sync.client import connect
+
+from backend.api.wesocket_conn import WebsocketConn
+
+
+def _echo_client(port: int):
+    with connect(f'ws://localhost:{port}') as ws:
+        try:
+            while True:
+                ws.send(ws.recv())
+        except ConnectionClosed:
+            pass
+
+
+def bench(port: int = 3142, number: int = 200) -> dict[str, float]:
+    """Returns the time for each operation in microseconds"""
+    conn = WebsocketConn(port)
+    conn.init()
+    client = threading.Thread(target=_echo_client, args=(port,), daemon=True)
+    client.start()
+    try:
+        conn.send({'warmup': True})
+        conn.receive()
+        start = time.perf_counter()
+        for i in range(number):
+            conn.send({'request': 'action_type', 'thread': i})
+            conn.receive()
+        elapsed = time.perf_counter() - start
+    finally:
+        conn.close()
+    client.join()
+    return {'request': elapsed / number * 1e6}
+
+
+def main(argv: list[str] = None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.bench_conn')
+    parser.add_argument('--port', type=int, default=3142)
+    parser.add_argument('-n', '--number', type=int, default=200)
+    args = parser.parse_args(argv)
+    for name, us in bench(args.port, args.number).items():
+        print(f'{name:>20}: {us:9.1f} us')
+
+
+if __name__ == '__main__':
+    main()
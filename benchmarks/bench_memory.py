@@ -0,0 +1,82 @@
+"""Memory used by games (e.g. when hosting many of them) and the allocations
+made while playing one: ``python -m benchmarks.bench_memory``"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+
+from backend.core import Game, DefaultRuleset
+from backend.sim import GreedyBot
+
+
+def make_game(n_players: int, seed: str):
+    return Game(n_players, GreedyBot(), DefaultRuleset(), seed=seed)
+
+
+def mid_game(n_players: int, seed: str):
+    """A game after 2 rounds"""
+    game = make_game(n_players, seed)
+    for game.round_num in range(2):
+        game.do_round()
+    return game
+
+
+def bench(n_players: int = 4, n_games: int = 50) -> dict[str, float]:
+    # Once first so the caches (compiled effects, decks, etc.) are filled
+    make_game(n_players, 'warmup').run_game()
+    gc.collect()
+    results = {}
+
+    tracemalloc.start()
+    games = [mid_game(n_players, f'bench{i}') for i in range(n_games)]
+    gc.collect()
+    results['kB per game'] = tracemalloc.get_traced_memory()[0] / n_games / 1e3
+    before = tracemalloc.get_traced_memory()[0]
+    snapshots = [g.snapshot() for g in games]
+    results['kB per snapshot'] = (tracemalloc.get_traced_memory()[0] - before) / n_games / 1e3
+    before = tracemalloc.get_traced_memory()[0]
+    clones = [g.clone() for g in games]
+    results['kB per clone'] = (tracemalloc.get_traced_memory()[0] - before) / n_games / 1e3
+    del games, snapshots, clones
+    gc.collect()
+
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    make_game(n_players, 'peak').run_game()
+    results['kB peak in full game'] = (tracemalloc.get_traced_memory()[1] - base) / 1e3
+    tracemalloc.stop()
+
+    # Memory blocks allocated (and not freed straight away) during a game
+    gc.collect()
+    gc.disable()
+    try:
+        blocks = sys.getallocatedblocks()
+        game = make_game(n_players, 'blocks')
+        game.run_game()
+        results['blocks allocated in full game'] = sys.getallocatedblocks() - blocks
+    finally:
+        gc.enable()
+    del game
+
+    t0 = time.perf_counter()
+    for i in range(n_games):
+        make_game(n_players, f'time{i}').run_game()
+    results['ms per full game'] = (time.perf_counter() - t0) / n_games * 1e3
+    return results
+
+
+def main(argv: list[str] = None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.bench_memory')
+    parser.add_argument('-p', '--players', type=int, default=4)
+    parser.add_argument('-n', '--games', type=int, default=50)
+    args = parser.parse_args(argv)
+    for name, value in bench(args.players, args.games).items():
+        print(f'{name:>30}: {value:9.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+"""Cost of serialising a finished game to JSON-compatible objects:
+``python -m benchmarks.bench_serialise``"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+
+from backend.api.json_serialise import JsonSerialiser
+from backend.core import Game, DefaultRuleset
+from backend.sim import GreedyBot
+
+
+def make_game(n_players: int):
+    game = Game(n_players, GreedyBot(), DefaultRuleset(), seed='bench')
+    game.run_game()
+    return game
+
+
+def bench(n_players: int = 4, number: int = 200) -> dict[str, float]:
+    """Returns the time for each operation in microseconds"""
+    game = make_game(n_players)
+    serialiser = JsonSerialiser()
+    cases = {
+        'ser (new serialiser)': lambda: JsonSerialiser().ser(game),
+        'ser (reused)': lambda: serialiser.ser(game),
+    }
+    results = {}
+    for name, fn in cases.items():
+        best = min(timeit.repeat(fn, number=number, repeat=5))
+        results[name] = best / number * 1e6
+    return results
+
+
+def main(argv: list[str] = None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.bench_serialise')
+    parser.add_argument('-p', '--players', type=int, default=4)
+    parser.add_argument('-n', '--number', type=int, default=200)
+    args = parser.parse_args(argv)
+    for name, us in bench(args.players, args.number).items():
+        print(f'{name:>20}: {us:9.1f} us')
+
+
+if __name__ == '__main__':
+    main()
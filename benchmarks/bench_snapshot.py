@@ -0,0 +1,50 @@
+"""Cost of saving/restoring/cloning a game mid-way through (after round 2),
+compared to ``copy.deepcopy()``: ``python -m benchmarks.bench_snapshot``"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import timeit
+
+from backend.core import Game, DefaultRuleset
+from backend.sim import GreedyBot
+
+
+def make_game(n_players: int):
+    game = Game(n_players, GreedyBot(), DefaultRuleset(), seed='bench')
+    for game.round_num in range(2):
+        game.do_round()
+    return game
+
+
+def bench(n_players: int = 4, number: int = 2000) -> dict[str, float]:
+    """Returns the time for each operation in microseconds"""
+    game = make_game(n_players)
+    snapshot = game.snapshot()
+    cases = {
+        'snapshot': game.snapshot,
+        'restore': lambda: game.restore(snapshot),
+        'restore(copy_cards)': lambda: game.restore(snapshot, copy_cards=True),
+        'clone': game.clone,
+        'deepcopy': lambda: copy.deepcopy(game),
+    }
+    results = {}
+    for name, fn in cases.items():
+        n = number // 20 if name == 'deepcopy' else number
+        best = min(timeit.repeat(fn, number=n, repeat=5))
+        results[name] = best / n * 1e6
+    return results
+
+
+def main(argv: list[str] = None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.bench_snapshot')
+    parser.add_argument('-p', '--players', type=int, default=4)
+    parser.add_argument('-n', '--number', type=int, default=2000)
+    args = parser.parse_args(argv)
+    for name, us in bench(args.players, args.number).items():
+        print(f'{name:>20}: {us:9.1f} us')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,226 @@
+"""All the main benchmarks, saved to a JSON file so runs can be compared:
+
+- ``python -m benchmarks.suite run -o after.json``
+- ``python -m benchmarks.suite compare before.json after.json``
+
+``compare`` exits with 1 if any benchmark got slower by more than the
+threshold (default 15%). Each result is the best of several repeats, in
+microseconds per operation.
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import timeit
+from collections import Counter
+from typing import Callable
+
+from backend.api.json_deserialise import JsonDeserialiser
+from backend.api.json_serialise import JsonSerialiser, JsonTotalCmp
+from backend.core import (Game, DefaultRuleset, Location, Area, Color,
+                          AnyResource, PlaceableCardType)
+from backend.sim import GreedyBot
+from . import bench_conn
+
+FORMAT_VERSION = 1
+_N_SLOWEST = 5  # How many templates effects.execute_slowest_templates is over
+
+
+def _best(fn: Callable[[], object], number: int, repeat: int = 7) -> float:
+    """Microseconds per call"""
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number * 1e6
+
+
+def _mid_game(n_players: int = 4) -> Game:
+    game = Game(n_players, GreedyBot(), DefaultRuleset(), seed='bench')
+    for game.round_num in range(2):
+        game.do_round()
+    return game
+
+
+def bench_selfplay(scale: float) -> dict[str, float]:
+    i = 0
+
+    def play():
+        nonlocal i
+        i += 1
+        Game(4, GreedyBot(), DefaultRuleset(), seed=f'bench/{i}').run_game()
+    return {'selfplay.greedy_4p': _best(play, max(1, int(10 * scale)))}
+
+
+def bench_execute(scale: float) -> dict[str, float]:
+    """Each DefaultRuleset template's card executed once (in its area, or
+    the hand for events) from the same mid-game state: the mean over the
+    templates, the mean of the slowest few, and the slowest one"""
+    game = _mid_game()
+    player = game.players[0]
+    snapshot = game.snapshot()
+    templates = DefaultRuleset().get_catalogue().templates
+    areas = [t.card_type if PlaceableCardType.has_instance(t.card_type) else Area.HAND
+             for t in templates]
+
+    # The state has to be reset before each card so each execute() is timed
+    #  on its own, keeping the best time for each template
+    best = [float('inf')] * len(templates)
+    for _ in range(max(1, int(20 * scale))):
+        for i, (t, area) in enumerate(zip(templates, areas)):
+            game.restore(snapshot)
+            card = t.instantiate()
+            card.append_to(game, area, player)
+            start = time.perf_counter()
+            card.execute(player)
+            best[i] = min(best[i], time.perf_counter() - start)
+    # The mean hides a regression in one effect, so also the slowest ones
+    slowest = sorted(best, reverse=True)[:_N_SLOWEST]
+    return {'effects.execute_each_template': sum(best) / len(best) * 1e6,
+            'effects.execute_slowest_templates': sum(slowest) / len(slowest) * 1e6,
+            'effects.execute_max_template': slowest[0] * 1e6}
+
+
+def bench_serialise(scale: float) -> dict[str, float]:
+    game = Game(4, GreedyBot(), DefaultRuleset(), seed='bench')
+    game.run_game()
+    serialiser = JsonSerialiser()
+    return {'serialise.game': _best(lambda: serialiser.ser(game), max(1, int(50 * scale)))}
+
+
+def bench_deserialise(scale: float) -> dict[str, float]:
+    """The parts of typical client responses that get deserialised"""
+    deser = JsonDeserialiser()
+    responses = [
+        ({'player': 1, 'area': 10, 'key': 3}, Location),
+        ({'1': 2, '3': 1}, Counter[AnyResource]),
+        (4, Color),
+        (2, PlaceableCardType),
+        ({'player': 0, 'area': 3, 'key': 0}, Location),
+    ]
+
+    def deser_all():
+        for j, tp in responses:
+            deser.deser(j, tp)
+    return {'deserialise.responses': _best(deser_all, max(1, int(2000 * scale)))
+            / len(responses)}
+
+
+def bench_total_cmp(scale: float) -> dict[str, float]:
+    """Sorting JSON values that can't be sorted directly (e.g. a set of
+    dataclasses), as the serialiser does"""
+    rng = random.Random('bench')
+    values = [{'player': rng.randrange(4), 'area': rng.randrange(12),
+               'key': rng.randrange(20)} for _ in range(200)]
+    return {'total_cmp.sort_200': _best(lambda: sorted(values, key=JsonTotalCmp.key),
+                                        max(1, int(50 * scale)))}
+
+
+def bench_transport(scale: float, port: int = 3142) -> dict[str, float]:
+    return {'transport.ws_round_trip':
+            bench_conn.bench(port, max(1, int(200 * scale)))['request']}
+
+
+BENCHMARKS: dict[str, Callable[[float], dict[str, float]]] = {
+    'selfplay': bench_selfplay,
+    'execute': bench_execute,
+    'serialise': bench_serialise,
+    'deserialise': bench_deserialise,
+    'total_cmp': bench_total_cmp,
+    'transport': bench_transport,
+}
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                              capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(names: list[str] = None, scale: float = 1.0) -> dict:
+    results = {}
+    for name in names or BENCHMARKS:
+        results |= BENCHMARKS[name](scale)
+    return {
+        'v': FORMAT_VERSION,
+        'meta': {
+            'date': datetime.datetime.now().isoformat(timespec='seconds'),
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'scale': scale,
+        },
+        'results': results,
+    }
+
+
+def compare(base: dict, new: dict, threshold: float = 0.15
+            ) -> tuple[list[str], list[str]]:
+    """Returns the report lines and the names of the regressions"""
+    lines = [f'{"benchmark":<32} {"base (us)":>12} {"new (us)":>12} {"change":>8}']
+    regressions = []
+    base_res, new_res = base['results'], new['results']
+    for name in sorted(base_res.keys() | new_res.keys()):
+        if name not in base_res or name not in new_res:
+            where = 'baseline' if name not in base_res else 'new results'
+            lines.append(f'{name:<32} (not in {where})')
+            continue
+        b, n = base_res[name], new_res[name]
+        change = n / b - 1
+        flag = ''
+        if change > threshold:
+            flag = '  REGRESSION'
+            regressions.append(name)
+        elif change < -threshold:
+            flag = '  faster'
+        lines.append(f'{name:<32} {b:12.2f} {n:12.2f} {change:+8.1%}{flag}')
+    return lines, regressions
+
+
+def _load(path: str) -> dict:
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    if data.get('v') != FORMAT_VERSION:
+        raise SystemExit(f'{path}: unknown benchmark results version {data.get("v")!r}')
+    return data
+
+
+def main(argv: list[str] = None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.suite')
+    sub = parser.add_subparsers(dest='command', required=True)
+    run_p = sub.add_parser('run', help='Run the benchmarks')
+    run_p.add_argument('-o', '--output', help='Save the results to this JSON file')
+    run_p.add_argument('-b', '--bench', action='append', choices=list(BENCHMARKS),
+                       help='Only run these (can be repeated)')
+    run_p.add_argument('--scale', type=float, default=1.0,
+                       help='Multiply the number of iterations by this')
+    cmp_p = sub.add_parser('compare', help='Compare results to a baseline')
+    cmp_p.add_argument('baseline')
+    cmp_p.add_argument('new')
+    cmp_p.add_argument('-t', '--threshold', type=float, default=0.15,
+                       help='Slowdown (as a fraction) that counts as a regression')
+    args = parser.parse_args(argv)
+    if args.command == 'run':
+        data = run(args.bench, args.scale)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
+        for name, us in data['results'].items():
+            print(f'{name:>32}: {us:11.2f} us')
+        return 0
+    lines, regressions = compare(_load(args.baseline), _load(args.new), args.threshold)
+    print('\n'.join(lines))
+    if regressions:
+        print(f'{len(regressions)} regression(s): {", ".join(regressions)}')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -22,15 +22,23 @@ declare type PlayerT = {
 declare type AreaT = {
   [key: number]: CardT;
 };
-declare type CardT = {
+declare type CardT = CardTemplateT & CardStateT;
+declare type CardTemplateT = {
   always_triggers: boolean;
   card_type: CardTypeT;
   cost: CostT;
   effect: EffectT;
   is_starting_card: boolean;
+};
+declare type CardStateT = {
   location: LocationT;
   markers: number;
 };
+// How cards are sent with card_format 'template': the template is
+//  `templates[template_id]` from the init message
+declare type CompactCardT = CardStateT & {
+  template_id: number;
+};
 declare type CostT = {
   possibilities: Array<[ResourceFilterT, number]>;
 };
@@ -1,11 +1,17 @@
 from backend.api.json_adapter import JsonAdapter
+from backend.api.json_connection import ClientDisconnected
 from backend.api.wesocket_conn import WebsocketConn
 from backend.core import Game, DefaultRuleset
 
 
 def main():
-    g = Game(4, JsonAdapter(WebsocketConn()), DefaultRuleset())
-    g.run_game()
+    conn = WebsocketConn()
+    g = Game(4, JsonAdapter(conn), DefaultRuleset())
+    try:
+        g.run_game()
+    except ClientDisconnected:
+        print('Client disconnected, game abandoned')
+        conn.close()
 
 
 if __name__ == '__main__':
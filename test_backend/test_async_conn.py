@@ -0,0 +1,89 @@
+import asyncio
+import json
+import threading
+import unittest
+
+from websockets import ConnectionClosedOK
+from websockets.asyncio.client import connect
+from websockets.sync.client import connect as sync_connect
+
+from backend.api.json_connection import ClientDisconnected
+from backend.api.wesocket_conn import AsyncWebsocketConn, WebsocketConn
+
+_PORT = 5927
+
+
+class AsyncWebsocketConnTestCase(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.conn = AsyncWebsocketConn(_PORT)
+        await self.conn.init()
+        self.addAsyncCleanup(self.conn.close)
+        self.client = await connect(f'ws://localhost:{_PORT}')
+        self.addAsyncCleanup(self.client.close)
+
+    async def test_request(self):
+        async def echo():
+            msg = json.loads(await self.client.recv())
+            await self.client.send(json.dumps({'echo': msg}))
+        echo_task = asyncio.create_task(echo())
+        self.assertEqual(await self.conn.request({'a': [1, 2]}),
+                         {'echo': {'a': [1, 2]}})
+        await echo_task
+
+    async def test_cancel_receive(self):
+        receive = asyncio.create_task(self.conn.receive())
+        await asyncio.sleep(0.01)
+        receive.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await receive
+        # Connection is still usable
+        await self.client.send('{"n":1}')
+        self.assertEqual(await self.conn.receive(), {'n': 1})
+
+    async def test_client_closes(self):
+        await self.client.close()
+        with self.assertRaises(ClientDisconnected):
+            await self.conn.receive()
+
+    async def test_close(self):
+        await self.conn.send({'request': 'shutdown'})
+        await self.conn.close()
+        self.assertEqual(json.loads(await self.client.recv()), {'request': 'shutdown'})
+        with self.assertRaises(ConnectionClosedOK):
+            await self.client.recv()
+
+
+class WebsocketConnTestCase(unittest.TestCase):
+    def test_send_before_connect(self):
+        conn = WebsocketConn(_PORT)
+        conn.init()
+        self.addCleanup(conn.close)
+        closed = threading.Event()
+
+        def client():
+            with sync_connect(f'ws://localhost:{_PORT}') as ws:
+                ws.send(json.dumps({'got': json.loads(ws.recv())}))
+                with self.assertRaises(ConnectionClosedOK):
+                    ws.recv()
+                closed.set()
+        client_th = threading.Thread(target=client)
+        client_th.start()
+        conn.send({'b': 2})  # Waits for the client to connect
+        self.assertEqual(conn.receive(), {'got': {'b': 2}})
+        conn.close()
+        client_th.join(1)
+        self.assertTrue(closed.is_set())
+
+    def test_client_closes(self):
+        conn = WebsocketConn(_PORT)
+        conn.init()
+        self.addCleanup(conn.close)
+        with sync_connect(f'ws://localhost:{_PORT}') as ws:
+            ws.send('{"n":1}')
+        self.assertEqual(conn.receive(), {'n': 1})
+        with self.assertRaises(ClientDisconnected):
+            conn.receive()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+import unittest
+
+from backend.core import Game, DefaultRuleset
+from backend.sim import game_seed
+from backend.sim.batch import BatchEngine, ReferenceBot, run_batch
+
+
+class BatchEngineTestCase(unittest.TestCase):
+    def test_same_as_object_engine(self):
+        for n_players in (2, 4):
+            seeds = [game_seed('batch', i) for i in range(12)]
+            engine = BatchEngine(seeds, n_players)
+            scores = engine.run().tolist()
+            for seed, batch_scores in zip(seeds, scores):
+                with self.subTest(n_players=n_players, seed=seed):
+                    game = Game(n_players, ReferenceBot(), DefaultRuleset(), seed=seed)
+                    game.run_game()
+                    self.assertEqual(batch_scores, [p.final_score for p in game.players])
+
+    def test_counter_rng(self):
+        seeds = [game_seed('batch-counter', i) for i in range(8)]
+        scores = BatchEngine(seeds, 3, rng_mode='counter').run().tolist()
+        for seed, batch_scores in zip(seeds, scores):
+            with self.subTest(seed=seed):
+                game = Game(3, ReferenceBot(), DefaultRuleset(), seed=seed,
+                            rng_mode='counter')
+                game.run_game()
+                self.assertEqual(batch_scores, [p.final_score for p in game.players])
+
+    def test_batches_dont_matter(self):
+        one = run_batch(10, 3, 'batches')
+        several = run_batch(10, 3, 'batches', batch_size=4)
+        self.assertEqual(one.games, 10)
+        self.assertEqual(one.scores, several.scores)
+        self.assertEqual(one.wins, several.wins)
@@ -0,0 +1,41 @@
+import unittest
+import unittest.mock
+
+from benchmarks import suite
+
+
+def _results(**results):
+    return {'v': suite.FORMAT_VERSION, 'meta': {}, 'results': results}
+
+
+class CompareTestCase(unittest.TestCase):
+    def test_compare(self):
+        base = _results(same=10.0, slower=10.0, faster=10.0, just_under=10.0,
+                        removed=1.0)
+        new = _results(same=10.0, slower=12.0, faster=5.0, just_under=11.4,
+                       added=1.0)
+        lines, regressions = suite.compare(base, new)
+        self.assertEqual(regressions, ['slower'])
+        by_name = {line.split()[0]: line for line in lines[1:]}
+        self.assertEqual(len(by_name), 6)
+        self.assertTrue(by_name['slower'].endswith('REGRESSION'))
+        self.assertTrue(by_name['faster'].endswith('faster'))
+        self.assertNotIn('REGRESSION', by_name['just_under'])
+        self.assertIn('+0.0%', by_name['same'])
+        self.assertIn('not in baseline', by_name['added'])
+        self.assertIn('not in new results', by_name['removed'])
+        _, regressions = suite.compare(base, new, threshold=0.1)
+        self.assertEqual(regressions, ['just_under', 'slower'])
+
+    def test_exit_code(self):
+        base, new = _results(a=10.0), _results(a=20.0)
+        with unittest.mock.patch.object(suite, '_load', side_effect=[base, new]), \
+                unittest.mock.patch('builtins.print'):
+            self.assertEqual(suite.main(['compare', 'base.json', 'new.json']), 1)
+        with unittest.mock.patch.object(suite, '_load', side_effect=[base, base]), \
+                unittest.mock.patch('builtins.print'):
+            self.assertEqual(suite.main(['compare', 'base.json', 'new.json']), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+
+from backend.core import Game, DefaultRuleset, Player, Area
+from backend.sim import RandomBot
+
+
+class _CheckingBot(RandomBot):
+    def __init__(self, test: unittest.TestCase, seed: str):
+        super().__init__(seed)
+        self.test = test
+
+    def on_turn_start(self, player: Player):
+        self.test.check_counts(self.game)
+
+
+class CardCountsTestCase(unittest.TestCase):
+    def check_counts(self, game: Game):
+        for p in game.players:
+            for a in Area.members():
+                self.assertEqual(p.num_cards_of_type(a, include_starting=True),
+                                 len(p.cards_of_type(a, include_starting=True)))
+                self.assertEqual(p.num_cards_of_type(a),
+                                 len(p.cards_of_type(a, include_starting=False)))
+
+    def test_counts(self):
+        for i in range(3):
+            game = Game(3, _CheckingBot(self, f'counts/{i}'), DefaultRuleset(),
+                        seed=f'counts/{i}')
+            game.round_num = 0
+            game.do_round()
+            snapshot, checkpoint = game.snapshot(), game.checkpoint()
+            for game.round_num in range(1, 3):
+                game.do_round()
+            game.finish_game()
+            self.check_counts(game)
+            game.rollback(checkpoint)
+            self.check_counts(game)
+            game.stop_journal()
+            game.restore(snapshot)
+            self.check_counts(game)
+            self.check_counts(game.clone())
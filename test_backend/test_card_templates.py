@@ -0,0 +1,140 @@
+import json
+import unittest
+
+from backend.api.json_adapter import JsonAdapter
+from backend.api.json_connection import JsonConnection
+from backend.api.json_serialise import JsonSerialiser
+from backend.core import (Game, DefaultRuleset, IRuleset, CardCatalogue,
+                          CardTemplate, Area)
+from backend.sim import GreedyBot
+
+
+class _StateRecorder(JsonConnection):
+    """Records the messages and answers like a GreedyBot (using the adapter's
+    own game, as this test is only about what is sent)"""
+
+    adapter: JsonAdapter
+
+    def __init__(self):
+        self.messages = []
+        self.bot = GreedyBot()
+
+    def send(self, obj):
+        self.messages.append(json.loads(json.dumps(obj)))
+
+    def receive(self):
+        req = self.messages[-1]
+        game = self.adapter.game
+        self.bot.register_game(game)
+        resp = {'thread': req['thread']}
+        player = game.players[req.get('player', game.curr_player_idx)]
+        match req['request']:
+            case 'action_type':
+                return resp | {'action_type': 'execute'}
+            case 'discard_for_exec':
+                card = self.bot.get_discard(player)
+                return resp | {'discard_for_exec': self.adapter.ser(card.location)}
+            case 'spend_resources':
+                return resp | {'spend_resources': None}
+        raise AssertionError(f'Unexpected request {req["request"]!r}')
+
+
+def _expand(state, templates):
+    """Replace the compact cards with the full ones"""
+    players = state['players'] + (state['players_ranked'] or []) + (state['winners'] or [])
+    for p in players:
+        for area in p['areas'].values():
+            for k, card in area.items():
+                area[k] = templates[card.pop('template_id')] | card
+    return state
+
+
+class CardCatalogueTestCase(unittest.TestCase):
+    def test_ids_stable(self):
+        catalogue = DefaultRuleset().get_catalogue()
+        self.assertIs(DefaultRuleset().get_catalogue(), catalogue)
+        # A new catalogue (with new templates) gives the same ids
+        fresh = IRuleset.get_catalogue(DefaultRuleset())
+        self.assertEqual(fresh.templates, catalogue.templates)
+        for i, t in enumerate(catalogue.templates):
+            self.assertEqual(catalogue.id_of(t), i)
+            self.assertEqual(fresh.id_of(t), i)
+
+    def test_equal_templates_share_id(self):
+        t = DefaultRuleset().get_starting_cards()[0]
+        copy = CardTemplate(t.card_type, t.effect, t.cost, is_starting_card=True)
+        catalogue = CardCatalogue([t, copy])
+        self.assertEqual(len(catalogue), 1)
+        self.assertEqual(catalogue.id_of(copy), 0)
+        with self.assertRaises(KeyError):
+            catalogue.id_of(CardTemplate(t.card_type, t.effect, t.cost))
+
+    def test_all_dealt_cards(self):
+        game = Game(4, GreedyBot(), DefaultRuleset(), seed='catalogue')
+        game.run_game()
+        catalogue = game.ruleset.get_catalogue()
+        cards = [c for p in game.players for a in p.areas.values() for c in a.values()]
+        self.assertGreater(len(cards), 40)
+        for c in cards:
+            t = catalogue.templates[catalogue.id_of(c)]
+            self.assertEqual((t.card_type, t.effect, t.cost, t.is_starting_card),
+                             (c.card_type, c.effect, c.cost, c.is_starting_card))
+
+
+class FlyweightCardTestCase(unittest.TestCase):
+    def test_shares_template(self):
+        t = DefaultRuleset().get_deck(0)[0]
+        a, b = t.instantiate(), t.instantiate()
+        self.assertIs(a.template, b.template)
+        self.assertFalse(hasattr(a, '__dict__'))
+        self.assertEqual((a.card_type, a.effect, a.cost, a.always_triggers,
+                          a.is_starting_card),
+                         (t.card_type, t.effect, t.cost, t.always_triggers,
+                          t.is_starting_card))
+        self.assertNotEqual(a, b)
+        self.assertTrue(a.equals(b))
+        with self.assertRaises(AttributeError):
+            a.effect = None
+
+    def test_serialised_like_template(self):
+        t = DefaultRuleset().get_deck(0)[0]
+        ser = JsonSerialiser()
+        card = t.instantiate(markers=2)
+        self.assertEqual(ser.ser(card), ser.ser(t) | {'location': None, 'markers': 2})
+
+
+class TemplateCardFormatTestCase(unittest.TestCase):
+    def _run(self, card_format):
+        conn = _StateRecorder()
+        conn.adapter = JsonAdapter(conn, card_format=card_format)
+        Game(3, conn.adapter, DefaultRuleset(), seed='templates').run_game()
+        return conn.messages
+
+    def test_expands_to_full(self):
+        full = self._run('full')
+        compact = self._run('template')
+        self.assertEqual(compact[0]['card_format'], 'template')
+        templates = compact[0]['templates']
+        hand = compact[2]['state']['players'][0]['areas'][str(Area.HAND.value)]
+        self.assertEqual({'location', 'markers', 'template_id'},
+                         set(next(iter(hand.values()))))
+        self.assertEqual(len(full), len(compact))
+        for f, c in zip(full[1:], compact[1:]):
+            if 'state' not in f:
+                continue
+            self.assertEqual(_expand(c['state'], templates), f['state'])
+
+    def test_smaller(self):
+        full = self._run('full')
+        compact = self._run('template')
+        size_full = sum(len(json.dumps(m['state'])) for m in full if 'state' in m)
+        size_compact = sum(len(json.dumps(m['state'])) for m in compact if 'state' in m)
+        self.assertLess(size_compact, size_full / 3)
+
+    def test_full_init_unchanged(self):
+        init = self._run('full')[0]
+        self.assertEqual(set(init), {'request', 'server_version', 'api_version'})
+
+
+if __name__ == '__main__':
+    unittest.main()
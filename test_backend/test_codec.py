@@ -0,0 +1,95 @@
+import unittest
+
+from backend.api.codec import CODECS, BinaryCodec, CodecError, decode_message
+from backend.api.json_adapter import JsonAdapter
+from backend.api.json_serialise import JsonSerialiser
+from backend.core import Game, DefaultRuleset
+from backend.sim import GreedyBot
+from .test_delta_sync import _PatchingClient
+
+
+class BinaryCodecTestCase(unittest.TestCase):
+    def test_round_trip(self):
+        codec = BinaryCodec()
+        values = [
+            None, True, False, 0, 1, 127, 128, -1, -64, 2 ** 70, -2 ** 70,
+            0.5, -1e300, '', 'abc', 'ünïcödé ✓', [], {}, [1, [2, [3]]],
+            {'a': 1, 'b': {'a': [None, 'a']}, 'ä': {'a': {}}},
+        ]
+        for v in values:
+            with self.subTest(v=v):
+                self.assertEqual(codec.decode(codec.encode(v)), v)
+        self.assertEqual(codec.decode(codec.encode((1, (2, 3)))), [1, [2, 3]])
+
+    def test_compact(self):
+        codec = BinaryCodec()
+        self.assertEqual(len(codec.encode(5)), 3)  # Version, no keys, value
+        # Keys are only stored once
+        many = [{'allowed_resources': [1, 2]} for _ in range(50)]
+        self.assertEqual(len(codec.encode(many)), 3 + len('allowed_resources') + 2 + 50 * 7)
+
+    def test_game_state(self):
+        game = Game(4, GreedyBot(), DefaultRuleset(), seed='codec')
+        game.round_num = 0
+        game.do_round()
+        state = JsonSerialiser().ser(game)
+        json_data = CODECS['json'].encode(state)
+        binary_data = CODECS['binary'].encode(state)
+        self.assertEqual(decode_message(binary_data), decode_message(json_data))
+        self.assertLess(len(binary_data), len(json_data) / 2)
+
+    def test_bad_data(self):
+        codec = BinaryCodec()
+        data = codec.encode({'a': [1, 'xyz']})
+        for bad in (b'', b'\x09' + data[1:], data[:-1], data + b'\x80', b'\x01\x00\x08'):
+            with self.subTest(data=bad), self.assertRaises(CodecError):
+                codec.decode(bad)
+        with self.assertRaises(CodecError):
+            codec.encode({1: 2})
+        with self.assertRaises(CodecError):
+            codec.encode(object())
+
+
+class _BinaryClient(_PatchingClient):
+    """Asks for the binary codec in its first reply"""
+
+    def __init__(self, test: unittest.TestCase):
+        super().__init__(test)
+        self.codecs_used = []
+        self.offered = None
+
+    def send(self, obj):
+        self.codecs_used.append(self.codec.name)
+        obj = decode_message(self.codec.encode(obj))
+        if obj.get('request') == 'init':
+            self.offered = obj.get('codecs')
+        if obj.get('request') not in ('init', 'result', 'shutdown'):
+            super().send(obj)
+
+    def receive(self):
+        resp = super().receive()
+        if self.n_requests == 1:
+            resp |= {'codec': 'binary'}
+        return resp
+
+
+class CodecNegotiationTestCase(unittest.TestCase):
+    def test_negotiate(self):
+        client = _BinaryClient(self)
+        client.adapter = JsonAdapter(client, 'delta', codecs=('json', 'binary'))
+        Game(2, client.adapter, DefaultRuleset(), seed='negotiate').run_game()
+        self.assertEqual(client.offered, ['json', 'binary'])
+        # init, state, first request then binary from the first reply onwards
+        self.assertEqual(client.codecs_used[:3], ['json'] * 3)
+        self.assertEqual(set(client.codecs_used[3:]), {'binary'})
+
+    def test_not_offered(self):
+        client = _BinaryClient(self)
+        client.adapter = JsonAdapter(client, 'delta')
+        Game(2, client.adapter, DefaultRuleset(), seed='negotiate').run_game()
+        self.assertIsNone(client.offered)
+        self.assertEqual(set(client.codecs_used), {'json'})
+
+
+if __name__ == '__main__':
+    unittest.main()
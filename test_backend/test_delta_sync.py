@@ -0,0 +1,80 @@
+import copy
+import json
+import unittest
+
+from backend.api.json_adapter import JsonAdapter
+from backend.api.json_connection import JsonConnection
+from backend.api.json_patch import make_patch, apply_patch
+from backend.core import Game, DefaultRuleset
+
+
+class _PatchingClient(JsonConnection):
+    """Keeps its own copy of the state using only what the server sends and
+    always executes (discarding its first hand card) and never spends"""
+
+    adapter: JsonAdapter
+
+    def __init__(self, test: unittest.TestCase, resync_every: int = 0):
+        self.test = test
+        self.resync_every = resync_every
+        self.state = None
+        self.version = None
+        self.pending = None
+        self.n_full = self.n_patches = self.n_requests = 0
+
+    def send(self, obj):
+        obj = json.loads(json.dumps(obj))  # What the client would actually see
+        if 'state' in obj:
+            self.n_full += 1
+            self.state, self.version = obj['state'], obj['state_version']
+        elif 'state_patch' in obj:
+            self.n_patches += 1
+            self.test.assertEqual(obj['state_base'], self.version)
+            self.state = apply_patch(self.state, obj['state_patch'])
+            self.version = obj['state_version']
+        if 'state' in obj or 'state_patch' in obj:
+            self.test.assertEqual(
+                self.state, json.loads(json.dumps(self.adapter.serialise_state())))
+        if 'thread' in obj:
+            self.pending = obj
+
+    def receive(self):
+        req, self.pending = self.pending, None
+        self.n_requests += 1
+        resp = {'thread': req['thread'], 'ack_version': self.version}
+        if self.resync_every and self.n_requests % self.resync_every == 0:
+            return resp | {'resync': True}
+        kind = req['request']
+        if kind == 'action_type':
+            return resp | {'action_type': 'execute'}
+        if kind == 'discard_for_exec':
+            hand = self.state['players'][req['player']]['areas']['10']
+            return resp | {'discard_for_exec': next(iter(hand.values()))['location']}
+        if kind == 'spend_resources':
+            return resp | {'spend_resources': None}
+        raise AssertionError(f'Unexpected request {kind}')
+
+
+class DeltaSyncTestCase(unittest.TestCase):
+    def _run(self, client: _PatchingClient):
+        client.adapter = JsonAdapter(client, state_sync='delta')
+        Game(3, client.adapter, DefaultRuleset(), seed='delta').run_game()
+
+    def test_patches_rebuild_state(self):
+        client = _PatchingClient(self)
+        self._run(client)
+        self.assertEqual(client.n_full, 1)
+        self.assertGreater(client.n_patches, 50)
+
+    def test_resync(self):
+        client = _PatchingClient(self, resync_every=7)
+        self._run(client)
+        self.assertGreater(client.n_full, 1)
+
+    def test_patch_roundtrip(self):
+        old = {'a': [1, 2, {'b': True}], 'c/d': {'~': 1}, 'e': (1, 2)}
+        new = {'a': [1, {'b': 1}], 'c/d': {'~': 2, 'f': None}, 'g': [1]}
+        patched = apply_patch(copy.deepcopy(json.loads(json.dumps(old))),
+                              make_patch(old, new))
+        self.assertEqual(json.dumps(patched, sort_keys=True),
+                         json.dumps(new, sort_keys=True))
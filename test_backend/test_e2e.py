@@ -10,6 +10,7 @@ from websockets import ConnectionClosedOK
 from websockets.sync.client import connect, ClientConnection
 
 from backend.api.json_adapter import JsonAdapter
+from backend.api.json_connection import ClientDisconnected
 from backend.api.wesocket_conn import WebsocketConn
 from backend.core import Game, DefaultRuleset
 
@@ -35,14 +36,29 @@ class E2ETestCase(unittest.TestCase):
         self._server_th.start()
 
     def server_main(self):
+        conn = WebsocketConn(_PORT)
         try:
-            g = Game(4, JsonAdapter(WebsocketConn(_PORT)),
-                     DefaultRuleset(), seed='1748776970931817000')
+            g = Game(4, JsonAdapter(conn), DefaultRuleset(),
+                     seed='1748776970931817000')
             g.run_game()
+        except ClientDisconnected:
+            conn.close()  # The test has finished with the game
         except Exception as e:
             self._server_failed = e
             raise
 
+    # noinspection PyMethodMayBeStatic
+    def connect(self, timeout: float = 5.0) -> ClientConnection:
+        # The server is started in another thread so may not be listening yet
+        deadline = time.perf_counter() + timeout
+        while True:
+            try:
+                return connect(f"ws://localhost:{_PORT}")
+            except ConnectionRefusedError:
+                if time.perf_counter() > deadline or self._server_failed:
+                    raise
+                time.sleep(0.01)
+
     # noinspection PyMethodMayBeStatic
     def _load_actions(self):
         with open('./test_backend/test_e2e_data.json') as f:
@@ -51,7 +67,7 @@ class E2ETestCase(unittest.TestCase):
 
     def test(self):
         self.start_server()
-        with connect(f"ws://localhost:{_PORT}") as ws:
+        with self.connect() as ws:
             for self._idx, (tp, data) in enumerate(self._load_actions()):
                 if self._server_failed:
                     self.fail("Server encountered error! See above for details.")
@@ -0,0 +1,40 @@
+import unittest
+
+from backend.core.eenum import ExtendableEnum
+
+
+class EenumCacheTestCase(unittest.TestCase):
+    def test_extending_invalidates_cache(self):
+        class Top(ExtendableEnum[int]):
+            A = 1
+            B = 2
+
+        class Sub(Top):
+            _eenum_include_members_ = [Top.A]
+
+        self.assertEqual(Top.members(), (Top.A, Top.B))
+        self.assertIs(Top.members(), Top.members())
+        self.assertEqual(Sub.members(), (Top.A,))
+        self.assertFalse(Sub.has_instance(Top.B))
+
+        class Ext(Top):  # Adds a new member to the hierarchy (and so to Top)
+            C = 3
+
+        self.assertEqual(Top.members(), (Top.A, Top.B, Ext.C))
+        self.assertTrue(Top.has_instance(Ext.C))
+        self.assertIs(Top[3], Ext.C)
+        self.assertEqual(Sub.members(), (Top.A,))
+        self.assertNotIn(Ext.C, Sub)
+        with self.assertRaises(KeyError):
+            _ = Sub[3]
+        self.assertEqual(len(Top), 3)
+        self.assertEqual(hash(Top.A), hash((Top, 1)))
+
+    def test_name_before_value(self):
+        class Strs(ExtendableEnum[str]):
+            X = 'Y'
+            Y = 'Z'
+
+        self.assertIs(Strs['X'], Strs.X)
+        self.assertIs(Strs['Y'], Strs.Y)  # Not Strs.X, whose value is 'Y'
+        self.assertIs(Strs['Z'], Strs.Y)
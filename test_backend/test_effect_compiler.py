@@ -0,0 +1,37 @@
+import pickle
+import unittest
+from unittest import mock
+
+from backend.api.json_serialise import JsonSerialiser
+from backend.core import Game, DefaultRuleset, Card, EffectExecInfo
+from backend.sim import game_seed
+from backend.sim.runner import make_frontend
+
+
+def _interpreted_execute(self: Card, player):
+    self.effect.execute(EffectExecInfo(self, player))
+
+
+class EffectCompilerTestCase(unittest.TestCase):
+    def _final_state(self, seed: str):
+        game = Game(4, make_frontend(['random', 'greedy', 'random', 'cost'], seed),
+                    DefaultRuleset(), seed=seed)
+        game.run_game()
+        return JsonSerialiser().ser(game)
+
+    def test_same_as_interpreted(self):
+        for i in range(8):
+            seed = game_seed('compiler', i)
+            with self.subTest(seed=seed):
+                compiled = self._final_state(seed)
+                with mock.patch.object(Card, 'execute', _interpreted_execute):
+                    interpreted = self._final_state(seed)
+                self.assertEqual(compiled, interpreted)
+
+    def test_compiled_is_cached_and_picklable(self):
+        for round_idx in range(3):
+            for template in DefaultRuleset().get_deck(round_idx):
+                fn = template.effect.compiled()
+                self.assertIs(template.effect.compiled(), fn)
+                self.assertEqual(pickle.loads(pickle.dumps(template.effect)),
+                                 template.effect)
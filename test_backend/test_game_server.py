@@ -0,0 +1,238 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from websockets import InvalidStatus, ConnectionClosed
+from websockets.asyncio.client import connect
+
+from backend.api.codec import CODECS
+from backend.api.game_server import GameServer, GameRoom
+from backend.core import Card, ReplayLog, replay_game
+
+_E2E_DATA = Path(__file__).parent / 'test_e2e_data.json'
+
+
+class GameServerTestCase(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.server = GameServer(port=0)
+        await self.server.start()
+        self.addAsyncCleanup(self.server.close)
+
+    def url(self, path: str = '/'):
+        return f'ws://localhost:{self.server.port}{path}'
+
+    async def lobby_request(self, ws, msg):
+        await ws.send(json.dumps(msg))
+        return json.loads(await ws.recv())
+
+    async def recv(self, ws):
+        return json.loads(await ws.recv())
+
+    async def test_lobby(self):
+        async with connect(self.url()) as ws:
+            self.assertEqual(await self.lobby_request(ws, {'request': 'list_games'}),
+                             {'games': []})
+            game_id = (await self.lobby_request(ws, {
+                'request': 'create_game', 'n_players': 2, 'seed': 'a'}))['game']
+            self.assertEqual(await self.lobby_request(ws, {'request': 'list_games'}), {
+                'games': [{'game': game_id, 'n_players': 2, 'status': 'waiting',
+                           'n_clients': 0}]})
+            self.assertEqual(await self.lobby_request(ws, {
+                'request': 'create_game', 'n_players': 99}), {'error': 'bad_n_players'})
+            self.assertEqual(await self.lobby_request(ws, {
+                'request': 'join_game', 'game': 'nope'}), {'error': 'no_such_game'})
+            self.assertEqual(await self.lobby_request(ws, {'request': 'dance'}),
+                             {'error': 'unknown_request'})
+            await ws.send(json.dumps({'request': 'join_game', 'game': game_id}))
+            self.assertEqual((await self.recv(ws))['request'], 'init')
+            self.assertEqual((await self.recv(ws))['request'], 'state')
+            self.assertEqual((await self.recv(ws))['request'], 'action_type')
+            self.assertEqual(self.server.rooms[game_id].status, 'running')
+
+    async def test_unknown_game_path(self):
+        with self.assertRaises(InvalidStatus):
+            async with connect(self.url('/games/nope')):
+                pass
+
+    async def test_many_games(self):
+        rooms = [self.server.create_room(2, seed=f's{i}') for i in range(20)]
+        clients = [await connect(self.url(f'/games/{r.id}')) for r in rooms]
+        for ws in clients:
+            for _ in range(3):  # init, state, action_type
+                msg = await self.recv(ws)
+            await ws.send(json.dumps({'action_type': 'execute',
+                                      'thread': msg['thread']}))
+            self.assertEqual((await self.recv(ws))['request'], 'discard_for_exec')
+        self.assertEqual(len(self.server.list_rooms()), 20)
+        await clients[0].close()
+        # Reconnecting gives init and then the last message again
+        async with connect(self.url(f'/games/{rooms[0].id}')) as ws:
+            self.assertEqual((await self.recv(ws))['request'], 'init')
+            self.assertEqual((await self.recv(ws))['request'], 'discard_for_exec')
+        for ws in clients[1:]:
+            await ws.close()
+
+    async def answer(self, ws, room, msg):
+        """Send any legal answer to ``msg``, as a client would"""
+        answer = room.game.decision.options()[0]
+        if isinstance(answer, Card):
+            answer = answer.location
+        await ws.send(json.dumps({msg['request']: room.adapter.ser(answer),
+                                  'thread': msg['thread']}))
+
+    async def test_no_threads(self):
+        n_threads = threading.active_count()
+        rooms = [self.server.create_room(3, seed=f't{i}') for i in range(5)]
+        # By IP so connecting doesn't look the name up in another thread
+        clients = [await connect(f'ws://127.0.0.1:{self.server.port}/games/{r.id}')
+                   for r in rooms]
+        last = [None] * len(rooms)
+        for _ in range(4):  # All the games progress together
+            for i, (room, ws) in enumerate(zip(rooms, clients)):
+                while 'thread' not in (msg := await self.recv(ws)):
+                    pass
+                self.assertNotEqual(msg, last[i])
+                last[i] = msg
+                await self.answer(ws, room, msg)
+        self.assertEqual(threading.active_count(), n_threads)
+        for ws in clients:
+            await ws.close()
+
+    async def test_park(self):
+        room = self.server.create_room(2, seed='park')
+        async with connect(self.url(f'/games/{room.id}')) as ws:
+            for _ in range(3):
+                msg = await self.recv(ws)
+            await self.answer(ws, room, msg)
+            msg = await self.recv(ws)
+        for _ in range(100):  # Parked when the server sees the client go
+            if room.parked is not None:
+                break
+            await asyncio.sleep(0.01)
+        self.assertIsNone(room.game)
+        self.assertIsNone(room.adapter.game)
+        self.assertEqual(room.status, 'running')
+        async with connect(self.url(f'/games/{room.id}')) as ws:
+            self.assertEqual((await self.recv(ws))['request'], 'init')
+            self.assertEqual(await self.recv(ws), msg)  # Carries on from there
+            self.assertIsNone(room.parked)
+            await self.answer(ws, room, msg)
+            self.assertNotEqual(await self.recv(ws), msg)
+
+    async def test_bad_answer(self):
+        room = self.server.create_room(2, seed='bad')
+        async with connect(self.url(f'/games/{room.id}')) as ws:
+            for _ in range(3):
+                msg = await self.recv(ws)
+            other = await connect(self.url(f'/games/{room.id}'))
+            self.addAsyncCleanup(other.close)
+            for _ in range(2):  # init and the last message
+                await self.recv(other)
+            for bad in ({'action_type': 'nonsense', 'thread': msg['thread']},
+                        [msg['thread']]):
+                await ws.send(json.dumps(bad))
+                self.assertEqual(await self.recv(ws), {'error': 'bad_answer'})
+                # Asked again (everyone, as any of them can answer)
+                again = await self.recv(ws)
+                self.assertEqual(await self.recv(other), again)
+                self.assertEqual(again['request'], 'action_type')
+                self.assertGreater(again['thread'], msg['thread'])
+                msg = again
+            self.assertEqual(room.status, 'running')
+            await ws.send(json.dumps({'action_type': 'execute',
+                                      'thread': msg['thread']}))
+            self.assertEqual((await self.recv(ws))['request'], 'discard_for_exec')
+
+    async def test_codec_per_client(self):
+        room = self.server.create_room(2, seed='codec')
+        async with connect(self.url(f'/games/{room.id}')) as ws:
+            self.assertIn('binary', (await self.recv(ws))['codecs'])
+            for _ in range(2):
+                msg = await self.recv(ws)
+            binary = await connect(self.url(f'/games/{room.id}'))
+            self.addAsyncCleanup(binary.close)
+            for _ in range(2):
+                await binary.recv()
+            # A bad answer, so the switch is acknowledged (in the new codec)
+            await binary.send(json.dumps({'codec': 'binary', 'thread': msg['thread'],
+                                          'action_type': 'nonsense'}))
+            self.assertEqual(CODECS['binary'].decode(await binary.recv()),
+                             {'error': 'bad_answer'})
+            data = await binary.recv()
+            self.assertIsInstance(data, bytes)
+            text = await ws.recv()
+            self.assertIsInstance(text, str)
+            self.assertEqual(CODECS['binary'].decode(data), json.loads(text))
+            # Joining later still gets JSON
+            async with connect(self.url(f'/games/{room.id}')) as late:
+                self.assertEqual((await self.recv(late))['request'], 'init')
+                self.assertEqual(await late.recv(), text)
+
+    async def test_same_as_adapter(self):
+        # Same messages as a game run by JsonAdapter directly (see test_e2e),
+        #  also when every answer is given in the executor
+        with open(_E2E_DATA) as f:
+            script = [next(iter(o.items())) for o in json.load(f)]
+        for inline_answers in (GameRoom.inline_answers, 0):
+            with self.subTest(inline_answers=inline_answers):
+                server = GameServer(port=0, codecs=('json',))
+                await server.start()
+                self.addAsyncCleanup(server.close)
+                room = server.create_room(4, seed='1748776970931817000')
+                room.inline_answers = inline_answers
+                async with connect(f'ws://localhost:{server.port}/games/{room.id}') as ws:
+                    for tp, data in script:
+                        if tp == 'send':
+                            await ws.send(json.dumps(data))
+                        else:
+                            self.assertEqual(tp, 'recv')
+                            self.assertEqual(await self.recv(ws), data)
+
+    async def test_record(self):
+        with tempfile.TemporaryDirectory() as d:
+            log = ReplayLog(os.path.join(d, 'games.ndjson'))
+            server = GameServer(port=0, replay_log=log)
+            await server.start()
+            self.addAsyncCleanup(server.close)
+            room = server.create_room(2, seed='record')
+            async with connect(f'ws://localhost:{server.port}/games/{room.id}') as ws:
+                while (msg := await self.recv(ws))['request'] != 'shutdown':
+                    if 'thread' not in msg:
+                        continue
+                    await self.answer(ws, room, msg)
+            self.assertEqual(room.status, 'finished')
+            records = list(log)
+        self.assertEqual(len(records), 1)
+        self.assertEqual(replay_game(records[0]), records[0].result)
+
+    async def test_close_stops_games(self):
+        room = self.server.create_room(2)
+        async with connect(self.url(f'/games/{room.id}')) as ws:
+            await self.recv(ws)
+            await self.server.close()
+            with self.assertRaises(ConnectionClosed):
+                while True:
+                    await ws.recv()
+        self.assertIsNone(room.game)
+        self.assertEqual(self.server.rooms, {})
+
+
+class LayeringTestCase(unittest.TestCase):
+    def test_no_sim_import(self):
+        # The server only needs the engine, not the bots and simulations
+        code = ('import sys, backend.api.game_server; '
+                'print([m for m in sys.modules if m.startswith("backend.sim")])')
+        out = subprocess.run([sys.executable, '-c', code], capture_output=True,
+                             text=True, check=True,
+                             cwd=Path(__file__).parent.parent).stdout
+        self.assertEqual(out.strip(), '[]')
+
+
+if __name__ == '__main__':
+    unittest.main()
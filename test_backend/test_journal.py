@@ -0,0 +1,68 @@
+import json
+import unittest
+
+from backend.api.json_serialise import JsonSerialiser
+from collections import Counter
+
+from backend.core import Game, DefaultRuleset, Color, Area
+from backend.sim import RandomBot, GreedyBot
+
+
+def _state(game: Game):
+    return json.dumps(JsonSerialiser().ser(game))  # Order matters too
+
+
+class JournalTestCase(unittest.TestCase):
+    def test_rollback(self):
+        game = Game(3, RandomBot('journal'), DefaultRuleset(), seed='journal')
+        game.round_num = 0
+        game.do_round()
+        checkpoints = [(game.checkpoint(), _state(game))]
+        for game.round_num in range(1, 3):
+            game.do_round()
+            checkpoints.append((game.checkpoint(), _state(game)))
+        game.finish_game()
+        for checkpoint, state in reversed(checkpoints):
+            game.rollback(checkpoint)
+            self.assertEqual(_state(game), state)
+
+    def test_replay_after_rollback(self):
+        game = Game(4, GreedyBot(), DefaultRuleset(), seed='journal')
+        for game.round_num in range(2):
+            game.do_round()
+        checkpoint, state = game.checkpoint(), _state(game)
+        game.round_num = 2
+        game.do_round()
+        game.finish_game()
+        end_state = _state(game)
+        game.rollback(checkpoint)
+        self.assertEqual(_state(game), state)
+        game.round_num = 2
+        game.do_round()
+        game.finish_game()
+        self.assertEqual(_state(game), end_state)
+        game.stop_journal()
+        self.assertIsNone(game.journal)
+
+    def test_small_entries(self):
+        game = Game(2, GreedyBot(), DefaultRuleset(), seed='journal-small')
+        game.prepare_hands()
+        player = game.players[0]
+        player.resources = Counter({Color.RED: 2, Color.BLUE: 0, Color.GREEN: 3,
+                                    Color.YELLOW: 1})
+        hand = list(player.hand.values())
+        state = _state(game)
+        checkpoint = game.checkpoint()
+        player.spend_resources(Counter({Color.RED: 2, Color.GREEN: 1}))
+        player.gain_resource(Color.PURPLE, 2)
+        player.spend_resources(Counter({Color.YELLOW: 1}))
+        hand[2].discard(game, player)  # From the middle of the area
+        # Only what changed is journaled, not whole copies
+        self.assertNotIn(Counter, {type(a) for entry in game.journal for a in entry})
+        self.assertEqual(list(player.resources.items()), [(Color.GREEN, 2), (Color.PURPLE, 2)])
+        game.rollback(checkpoint)
+        self.assertEqual(list(player.resources.items()), [
+            (Color.RED, 2), (Color.BLUE, 0), (Color.GREEN, 3), (Color.YELLOW, 1)])
+        self.assertEqual(list(player.hand.values()), hand)
+        self.assertEqual(player.num_cards_of_type(Area.HAND, True), len(hand))
+        self.assertEqual(_state(game), state)
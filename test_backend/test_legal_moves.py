@@ -0,0 +1,133 @@
+import itertools
+import random
+import unittest
+from collections import Counter
+
+from backend.api.json_adapter import JsonAdapter
+from backend.core import (Game, DefaultRuleset, ResumableGame, Color, Card,
+                          CardCost, ResourceFilter, legal_options,
+                          payment_options, cheapest_payment, cheapest_spend,
+                          points_lost)
+from backend.sim import GreedyBot, game_seed
+from backend.sim.runner import make_frontend
+
+
+class LegalMovesTestCase(unittest.TestCase):
+    def test_payments_exhaustive(self):
+        rng = random.Random('payments')
+        game = Game(2, GreedyBot(), DefaultRuleset(), seed='payments')
+        player = game.players[0]
+        costs = {t.cost for t in DefaultRuleset().get_catalogue().templates}
+        colors = Color.members()
+        for _ in range(40):
+            player.resources = Counter({c: rng.randrange(4) for c in colors})
+            for cost in costs:
+                expected = [
+                    pay for amounts in itertools.product(
+                        *(range(player.resources[c] + 1) for c in colors))
+                    if cost.matches_exact(pay := +Counter(dict(zip(colors, amounts))))]
+                got = payment_options(player, cost)
+                self.assertEqual(len(got), len({frozenset(p.items()) for p in got}))
+                self.assertCountEqual(got, expected)
+
+    def test_cheapest_payment(self):
+        rng = random.Random('cheapest')
+        game = Game(2, GreedyBot(), DefaultRuleset(), seed='cheapest')
+        player = game.players[0]
+        costs = {t.cost for t in DefaultRuleset().get_catalogue().templates}
+        exact = points_lost(player)
+        weights = {c: rng.uniform(-1, 1) for c in Color.members()}
+
+        def linear(r, have, taken):
+            return taken * weights[r]
+
+        def total(loss, payment):
+            if loss is weights:  # Per-unit costs
+                loss = linear
+            return sum(loss(r, player.resources[r], n) for r, n in payment.items())
+        for _ in range(40):
+            player.resources = Counter({c: rng.randrange(5) for c in Color.members()})
+            for cost in costs:
+                options = payment_options(player, cost)
+                for loss in (exact, linear, weights):
+                    best = cheapest_payment(player, cost, loss)
+                    if not options:
+                        self.assertIsNone(best)
+                        continue
+                    self.assertIn(best, options)
+                    self.assertAlmostEqual(total(loss, best),
+                                           min(total(loss, p) for p in options))
+
+    def test_points_lost(self):
+        game = Game(2, GreedyBot(), DefaultRuleset(), seed='points-lost')
+        player = game.players[0]
+        player.resources = Counter({Color.RED: 2, Color.PURPLE: 4, Color.YELLOW: 3})
+        # Red is worth -1 point each, 3 purple are worth 1 point
+        self.assertEqual(cheapest_payment(player, CardCost.color_or_any(Color.PURPLE, 2, 3)),
+                         Counter({Color.RED: 2, Color.PURPLE: 1}))
+        self.assertEqual(cheapest_spend(player, ResourceFilter({Color.PURPLE}), 2),
+                         Counter({Color.PURPLE: 2}))
+        self.assertIsNone(cheapest_spend(player, ResourceFilter({Color.BLUE}), 1))
+
+    def test_random_legal_play(self):
+        # Any legal option must be accepted by the engine
+        for i in range(3):
+            seed = game_seed('legal', i)
+            rng = random.Random(seed)
+            rg = ResumableGame.new(3, DefaultRuleset(), seed)
+            decision = rg.start()
+            while decision is not None:
+                options = decision.options()
+                self.assertTrue(options, decision.name)
+                decision = rg.answer(rng.choice(options))
+            self.assertTrue(rg.finished)
+
+    def test_adapter_accepts_options(self):
+        # A client answering with any of the options must not be rejected
+        adapter = JsonAdapter(None)
+        names = set()
+        for i in range(3):
+            seed = game_seed('legal-adapter', i)
+            rng = random.Random(seed)
+            rg = ResumableGame.new(3, DefaultRuleset(), seed)
+            adapter.game = rg.game
+            decision = rg.start()
+            while decision is not None:
+                names.add(decision.name)
+                options = decision.options()
+                key = getattr(adapter, f'_{decision.name}_req')(*decision.args)['request']
+                for option in options:
+                    ser = adapter.ser(option.location if isinstance(option, Card)
+                                      else option)
+                    parsed = getattr(adapter, f'_{decision.name}_resp')(
+                        {key: ser}, *decision.args)
+                    self.assertEqual(parsed, option, decision.name)
+                decision = rg.answer(rng.choice(options))
+        self.assertLessEqual({'choose_card_exec', 'choose_from_discard', 'choose_card_move'},
+                             names)
+
+    def test_bot_answers_are_legal(self):
+        seed = game_seed('legal-bots', 0)
+        bots = make_frontend(['random', 'greedy', 'cost'], seed)
+        rg = ResumableGame.new(3, DefaultRuleset(), seed)
+        bots.register_game(rg.game)
+        decision = rg.start()
+        names = set()
+        while decision is not None:
+            answer = decision.ask(bots)
+            names.add(decision.name)
+            if isinstance(answer, Counter):
+                answer = +answer
+            self.assertTrue(any(answer is o or (isinstance(o, Counter) and answer == o)
+                                for o in decision.options()), decision.name)
+            decision = rg.answer(answer)
+        self.assertGreaterEqual(names, {'get_action_type', 'get_card_buy',
+                                        'get_card_payment', 'get_discard', 'get_spend'})
+
+    def test_unknown(self):
+        with self.assertRaises(ValueError):
+            legal_options('register_game', None)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+
+from backend.core import Game, DefaultRuleset, Player
+from backend.sim import GreedyBot, MctsBot, SeatedFrontend
+
+
+class _SnapshottingBot(GreedyBot):
+    """Takes a snapshot at the start of each turn (and scoring)"""
+    def __init__(self):
+        super().__init__()
+        self.snapshots = []
+
+    def on_turn_start(self, player: Player):
+        self.snapshots.append(self.game.snapshot())
+
+
+class MctsTestCase(unittest.TestCase):
+    def test_resume(self):
+        bot = _SnapshottingBot()
+        game = Game(3, bot, DefaultRuleset(), seed='resume')
+        game.run_game()
+        scores = [p.final_score for p in game.players]
+        self.assertEqual(len(bot.snapshots), 3 * 6 * 3 + 3)
+        for i in (0, 20, 53, len(bot.snapshots) - 2):
+            with self.subTest(snapshot=i):
+                other = Game(3, GreedyBot(), DefaultRuleset(), seed='resume')
+                other.restore(bot.snapshots[i], copy_cards=True)
+                other.resume()
+                self.assertEqual([p.final_score for p in other.players], scores)
+
+    def _play(self, mcts: MctsBot):
+        game = Game(2, SeatedFrontend([mcts, GreedyBot()]), DefaultRuleset(), seed='mcts')
+        game.run_game()
+        self.assertTrue(game.winners)
+        return [p.final_score for p in game.players]
+
+    def test_mcts_finishes(self):
+        self.assertEqual(self._play(MctsBot('a', playouts=3)),
+                         self._play(MctsBot('a', playouts=3)))
+
+    def test_thread_pool(self):
+        self._play(MctsBot('b', playouts=2, workers=2, pool='thread'))
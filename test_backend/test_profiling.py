@@ -0,0 +1,90 @@
+import json
+import os
+import tempfile
+import unittest
+
+from backend.api.json_adapter import JsonAdapter
+from backend.api.json_serialise import JsonSerialiser
+from backend.core import (Game, DefaultRuleset, Profiler, ConvertEffect,
+                          PlaceableCardType)
+from backend.sim import GreedyBot
+from .test_delta_sync import _PatchingClient
+
+
+class ProfilerTestCase(unittest.TestCase):
+    def test_counts(self):
+        profiler = Profiler()
+        game = Game(3, GreedyBot(), DefaultRuleset(), seed='profile')
+        profiler.attach(game)
+        game.run_game()
+        summary = profiler.summary()
+        self.assertEqual(set(summary), {'turn', 'frontend', 'effect'})
+        n_turns = summary['turn']['Player.do_turn']['count']
+        self.assertGreater(n_turns, 0)
+        self.assertEqual(summary['frontend']['get_action_type']['count'], n_turns)
+        self.assertEqual(summary['frontend']['register_result']['count'], 1)
+        self.assertGreater(sum(e['count'] for e in summary['effect'].values()), 0)
+        self.assertIn('Player.do_turn', profiler.report())
+
+    def test_nested_effects(self):
+        game = Game(2, GreedyBot(), DefaultRuleset(), seed='profile-nested')
+        template = next(t for t in game.ruleset.get_catalogue().templates
+                        if isinstance(t.effect, ConvertEffect))
+        player = game.players[0]
+        player.resources[PlaceableCardType.RED] = 2
+        card = template.instantiate()
+        card.append_to(game, template.card_type, player)
+        profiler = Profiler()
+        profiler.attach(game)
+        card.execute(player)
+        self.assertEqual(player.resources[PlaceableCardType.RED], 1)
+        effects = profiler.summary()['effect']
+        for name in ('ConvertEffect', 'SpendResource', 'GainResource', 'NullEffect'):
+            self.assertEqual(effects[name]['count'], 1, name)
+        # The timed copy didn't change the card's effect
+        self.assertEqual(type(template.effect.spend).__name__, 'SpendResource')
+        Profiler.detach(game)
+        card.execute(player)  # Compiled again, nothing recorded
+        self.assertEqual(player.resources[PlaceableCardType.RED], 0)
+        self.assertEqual(profiler.summary()['effect']['ConvertEffect']['count'], 1)
+
+    def test_same_game(self):
+        plain = Game(2, GreedyBot(), DefaultRuleset(), seed='profile-same')
+        plain.run_game()
+        profiled = Game(2, GreedyBot(), DefaultRuleset(), seed='profile-same')
+        Profiler().attach(profiled)
+        profiled.run_game()
+        Profiler.detach(profiled)
+        self.assertIsInstance(profiled.frontend, GreedyBot)
+        self.assertIsNone(profiled.profiler)
+        ser = JsonSerialiser()
+        self.assertEqual(ser.ser(profiled), ser.ser(plain))
+
+    def test_state_and_trace(self):
+        client = _PatchingClient(self)
+        client.adapter = JsonAdapter(client, 'delta')
+        game = Game(2, client.adapter, DefaultRuleset(), seed='profile-trace')
+        profiler = Profiler(trace=True)
+        profiler.attach(game)
+        game.run_game()
+        self.assertGreater(profiler.summary()['state']['JsonAdapter.serialise_state']['count'], 0)
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, 'trace.json')
+            profiler.write_chrome_trace(path)
+            with open(path, encoding='utf-8') as f:
+                trace = json.load(f)
+        events = trace['traceEvents']
+        self.assertEqual(len(events), len(profiler.events))
+        self.assertEqual(len(events), sum(c for c, _ in profiler.stats.values()))
+        for ev in events:
+            self.assertEqual(ev['ph'], 'X')
+            self.assertGreaterEqual(ev['ts'], 0)
+            self.assertGreaterEqual(ev['dur'], 0)
+
+    def test_no_trace(self):
+        with self.assertRaises(ValueError):
+            Profiler().chrome_trace()
+
+
+if __name__ == '__main__':
+    unittest.main()
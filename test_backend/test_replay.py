@@ -0,0 +1,116 @@
+import contextlib
+import dataclasses
+import io
+import os
+import tempfile
+import unittest
+import unittest.mock
+from collections import Counter
+
+from backend.api.json_adapter import JsonAdapter
+from backend.core import Game, DefaultRuleset
+from backend.sim import GameResult
+from backend.sim.replay import (RecordingFrontend, GameRecord, ReplayLog,
+                                ReplayError, replay_game, main)
+from backend.sim.runner import make_frontend
+from .test_delta_sync import _PatchingClient
+
+
+def _record(bots, seed, rng_mode='compat'):
+    frontend = RecordingFrontend(make_frontend(bots, seed))
+    game = Game(len(bots), frontend, DefaultRuleset(), seed=seed, rng_mode=rng_mode)
+    game.run_game()
+    return frontend.record
+
+
+class _NamedRuleset(DefaultRuleset):
+    pass
+
+
+class ReplayTestCase(unittest.TestCase):
+    def test_replay_matches(self):
+        for bots in (['greedy'] * 4, ['random', 'cost'], ['cost', 'greedy', 'random'],
+                     ['random'] * 5):
+            with self.subTest(bots=bots):
+                record = _record(bots, f'replay/{len(bots)}')
+                self.assertEqual(replay_game(record), record.result)
+                line = record.to_json()
+                self.assertNotIn('\n', line)
+                self.assertEqual(GameRecord.from_json(line), record)
+
+    def test_rng_mode(self):
+        record = _record(['greedy'] * 3, 'replay-rng', 'counter')
+        self.assertEqual(record.rng_mode, 'counter')
+        loaded = GameRecord.from_json(record.to_json())
+        self.assertEqual(loaded, record)
+        self.assertEqual(replay_game(loaded), record.result)
+        self.assertNotIn('"rng"', _record(['greedy'] * 2, 'replay-rng').to_json())
+
+    def test_replay_from_client(self):
+        client = _PatchingClient(self)
+        client.adapter = JsonAdapter(client, 'delta')
+        frontend = RecordingFrontend(client.adapter)
+        Game(3, frontend, DefaultRuleset(), seed='replay-client').run_game()
+        record = GameRecord.from_json(frontend.record.to_json())
+        self.assertEqual(replay_game(record), record.result)
+
+    def test_mismatch(self):
+        record = _record(['greedy'] * 2, 'replay-mismatch')
+        with self.assertRaises(ReplayError):
+            replay_game(dataclasses.replace(record, answers=record.answers[:-1]))
+        with self.assertRaises(ReplayError):
+            replay_game(dataclasses.replace(record, answers=record.answers + record.answers[:1]))
+        with self.assertRaises(ReplayError):
+            replay_game(dataclasses.replace(record, answers=record.answers[1:]))
+        with self.assertRaises(ReplayError):
+            replay_game(record, _NamedRuleset())
+        changed = dataclasses.replace(record, result=GameResult(
+            record.seed, (-1, -1), record.result.winners))
+        self.assertNotEqual(replay_game(changed), changed.result)
+
+    def test_rejected_answer(self):
+        records = [_record(['greedy'] * 2, f'replay-tampered/{i}') for i in range(2)]
+        answers = list(records[0].answers)
+        i = next(i for i, (name, _) in enumerate(answers)
+                 if name == 'get_card_payment')
+        answers[i] = ('get_card_payment', Counter())  # Doesn't pay for the card
+        records[0] = dataclasses.replace(records[0], answers=tuple(answers))
+        with self.assertRaisesRegex(ReplayError, f'answer {i} to get_card_payment'):
+            replay_game(GameRecord.from_json(records[0].to_json()))
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, 'games.ndjson')
+            ReplayLog(path).extend(records)
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                self.assertEqual(main(['check', path]), 1)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertIn('Game 0', lines[0])
+        self.assertIn('1 differ', lines[1])
+
+    def test_fails_before_first_answer(self):
+        record = _record(['greedy'] * 2, 'replay-first')
+        for answers in ((), record.answers):
+            with self.subTest(n_answers=len(answers)), \
+                    unittest.mock.patch.object(Game, 'run_game', side_effect=RuntimeError('x')), \
+                    self.assertRaisesRegex(ReplayError, 'before the first answer'):
+                replay_game(dataclasses.replace(record, answers=answers))
+
+    def test_bad_lines(self):
+        for line in ('', '[]', '{"v": 2}', '{"v": 1}',
+                     '{"v": 1, "ruleset": "DefaultRuleset", "seed": "a", '
+                     '"n_players": 2, "answers": ["?", 1], "scores": [], "winners": []}'):
+            with self.subTest(line=line), self.assertRaises(ReplayError):
+                GameRecord.from_json(line)
+
+    def test_log(self):
+        records = [_record(['greedy'] * 2, f'replay-log/{i}') for i in range(3)]
+        with tempfile.TemporaryDirectory() as d:
+            log = ReplayLog(os.path.join(d, 'games.ndjson'))
+            log.extend(records[:2])
+            log.append(records[2])  # Appending, not overwriting
+            self.assertEqual(list(log), records)
+
+
+if __name__ == '__main__':
+    unittest.main()
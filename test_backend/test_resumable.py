@@ -0,0 +1,81 @@
+import pickle
+import unittest
+
+from backend.api.json_serialise import JsonSerialiser
+from backend.core import Game, DefaultRuleset, ResumableGame, AnswerRejected
+from backend.sim import game_seed
+from backend.sim.runner import make_frontend
+
+_BOTS = ['random', 'greedy', 'cost']
+
+
+class ResumableGameTestCase(unittest.TestCase):
+    def _direct(self, seed: str):
+        game = Game(3, make_frontend(_BOTS, seed), DefaultRuleset(), seed=seed)
+        game.run_game()
+        return game
+
+    def _play(self, rg: ResumableGame, bots, decision):
+        while decision is not None:
+            decision = rg.answer(decision.ask(bots))
+        self.assertTrue(rg.finished)
+
+    def test_same_as_direct(self):
+        for i in range(4):
+            seed = game_seed('resumable', i)
+            with self.subTest(seed=seed):
+                rg = ResumableGame.new(3, DefaultRuleset(), seed)
+                bots = make_frontend(_BOTS, seed)
+                bots.register_game(rg.game)
+                self._play(rg, bots, rg.start())
+                expected = self._direct(seed)
+                self.assertEqual(JsonSerialiser().ser(rg.game),
+                                 JsonSerialiser().ser(expected))
+                self.assertEqual([p.idx for p in rg.winners],
+                                 [p.idx for p in expected.winners])
+
+    def test_interleaved(self):
+        games = []
+        for i in range(10):
+            seed = game_seed('interleaved', i)
+            rg = ResumableGame.new(3, DefaultRuleset(), seed)
+            bots = make_frontend(_BOTS, seed)
+            bots.register_game(rg.game)
+            games.append((rg, bots, rg.start()))
+        while any(d is not None for _, _, d in games):
+            games = [(rg, bots, d if d is None else rg.answer(d.ask(bots)))
+                     for rg, bots, d in games]
+        for i, (rg, _, _) in enumerate(games):
+            self.assertEqual(JsonSerialiser().ser(rg.game), JsonSerialiser().ser(
+                self._direct(game_seed('interleaved', i))))
+
+    def test_park(self):
+        seed = game_seed('park', 0)
+        rg = ResumableGame.new(3, DefaultRuleset(), seed)
+        bots = make_frontend(_BOTS, seed)
+        bots.register_game(rg.game)
+        decision = rg.start()
+        for i in range(40):
+            decision = rg.answer(decision.ask(bots))
+            if i % 7 == 0:
+                parked = pickle.loads(pickle.dumps(rg.park()))
+                rg = ResumableGame.unpark(parked, DefaultRuleset())
+                bots.register_game(rg.game)
+                decision = rg.decision
+        self._play(rg, bots, decision)
+        self.assertEqual(JsonSerialiser().ser(rg.game),
+                         JsonSerialiser().ser(self._direct(seed)))
+
+    def test_bad_answer(self):
+        rg = ResumableGame.new(2, DefaultRuleset(), 'bad')
+        decision = rg.start()
+        self.assertEqual(decision.name, 'get_action_type')
+        with self.assertRaises(AnswerRejected):
+            rg.answer('dance')
+        self.assertEqual(rg.decision.name, 'get_action_type')
+        self.assertEqual(rg.answers, [])
+        self.assertIsNotNone(rg.answer('execute'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import random
+import unittest
+from collections import Counter
+
+from backend.core import Game, DefaultRuleset, CounterRng, derived_rng
+from backend.sim import GreedyBot
+
+
+class DerivedRngTestCase(unittest.TestCase):
+    def test_compat(self):
+        # Must stay exactly the same, or old replays (and seeds) break
+        a, b = list(range(36)), list(range(36))
+        derived_rng('s', 'game.deck.shuffle', 1).shuffle(a)
+        random.Random('s+[game.deck.shuffle@(1,)]').shuffle(b)
+        self.assertEqual(a, b)
+        self.assertIsInstance(derived_rng('s', 'r', mode='compat'), random.Random)
+        with self.assertRaises(ValueError):
+            derived_rng('s', 'x', mode='fast')
+
+    def test_counter_deterministic(self):
+        def deal(*args):
+            x = list(range(36))
+            derived_rng(*args, mode='counter').shuffle(x)
+            return x
+        self.assertEqual(deal('s', 'r', 1), deal('s', 'r', 1))
+        self.assertEqual(sorted(deal('s', 'r', 1)), list(range(36)))
+        self.assertNotEqual(deal('s', 'r', 1), deal('s', 'r', 2))
+        self.assertNotEqual(deal('s', 'r', 1), deal('s', 'q', 1))
+        self.assertNotEqual(deal('s', 'r', 1), deal('t', 'r', 1))
+
+    def test_counter_uniform(self):
+        counts = Counter()
+        for i in range(6000):
+            x = [0, 1, 2]
+            CounterRng(str(i).encode()).shuffle(x)
+            counts[tuple(x)] += 1
+        self.assertEqual(len(counts), 6)
+        for n in counts.values():
+            self.assertLess(abs(n - 1000), 150)
+
+    def test_counter_methods(self):
+        rng = CounterRng(b'methods')
+        for _ in range(200):  # Several blocks
+            self.assertTrue(0.0 <= rng.random() < 1.0)
+            self.assertIn(rng.randrange(3, 7), range(3, 7))
+            self.assertIn(rng.randrange(5), range(5))
+            self.assertIn(rng.choice('abc'), 'abc')
+            self.assertLess(rng.getrandbits(100), 1 << 100)
+        with self.assertRaises(ValueError):
+            rng.randrange(0)
+        with self.assertRaises(IndexError):
+            rng.choice([])
+
+    def test_game_rng_mode(self):
+        def play(seed, **kwargs):
+            game = Game(3, GreedyBot(), DefaultRuleset(), seed=seed, **kwargs)
+            game.run_game()
+            return [p.final_score for p in game.players]
+        self.assertEqual(play('mode'), play('mode', rng_mode='compat'))
+        self.assertEqual(play('mode', rng_mode='counter'), play('mode', rng_mode='counter'))
+        self.assertNotEqual([play(f'mode/{i}') for i in range(4)],
+                            [play(f'mode/{i}', rng_mode='counter') for i in range(4)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+import unittest.mock
+from collections import Counter
+
+from backend.api.json_deserialise import JsonDeserialiser
+from backend.api.json_serialise import JsonSerialiser
+from backend.core import (Game, DefaultRuleset, Location, AnyResource, Color,
+                          PlaceableCardType)
+from backend.sim import game_seed
+from backend.sim.runner import make_frontend
+
+
+class _UncompiledSerialiser(JsonSerialiser):
+    # Overriding this means dataclasses don't get compiled plans
+    def ser_dataclass(self, o):
+        return super().ser_dataclass(o)
+
+
+class SerialisePlanTestCase(unittest.TestCase):
+    def test_same_as_uncompiled(self):
+        for i in range(4):
+            seed = game_seed('ser_plan', i)
+            with self.subTest(seed=seed):
+                game = Game(3, make_frontend(['random', 'greedy', 'cost'], seed),
+                            DefaultRuleset(), seed=seed)
+                game.round_num = 0
+                game.do_round()
+                self.assertEqual(JsonSerialiser().ser(game),
+                                 _UncompiledSerialiser().ser(game))
+                game.run_game()
+                ser = JsonSerialiser()
+                self.assertEqual(ser.ser(game), _UncompiledSerialiser().ser(game))
+                self.assertEqual(ser.ser(game), _UncompiledSerialiser().ser(game))
+
+    def test_plans_cached(self):
+        ser = JsonSerialiser()
+        ser.ser(Game(2, make_frontend(['random'] * 2, 'x'), DefaultRuleset(), seed='x'))
+        plan = ser._plans[Game]
+        ser.ser(Game(2, make_frontend(['random'] * 2, 'y'), DefaultRuleset(), seed='y'))
+        self.assertIs(ser._plans[Game], plan)
+
+    def test_unknown_type(self):
+        with self.assertRaises(TypeError):
+            JsonSerialiser().ser(object())
+
+
+class DeserialisePlanTestCase(unittest.TestCase):
+    def _round_trip(self, o, tp):
+        deser = JsonDeserialiser()
+        j = JsonSerialiser().ser(o)
+        result = deser.deser(j, tp)
+        self.assertEqual(result, o)
+        self.assertEqual(deser.deser(j, tp), o)  # Again, using the plan
+        return result
+
+    def test_round_trip(self):
+        game = Game(2, make_frontend(['greedy'] * 2, 'x'), DefaultRuleset(), seed='x')
+        game.run_game()
+        for player in game.players:
+            for area in player.areas.values():
+                for card in area.values():
+                    self._round_trip(card.location, Location)
+        self._round_trip(Counter({Color.RED: 2, AnyResource.POINTS: 1}),
+                         Counter[AnyResource])
+        self._round_trip({frozenset({Color.RED, Color.BLUE}): [1, 2]},
+                         dict[frozenset[Color], list[int]])
+        self._round_trip({True: 'a', False: 'b'}, dict[bool, str])
+        self.assertIs(self._round_trip(Color.RED, PlaceableCardType), Color.RED)
+
+    def test_annotations_cached(self):
+        deser = JsonDeserialiser()
+        deser.deser({'player': 1, 'area': 3, 'key': 2}, Location)
+        with unittest.mock.patch('builtins.eval') as m:
+            self.assertEqual(deser.deser({'player': 0, 'area': 3, 'key': 5}, Location),
+                             Location(0, Color.RED, 5))
+            JsonDeserialiser().deser({'player': 0, 'area': 3, 'key': 5}, Location)
+        m.assert_not_called()
+
+    def test_bad_atom(self):
+        with self.assertRaises(AssertionError):
+            JsonDeserialiser().deser('1', int)
+
+    def test_register_on_instance(self):
+        deser = JsonDeserialiser()
+        loc = {'player': 1, 'area': 3, 'key': 2}
+        deser.deser(loc, Location)  # So there's a plan to replace
+        deser.deserialiser_func(Location)(lambda _d, j, _tp: ('custom', j['key']))
+        self.assertEqual(deser.deser(loc, Location), ('custom', 2))
+        # Only that instance
+        self.assertEqual(JsonDeserialiser().deser(loc, Location), Location(1, Color.RED, 2))
+        self.assertNotIn(deser, JsonDeserialiser.dispatch)
+
+    def test_register_on_class(self):
+        class Thing:
+            pass
+        JsonDeserialiser.deserialiser_func(Thing)(lambda _d, j, _tp: ('thing', j))
+        self.addCleanup(JsonDeserialiser.dispatch.pop, Thing)
+        self.assertEqual(JsonDeserialiser().deser(1, Thing), ('thing', 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+
+from backend.sim import BOTS, play_game, run_games, game_seed, run_tournament
+
+
+class SimTestCase(unittest.TestCase):
+    def test_all_bots_finish(self):
+        for name in BOTS:
+            with self.subTest(bot=name):
+                result = play_game('test-seed', [name] * 4)
+                self.assertEqual(len(result.scores), 4)
+                self.assertTrue(result.winners)
+                best = max(result.scores)
+                self.assertEqual(result.winners, tuple(
+                    i for i, s in enumerate(result.scores) if s == best))
+
+    def test_deterministic(self):
+        bots = ['random', 'greedy', 'cost']
+        for i in range(3):
+            seed = game_seed('det', i)
+            self.assertEqual(play_game(seed, bots), play_game(seed, bots))
+
+    def test_stats(self):
+        stats = run_games([game_seed('stats', i) for i in range(4)],
+                          ['greedy', 'random'])
+        self.assertEqual(stats.games, 4)
+        self.assertAlmostEqual(sum(stats.wins), 4)
+        self.assertEqual(sum(stats.scores[0].values()), 4)
+
+    def test_tournament_matches_sequential(self):
+        bots = ['greedy', 'random', 'cost']
+        results = []
+        stats = run_tournament(6, bots, 'tourn', workers=2, chunk_size=2,
+                               on_result=results.append)
+        expected = run_games([game_seed('tourn', i) for i in range(6)], bots)
+        self.assertEqual(stats.games, 6)
+        self.assertEqual(stats.wins, expected.wins)
+        self.assertEqual(stats.scores, expected.scores)
+        self.assertEqual(sorted(r.seed for r in results),
+                         sorted(game_seed('tourn', i) for i in range(6)))
@@ -0,0 +1,56 @@
+import dataclasses
+import pickle
+import unittest
+
+from backend.api.json_serialise import JsonSerialiser
+from backend.core import Game, DefaultRuleset, Location
+from backend.sim import GreedyBot
+
+
+def _play_rounds(game: Game, start: int, stop: int):
+    for game.round_num in range(start, stop):
+        game.do_round()
+
+
+def _finish(game: Game):
+    _play_rounds(game, game.round_num + 1, 3)
+    game.count_points()
+    return [p.final_score for p in game.players]
+
+
+class SnapshotTestCase(unittest.TestCase):
+    def setUp(self):
+        self.game = Game(3, GreedyBot(), DefaultRuleset(), seed='snapshot')
+        _play_rounds(self.game, 0, 2)
+        self.state = JsonSerialiser().ser(self.game)
+
+    def test_restore(self):
+        snapshot = self.game.snapshot()
+        final_scores = _finish(self.game)
+        self.game.restore(snapshot)
+        self.assertEqual(JsonSerialiser().ser(self.game), self.state)
+        self.assertEqual(_finish(self.game), final_scores)
+
+    def test_pickled_snapshot(self):
+        snapshot = pickle.loads(pickle.dumps(self.game.snapshot()))
+        _finish(self.game)
+        self.game.restore(snapshot)
+        self.assertEqual(JsonSerialiser().ser(self.game), self.state)
+
+    def test_clone_is_independent(self):
+        clone = self.game.clone(GreedyBot())
+        self.assertEqual(JsonSerialiser().ser(clone), self.state)
+        clone_scores = _finish(clone)
+        self.assertEqual(JsonSerialiser().ser(self.game), self.state)
+        self.assertEqual(_finish(self.game), clone_scores)
+
+    def test_locations_shared(self):
+        clone = self.game.clone()
+        for p, p_clone in zip(self.game.players, clone.players):
+            for area, cards in p.areas.items():
+                for key, card in cards.items():
+                    loc = card.location
+                    self.assertIs(loc, Location.of(p.idx, area, key))
+                    self.assertIs(p_clone.areas[area][key].location, loc)
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            loc.key = 0